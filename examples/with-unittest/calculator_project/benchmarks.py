@@ -0,0 +1,124 @@
+"""
+Benchmarks for the calculator.
+
+Run from this folder, e.g. ``python benchmarks.py batch --operations 1000000``.
+"""
+import argparse
+import logging
+import random
+import time
+
+from main import Calculator, np
+
+
+def _timed(label, operations, func):
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<40} {elapsed:8.3f}s {operations / elapsed:14,.0f} ops/s")
+    return elapsed
+
+
+def bench_batch(operations):
+    rng = random.Random(1)
+    calc = Calculator()
+    a = [rng.uniform(-1000, 1000) for _ in range(operations)]
+    b = [rng.choice((0, rng.uniform(-1000, 1000))) for _ in range(operations)]
+    logging.disable(logging.ERROR)
+
+    def scalar_divide():
+        results = []
+        for x, y in zip(a, b):
+            try:
+                results.append(calc.divide(x, y))
+            except ZeroDivisionError:
+                results.append(float("nan"))
+
+    _timed("scalar multiply", operations, lambda: [calc.multiply(x, y) for x, y in zip(a, b)])
+    _timed("multiply_many (lists)", operations, lambda: calc.multiply_many(a, b))
+    _timed("scalar divide, catching errors", operations, scalar_divide)
+    _timed("divide_many nan (lists)", operations, lambda: calc.divide_many(a, b, zero_division="nan"))
+    if np is not None:
+        a_array, b_array = np.array(a), np.array(b)
+        _timed("multiply_many (NumPy)", operations, lambda: calc.multiply_many(a_array, b_array))
+        _timed("divide_many nan (NumPy)", operations,
+               lambda: calc.divide_many(a_array, b_array, zero_division="nan"))
+    logging.disable(logging.NOTSET)
+
+
+def bench_expression(operations):
+    from expression import _Parser, compile_expression
+
+    rng = random.Random(2)
+    formula = "(a + b) * c / d"
+    columns = {name: [rng.uniform(1, 100) for _ in range(operations)] for name in "abcd"}
+    rows = list(zip(*columns.values()))
+    sample = rows[:max(1, operations // 10)]
+    expression = compile_expression(formula)
+
+    _timed("parse every call (1/10 sample)", len(sample), lambda: [_Parser(formula).parse() for _ in sample])
+    _timed("cached plan, scalar evaluate", operations,
+           lambda: [expression.evaluate({"a": a, "b": b, "c": c, "d": d}) for a, b, c, d in rows])
+    _timed("evaluate_many (lists)", operations, lambda: expression.evaluate_many(columns))
+    if np is not None:
+        arrays = {name: np.array(values) for name, values in columns.items()}
+        _timed("evaluate_many (NumPy)", operations, lambda: expression.evaluate_many(arrays))
+
+
+def bench_types(operations):
+    from decimal import Decimal
+    from fractions import Fraction
+
+    def legacy_add(a, b):
+        # The previous per-call check, for comparison
+        if not (isinstance(a, (int, float,)) and isinstance(b, (int, float))):
+            raise TypeError("Parameters must be numbers")
+        return a + b
+
+    ints = list(range(1, operations + 1))
+    floats = [i + 0.5 for i in ints]
+    decimals = [Decimal(i).scaleb(-2) for i in ints]
+    fractions = [Fraction(i, 7) for i in ints]
+    _timed("legacy isinstance add, int", operations, lambda: list(map(legacy_add, ints, ints)))
+    for mode, values in (("float", ints), ("float", floats), ("decimal", ints),
+                         ("decimal", decimals), ("decimal", floats), ("fraction", fractions)):
+        calc = Calculator(mode)
+        label = f"{mode} mode, {type(values[0]).__name__}"
+        _timed(f"{label} add", operations, lambda: list(map(calc.add, values, values)))
+        _timed(f"{label} divide", operations, lambda: list(map(calc.divide, values, values[1:] + values[:1])))
+
+
+def bench_instrumentation(operations):
+    from instrumentation import instrument
+
+    rng = random.Random(3)
+    pairs = [(rng.randint(1, 1000), rng.randint(1, 1000)) for _ in range(operations)]
+    repeated = [pairs[i % 100] for i in range(operations)]
+    calc = Calculator()
+    _timed("plain multiply", operations, lambda: [calc.multiply(a, b) for a, b in pairs])
+    hooks = instrument(calc)
+    _timed("instrumented multiply", operations, lambda: [calc.multiply(a, b) for a, b in pairs])
+    hooks.remove()
+    _timed("after remove()", operations, lambda: [calc.multiply(a, b) for a, b in pairs])
+
+    calc = Calculator("fraction")
+    _timed("fraction mode divide, 100 distinct", operations, lambda: [calc.divide(a, b) for a, b in repeated])
+    hooks = instrument(calc, cache_size=256)
+    _timed("same, memoized", operations, lambda: [calc.divide(a, b) for a, b in repeated])
+    print(hooks.to_prometheus(), end="")
+
+
+BENCHMARKS = {
+    "batch": bench_batch,
+    "expression": bench_expression,
+    "instrumentation": bench_instrumentation,
+    "types": bench_types,
+}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("benchmark", choices=sorted(BENCHMARKS))
+    parser.add_argument("--operations", type=int, default=1_000_000)
+    args = parser.parse_args()
+    BENCHMARKS[args.benchmark](args.operations)
@@ -0,0 +1,192 @@
+"""
+Arithmetic formulas on top of Calculator.
+
+``compile_expression("(a + b) * c / d")`` parses the formula once (no
+``eval``) into a postfix plan and caches it by its text. The plan is then
+evaluated with variables bound per call from a mapping of names to
+values, either for scalars or for whole columns of values with the
+Calculator batch methods. Invalid values still raise Calculator's
+TypeError and ZeroDivisionError.
+"""
+import re
+from functools import lru_cache
+
+from main import Calculator, np
+
+_TOKEN = re.compile(r"\s*(?:(?P<number>(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)|(?P<name>[A-Za-z_]\w*)|(?P<op>[-+*/()]))")
+
+_BINARY = {"+": "add", "-": "subtract", "*": "multiply", "/": "divide"}
+
+# Parentheses and unary signs nested deeper than this raise SyntaxError,
+# well before the parser's recursion could reach the recursion limit
+MAX_DEPTH = 100
+
+
+def _tokenize(text):
+    position, tokens = 0, []
+    text = text.rstrip()
+    while position < len(text):
+        match = _TOKEN.match(text, position)
+        if match is None:
+            raise SyntaxError(f"Unexpected character {text[position:].lstrip()[:1]!r} in {text!r}")
+        position = match.end()
+        kind = match.lastgroup
+        tokens.append((kind, match.group(kind)))
+    return tokens
+
+
+class _Parser:
+    """Recursive descent parser emitting postfix instructions."""
+
+    def __init__(self, text):
+        self.text = text
+        self.tokens = _tokenize(text)
+        self.index = 0
+        self.instructions = []
+        self.variables = []
+        self.depth = 0
+
+    def peek(self):
+        return self.tokens[self.index] if self.index < len(self.tokens) else (None, None)
+
+    def take(self):
+        token = self.peek()
+        self.index += 1
+        return token
+
+    def parse(self):
+        if not self.tokens:
+            raise SyntaxError("Empty expression")
+        try:
+            self.expression()
+        except RecursionError:
+            # Only when called with most of the stack already in use
+            raise SyntaxError(f"Expression is nested too deeply to parse: {self.text[:40]!r}...") from None
+        if self.index != len(self.tokens):
+            raise SyntaxError(f"Unexpected {self.peek()[1]!r} in {self.text!r}")
+        return tuple(self.instructions), tuple(self.variables)
+
+    def expression(self):
+        self.term()
+        while self.peek() in (("op", "+"), ("op", "-")):
+            operator = self.take()[1]
+            self.term()
+            self.instructions.append((_BINARY[operator], None))
+
+    def term(self):
+        self.factor()
+        while self.peek() in (("op", "*"), ("op", "/")):
+            operator = self.take()[1]
+            self.factor()
+            self.instructions.append((_BINARY[operator], None))
+
+    def factor(self):
+        kind, value = self.take()
+        if (kind, value) in (("op", "-"), ("op", "+"), ("op", "(")):
+            self.depth += 1
+            if self.depth > MAX_DEPTH:
+                raise SyntaxError(f"Expression nested more than {MAX_DEPTH} levels deep")
+            self.nested(value)
+            self.depth -= 1
+        elif kind == "number":
+            number = float(value) if any(c in value for c in ".eE") else int(value)
+            self.instructions.append(("const", number))
+        elif kind == "name":
+            if value not in self.variables:
+                self.variables.append(value)
+            self.instructions.append(("var", value))
+        else:
+            raise SyntaxError(f"Unexpected {'end of expression' if kind is None else repr(value)} in {self.text!r}")
+
+    def nested(self, operator):
+        if operator == "-":
+            self.factor()
+            self.instructions.append(("negate", None))
+        elif operator == "+":
+            self.factor()
+        else:
+            self.expression()
+            if self.take() != ("op", ")"):
+                raise SyntaxError(f"Missing ')' in {self.text!r}")
+
+
+class Expression:
+    """A compiled formula: postfix ``instructions`` over named ``variables``."""
+
+    def __init__(self, text, instructions, variables):
+        self.text = text
+        self.instructions = instructions
+        self.variables = variables
+
+    def __repr__(self):
+        return f"Expression({self.text!r})"
+
+    def _bind(self, values):
+        missing = [name for name in self.variables if name not in values]
+        if missing:
+            raise NameError(f"Unbound variable(s) in {self.text!r}: {', '.join(missing)}")
+
+    def evaluate(self, values=None, calculator=None):
+        """Evaluate for ``values``, a mapping of variable name to scalar value."""
+        values = {} if values is None else values
+        self._bind(values)
+        calc = calculator or Calculator()
+        stack = []
+        for opcode, argument in self.instructions:
+            if opcode == "const":
+                stack.append(argument)
+            elif opcode == "var":
+                stack.append(values[argument])
+            elif opcode == "negate":
+                stack.append(calc.subtract(0, stack.pop()))
+            else:
+                right = stack.pop()
+                stack.append(getattr(calc, opcode)(stack.pop(), right))
+        return stack[0]
+
+    def evaluate_many(self, columns=None, calculator=None, zero_division="raise"):
+        """
+        Evaluate for ``columns``, a mapping of variable name to a column of
+        values (sequences or NumPy arrays of equal length), one batch call
+        per instruction.
+        ``zero_division`` is passed to ``divide_many``; ``"mask"`` is not
+        supported here.
+        """
+        if zero_division == "mask":
+            raise ValueError("The 'mask' policy is not supported when evaluating expressions")
+        columns = {} if columns is None else columns
+        self._bind(columns)
+        calc = calculator or Calculator()
+        use_numpy = np is not None and any(isinstance(columns[name], np.ndarray) for name in self.variables)
+        columns = {name: columns[name] if use_numpy else list(columns[name]) for name in self.variables}
+        length = len(next(iter(columns.values()))) if columns else 1
+
+        def broadcast(number):
+            return np.full(length, number) if use_numpy else [number] * length
+
+        stack = []
+        for opcode, argument in self.instructions:
+            if opcode == "const":
+                stack.append(broadcast(argument))
+            elif opcode == "var":
+                stack.append(columns[argument])
+            elif opcode == "negate":
+                stack.append(calc.subtract_many(broadcast(0), stack.pop()))
+            elif opcode == "divide":
+                right = stack.pop()
+                stack.append(calc.divide_many(stack.pop(), right, zero_division=zero_division))
+            else:
+                right = stack.pop()
+                stack.append(getattr(calc, f"{opcode}_many")(stack.pop(), right))
+        return stack[0]
+
+
+@lru_cache(maxsize=256)
+def compile_expression(text):
+    """Parse ``text`` into an Expression; repeated texts reuse the cached plan."""
+    instructions, variables = _Parser(text).parse()
+    return Expression(text, instructions, variables)
+
+
+def evaluate(text, values=None, calculator=None):
+    return compile_expression(text).evaluate(values, calculator)
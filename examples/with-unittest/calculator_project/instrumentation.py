@@ -0,0 +1,162 @@
+"""
+Profiling and memoizing hooks for Calculator.
+
+``instrument(calc)`` wraps the calculator's operations (scalar and batch)
+on that instance only, counting calls, cumulative time and errors by
+exception type. With ``cache_size`` set, scalar results are also memoized
+per ``(operation, a, b)`` in an LRU cache. An uninstrumented Calculator is
+not touched at all, and ``remove()`` restores the plain methods.
+
+The collected numbers can be exported with ``as_dict()`` or, for scraping,
+``to_prometheus()``.
+"""
+import time
+from collections import OrderedDict, defaultdict
+
+SCALAR_OPERATIONS = ("add", "subtract", "multiply", "divide")
+BATCH_OPERATIONS = ("add_many", "subtract_many", "multiply_many", "divide_many")
+
+
+class OperationStats:
+    __slots__ = ("calls", "seconds", "errors", "cache_hits", "cache_misses")
+
+    def __init__(self):
+        self.calls = 0
+        self.seconds = 0.0
+        self.errors = defaultdict(int)
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    def as_dict(self):
+        return {
+            "calls": self.calls,
+            "seconds": self.seconds,
+            "errors": dict(self.errors),
+            "cache_hits": self.cache_hits,
+            "cache_misses": self.cache_misses,
+        }
+
+
+class Instrumentation:
+    """Hooks installed on one Calculator; see ``instrument``."""
+
+    def __init__(self, calculator, cache_size=None):
+        if cache_size is not None and cache_size < 1:
+            raise ValueError("cache_size must be at least 1")
+        self.calculator = calculator
+        self.cache_size = cache_size
+        self.stats = {name: OperationStats() for name in SCALAR_OPERATIONS + BATCH_OPERATIONS}
+        self._cache = OrderedDict()
+        for name in SCALAR_OPERATIONS:
+            setattr(calculator, name, self._wrap_scalar(name, getattr(calculator, name)))
+        for name in BATCH_OPERATIONS:
+            setattr(calculator, name, self._wrap_batch(name, getattr(calculator, name)))
+
+    def _wrap_scalar(self, name, operation):
+        stats = self.stats[name]
+        cache = self._cache if self.cache_size else None
+        cache_size = self.cache_size
+        clock = time.perf_counter
+
+        def instrumented(a, b):
+            stats.calls += 1
+            key = None
+            if cache is not None:
+                # Types are part of the key: 1, 1.0 and True are equal but
+                # may give different results in decimal or fraction mode
+                key = (name, type(a), a, type(b), b)
+                try:
+                    result = cache[key]
+                except KeyError:
+                    stats.cache_misses += 1
+                except TypeError:  # unhashable argument, not cached
+                    key = None
+                else:
+                    stats.cache_hits += 1
+                    cache.move_to_end(key)
+                    return result
+            start = clock()
+            try:
+                result = operation(a, b)
+            except Exception as error:
+                stats.errors[type(error).__name__] += 1
+                raise
+            finally:
+                stats.seconds += clock() - start
+            if key is not None:
+                cache[key] = result
+                if len(cache) > cache_size:
+                    cache.popitem(last=False)
+            return result
+
+        instrumented.__wrapped__ = operation
+        return instrumented
+
+    def _wrap_batch(self, name, operation):
+        stats = self.stats[name]
+        clock = time.perf_counter
+
+        def instrumented(a, b, *args, **kwargs):
+            stats.calls += 1
+            start = clock()
+            try:
+                return operation(a, b, *args, **kwargs)
+            except Exception as error:
+                stats.errors[type(error).__name__] += 1
+                raise
+            finally:
+                stats.seconds += clock() - start
+
+        instrumented.__wrapped__ = operation
+        return instrumented
+
+    def remove(self):
+        """Restore the calculator's plain methods."""
+        for name in SCALAR_OPERATIONS + BATCH_OPERATIONS:
+            self.calculator.__dict__.pop(name, None)
+        self._cache.clear()
+
+    def reset(self):
+        for stats in self.stats.values():
+            stats.__init__()
+        self._cache.clear()
+
+    def cache_info(self):
+        return {"size": len(self._cache), "max_size": self.cache_size}
+
+    def as_dict(self):
+        """Stats per operation, leaving out operations that were never called."""
+        return {name: stats.as_dict() for name, stats in self.stats.items() if stats.calls}
+
+    def to_prometheus(self, prefix="calculator"):
+        """Prometheus text exposition format for the collected stats."""
+        metrics = (
+            ("operation_calls_total", "Calculator operation calls.", lambda stats: stats.calls),
+            ("operation_seconds_total", "Time spent in calculator operations.", lambda stats: stats.seconds),
+            ("cache_hits_total", "Memoized calculator results reused.", lambda stats: stats.cache_hits),
+            ("cache_misses_total", "Calculator results computed with memoization on.",
+             lambda stats: stats.cache_misses),
+        )
+        called = [(name, stats) for name, stats in self.stats.items() if stats.calls]
+        lines = []
+        for metric, help_text, value in metrics:
+            lines.append(f"# HELP {prefix}_{metric} {help_text}")
+            lines.append(f"# TYPE {prefix}_{metric} counter")
+            for name, stats in called:
+                lines.append(f'{prefix}_{metric}{{operation="{name}"}} {value(stats)}')
+        lines.append(f"# HELP {prefix}_operation_errors_total Calculator operations that raised, by exception type.")
+        lines.append(f"# TYPE {prefix}_operation_errors_total counter")
+        for name, stats in called:
+            for error, count in sorted(stats.errors.items()):
+                lines.append(f'{prefix}_operation_errors_total{{operation="{name}",error="{error}"}} {count}')
+        return "\n".join(lines) + "\n"
+
+
+def instrument(calculator, cache_size=None):
+    """
+    Start collecting stats on ``calculator`` and return the Instrumentation.
+    ``cache_size`` turns on LRU memoization of scalar results.
+    """
+    if "add" in vars(calculator):
+        raise ValueError("Calculator is already instrumented")
+    return Instrumentation(calculator, cache_size)
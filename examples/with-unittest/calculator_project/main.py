@@ -1,4 +1,14 @@
 import logging
+import math
+import operator
+from functools import partial
+from decimal import Decimal, getcontext
+from fractions import Fraction
+
+try:
+    import numpy as np
+except ImportError:  # batch methods fall back to plain Python sequences
+    np = None
 
 logging.basicConfig(
     level=logging.INFO,
@@ -12,32 +22,196 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
+_NATIVE = (operator.add, operator.sub, operator.mul, operator.truediv)
+_LABELS = ("Addition", "Subtraction", "Multiplication", "Division")
+
+NUMERIC_MODES = ("float", "decimal", "fraction")
+
+
+def _converters(numeric_mode, context):
+    """Per accepted type, how to turn a value into the mode's working type."""
+    if numeric_mode == "float":
+        return {int: None, float: None}
+    if numeric_mode == "decimal":
+        return {
+            int: None,
+            float: lambda x: Decimal(repr(x)),
+            Decimal: None,
+            Fraction: lambda x: context.divide(Decimal(x.numerator), Decimal(x.denominator)),
+        }
+    if numeric_mode == "fraction":
+        return {int: None, float: lambda x: Fraction(repr(x)), Decimal: Fraction, Fraction: None}
+    raise ValueError(f"Unknown numeric mode: {numeric_mode!r}, expected one of {NUMERIC_MODES}")
+
+
 class Calculator:
+    """
+    Docstring for Calculator
+
+    ``numeric_mode`` picks the numbers accepted and how they are combined:
+
+    - ``"float"`` (default): int and float, plain Python arithmetic
+    - ``"decimal"``: also Decimal and Fraction, computed as Decimal in
+      ``decimal_context`` (floats go through their repr)
+    - ``"fraction"``: also Decimal and Fraction, computed exactly as Fraction
+
+    Argument types are dispatched once per operation through a table keyed
+    by ``(type(a), type(b))`` that is built up front, in ``_calculate``.
+    int with int add, subtract and multiply (and any int or float operation
+    in float mode) take the native fast path ahead of the table.
+    """
     logger.info("Calculator initialized")
 
-    def add(self, a, b):
-        if not (isinstance(a, (int, float,)) and isinstance(b, (int, float))):
-            logger.error("Addition error: parameters must be numbers")
+    def __init__(self, numeric_mode="float", decimal_context=None):
+        self.numeric_mode = numeric_mode
+        self.decimal_context = decimal_context or getcontext()
+        self._converters = _converters(numeric_mode, self.decimal_context)
+        if numeric_mode == "decimal":
+            context = self.decimal_context
+            self._arithmetic = (context.add, context.subtract, context.multiply, context.divide)
+        else:
+            self._arithmetic = _NATIVE
+        # Plain numbers skip the table: int with int in every mode for add,
+        # subtract and multiply, and int and float in float mode, where
+        # divide takes the same path for a non-zero divisor
+        self._plain = frozenset((int, float) if numeric_mode == "float" else (int,))
+        self._plain_division = self._plain if numeric_mode == "float" else frozenset()
+        self._dispatch = {}
+        for type_a in self._converters:
+            for type_b in self._converters:
+                self._dispatch[type_a, type_b] = self._entry(type_a, type_b)
+
+    def _entry(self, type_a, type_b):
+        convert_a, convert_b = self._converters[type_a], self._converters[type_b]
+        arithmetic = self._arithmetic
+        if type_a is int and type_b is int:
+            if self.numeric_mode == "fraction":
+                arithmetic = _NATIVE[:3] + (Fraction,)
+            else:
+                arithmetic = _NATIVE[:3] + arithmetic[3:]
+        return convert_a, convert_b, arithmetic
+
+    def _lookup(self, operation, a, b):
+        """
+        Slow path for type pairs missing from the table, e.g. bool or other
+        subclasses. Accepted pairs are added to the table, others raise.
+        """
+        def base(kind):
+            return next((accepted for accepted in self._converters if issubclass(kind, accepted)), None)
+
+        base_a, base_b = base(type(a)), base(type(b))
+        if base_a is None or base_b is None:
+            logger.error("%s error: parameters must be numbers", _LABELS[operation])
             raise TypeError("Parameters must be numbers")
-        return a + b
+        entry = self._dispatch[type(a), type(b)] = self._entry(base_a, base_b)
+        return entry
+
+    def _accepts_type(self, kind):
+        return (kind, kind) in self._dispatch or any(issubclass(kind, accepted) for accepted in self._converters)
+
+    def _calculate(self, operation, a, b):
+        """The one dispatch path behind add, subtract, multiply and divide."""
+        convert_a, convert_b, arithmetic = self._dispatch.get((type(a), type(b))) or self._lookup(operation, a, b)
+        if convert_a is not None:
+            a = convert_a(a)
+        if convert_b is not None:
+            b = convert_b(b)
+        if operation == 3 and b == 0:
+            logger.error("Division error: division by zero")
+            raise ZeroDivisionError("Cannot divide by zero")
+        return arithmetic[operation](a, b)
+
+    def _elementwise(self, operation):
+        if self.numeric_mode == "float":
+            return _NATIVE[operation]
+        return partial(self._calculate, operation)
+
+    def add(self, a, b):
+        if type(a) in self._plain and type(b) in self._plain:
+            return a + b
+        return self._calculate(0, a, b)
 
     def subtract(self, a, b):
-        if not (isinstance(a, (int, float,)) and isinstance(b, (int, float))):
-            logger.error("Subtraction error: parameters must be numbers")
-            raise TypeError("Parameters must be numbers")
-        return a - b
+        if type(a) in self._plain and type(b) in self._plain:
+            return a - b
+        return self._calculate(1, a, b)
 
     def multiply(self, a, b):
-        if not (isinstance(a, (int, float,)) and isinstance(b, (int, float))):
-            logger.error("Multiplication error: parameters must be numbers")
-            raise TypeError("Parameters must be numbers")
-        return a * b
-    
+        if type(a) in self._plain and type(b) in self._plain:
+            return a * b
+        return self._calculate(2, a, b)
+
     def divide(self, a, b):
-        if not (isinstance(a, (int, float)) and isinstance(b, (int, float))):
-            logger.error("Division error: parameters must be numbers")
+        if type(a) in self._plain_division and type(b) in self._plain_division and b:
+            return a / b
+        return self._calculate(3, a, b)
+
+    def _validate_batch(self, a, b, operation):
+        """
+        Check a whole batch once: equal lengths and numbers only. NumPy
+        arrays must have a numeric dtype and are computed natively whatever
+        the numeric mode.
+        """
+        if np is not None and (isinstance(a, np.ndarray) or isinstance(b, np.ndarray)):
+            a, b = np.asarray(a), np.asarray(b)
+            if a.dtype.kind not in "biuf" or b.dtype.kind not in "biuf":
+                logger.error("%s error: parameters must be numbers", operation)
+                raise TypeError("Parameters must be numbers")
+            if a.shape != b.shape:
+                raise ValueError("Batches must have the same length")
+            return a, b
+        a, b = list(a), list(b)
+        if len(a) != len(b):
+            raise ValueError("Batches must have the same length")
+        # One isinstance-style check per distinct type instead of per element
+        types = set(map(type, a))
+        types.update(map(type, b))
+        if not all(self._accepts_type(kind) for kind in types):
+            logger.error("%s error: parameters must be numbers", operation)
             raise TypeError("Parameters must be numbers")
-        if b == 0:
-            logger.error("Division error: division by zero")
-            raise ZeroDivisionError("Cannot divide by zero")
-        return a / b
\ No newline at end of file
+        return a, b
+
+    def add_many(self, a, b):
+        a, b = self._validate_batch(a, b, "Addition")
+        return a + b if np is not None and isinstance(a, np.ndarray) else list(map(self._elementwise(0), a, b))
+
+    def subtract_many(self, a, b):
+        a, b = self._validate_batch(a, b, "Subtraction")
+        return a - b if np is not None and isinstance(a, np.ndarray) else list(map(self._elementwise(1), a, b))
+
+    def multiply_many(self, a, b):
+        a, b = self._validate_batch(a, b, "Multiplication")
+        return a * b if np is not None and isinstance(a, np.ndarray) else list(map(self._elementwise(2), a, b))
+
+    def divide_many(self, a, b, zero_division="raise"):
+        """
+        Element-wise ``a / b``.
+
+        ``zero_division`` decides what happens where ``b`` is 0:
+        ``"raise"`` raises ZeroDivisionError once for the batch, ``"nan"``
+        puts NaN there, a number puts that number there, and ``"mask"``
+        returns ``(results, zero_mask)`` with NaN at the masked positions.
+        """
+        if zero_division not in ("raise", "nan", "mask") and not isinstance(zero_division, (int, float)):
+            raise ValueError(f"Unknown zero division policy: {zero_division!r}")
+        a, b = self._validate_batch(a, b, "Division")
+        fill = math.nan if zero_division in ("nan", "mask") else zero_division
+        if np is not None and isinstance(a, np.ndarray):
+            zero_mask = b == 0
+            if zero_division == "raise" and zero_mask.any():
+                logger.error("Division error: division by zero")
+                raise ZeroDivisionError("Cannot divide by zero")
+            with np.errstate(divide="ignore", invalid="ignore"):
+                results = np.true_divide(a, b)
+            if zero_mask.any():
+                results[zero_mask] = fill
+        else:
+            zero_mask = [y == 0 for y in b]
+            if zero_division == "raise" and any(zero_mask):
+                logger.error("Division error: division by zero")
+                raise ZeroDivisionError("Cannot divide by zero")
+            divide = self._elementwise(3)
+            results = [fill if zero else divide(x, y) for x, y, zero in zip(a, b, zero_mask)]
+        if zero_division == "mask":
+            return results, zero_mask
+        return results
@@ -1,5 +1,8 @@
+import math
 import unittest
-from main import Calculator, logger
+from decimal import Context, Decimal
+from fractions import Fraction
+from main import Calculator, logger, np
 
 
 logger.info("Running calculator tests...")
@@ -50,5 +53,124 @@ class TestCalculator(unittest.TestCase):
         with self.assertRaises(TypeError):
             self.calc.add([], {})
 
+class TestCalculatorNumericModes(unittest.TestCase):
+    def test_default_mode_rejects_decimal_and_fraction(self):
+        calc = Calculator()
+        with self.assertRaises(TypeError):
+            calc.add(Decimal("1.1"), 2)
+        with self.assertRaises(TypeError):
+            calc.multiply(Fraction(1, 3), 3)
+
+    def test_int_fast_path(self):
+        for mode in ("float", "decimal", "fraction"):
+            with self.subTest(mode=mode):
+                result = Calculator(mode).multiply(6, 7)
+                self.assertEqual(result, 42)
+                self.assertIs(type(result), int)
+
+    def test_decimal_mode(self):
+        calc = Calculator("decimal")
+        self.assertEqual(calc.add(Decimal("0.1"), 0.2), Decimal("0.3"))
+        self.assertEqual(calc.divide(1, 4), Decimal("0.25"))
+        self.assertEqual(calc.multiply(Fraction(1, 4), Decimal("2")), Decimal("0.50"))
+
+    def test_decimal_context(self):
+        calc = Calculator("decimal", decimal_context=Context(prec=5))
+        self.assertEqual(calc.divide(Decimal(1), 3), Decimal("0.33333"))
+
+    def test_fraction_mode(self):
+        calc = Calculator("fraction")
+        self.assertEqual(calc.divide(1, 3), Fraction(1, 3))
+        self.assertEqual(calc.add(Fraction(1, 3), 0.5), Fraction(5, 6))
+        self.assertEqual(calc.subtract(Decimal("0.75"), Fraction(1, 4)), Fraction(1, 2))
+
+    def test_modes_keep_errors(self):
+        for mode in ("float", "decimal", "fraction"):
+            calc = Calculator(mode)
+            with self.subTest(mode=mode):
+                with self.assertRaises(ZeroDivisionError):
+                    calc.divide(Decimal(1) if mode != "float" else 1, 0)
+                with self.assertRaises(TypeError):
+                    calc.add("2", 3)
+
+    def test_subclasses_use_the_slow_path_once(self):
+        calc = Calculator()
+        self.assertEqual(calc.add(True, 2), 3)
+        self.assertIn((bool, int), calc._dispatch)
+
+    def test_unknown_mode(self):
+        with self.assertRaises(ValueError):
+            Calculator("complex")
+
+    def test_batch_in_fraction_mode(self):
+        calc = Calculator("fraction")
+        self.assertEqual(calc.divide_many([1, Fraction(1, 2)], [3, 2]), [Fraction(1, 3), Fraction(1, 4)])
+        with self.assertRaises(TypeError):
+            calc.add_many([1, "2"], [1, 1])
+
+class TestCalculatorBatch(unittest.TestCase):
+    def setUp(self):
+        self.calc = Calculator()
+        self.a = [10, -2, 2.5, 7, 0]
+        self.b = [2, 3, 0.5, 4, 9]
+
+    def tearDown(self):
+        del self.calc
+
+    def test_batches_match_scalar_methods(self):
+        for name in ("add", "subtract", "multiply", "divide"):
+            scalar = getattr(self.calc, name)
+            batch = getattr(self.calc, f"{name}_many")
+            self.assertEqual(batch(self.a, self.b), [scalar(x, y) for x, y in zip(self.a, self.b)])
+
+    def test_batch_accepts_iterables(self):
+        self.assertEqual(self.calc.add_many(range(3), (1, 1, 1)), [1, 2, 3])
+
+    def test_batch_type_error(self):
+        with self.assertRaises(TypeError):
+            self.calc.add_many([1, "2"], [3, 4])
+
+    def test_batch_length_mismatch(self):
+        with self.assertRaises(ValueError):
+            self.calc.multiply_many([1, 2], [3])
+
+    def test_divide_many_raises_by_default(self):
+        with self.assertRaises(ZeroDivisionError):
+            self.calc.divide_many([1, 2], [1, 0])
+
+    def test_divide_many_zero_division_policies(self):
+        results = self.calc.divide_many([1, 2, 3], [1, 0, 2], zero_division="nan")
+        self.assertEqual(results[0], 1)
+        self.assertTrue(math.isnan(results[1]))
+        self.assertEqual(self.calc.divide_many([1, 2], [0, 4], zero_division=0), [0, 0.5])
+        results, mask = self.calc.divide_many([1, 2], [0, 4], zero_division="mask")
+        self.assertEqual(mask, [True, False])
+        self.assertEqual(results[1], 0.5)
+
+    def test_unknown_zero_division_policy(self):
+        with self.assertRaises(ValueError):
+            self.calc.divide_many([1], [1], zero_division="ignore")
+
+    @unittest.skipIf(np is None, "NumPy is not installed")
+    def test_numpy_batches_match_scalar_methods(self):
+        a, b = np.array(self.a), np.array(self.b)
+        for name in ("add", "subtract", "multiply", "divide"):
+            scalar = getattr(self.calc, name)
+            batch = getattr(self.calc, f"{name}_many")
+            self.assertEqual(batch(a, b).tolist(), [scalar(x, y) for x, y in zip(self.a, self.b)])
+
+    @unittest.skipIf(np is None, "NumPy is not installed")
+    def test_numpy_divide_mask(self):
+        results, mask = self.calc.divide_many(np.array([1, 2]), np.array([0, 4]), zero_division="mask")
+        self.assertEqual(mask.tolist(), [True, False])
+        self.assertTrue(math.isnan(results[0]))
+        with self.assertRaises(ZeroDivisionError):
+            self.calc.divide_many(np.array([1]), np.array([0]))
+
+    @unittest.skipIf(np is None, "NumPy is not installed")
+    def test_numpy_type_error(self):
+        with self.assertRaises(TypeError):
+            self.calc.add_many(np.array(["1"]), np.array([1]))
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,87 @@
+import math
+import unittest
+from main import Calculator, np
+from expression import compile_expression, evaluate
+
+
+class TestExpression(unittest.TestCase):
+    def setUp(self):
+        self.calc = Calculator()
+
+    def tearDown(self):
+        del self.calc
+
+    def test_precedence_and_parentheses(self):
+        self.assertEqual(evaluate("1 + 2 * 3"), 7)
+        self.assertEqual(evaluate("(1 + 2) * 3"), 9)
+        self.assertEqual(evaluate("10 - 4 - 3"), 3)
+        self.assertEqual(evaluate("8 / 4 / 2"), 1)
+
+    def test_variables(self):
+        self.assertEqual(evaluate("(a + b) * c / d", {"a": 1, "b": 3, "c": 5, "d": 2}), 10)
+
+    def test_matches_chained_calculator_calls(self):
+        a, b, c, d = 2.5, -1, 4, 3
+        expected = self.calc.divide(self.calc.multiply(self.calc.add(a, b), c), d)
+        self.assertEqual(evaluate("(a + b) * c / d", {"a": a, "b": b, "c": c, "d": d}), expected)
+
+    def test_unary_minus_and_numbers(self):
+        self.assertEqual(evaluate("-a + +2", {"a": 3}), -1)
+        self.assertEqual(evaluate("-(1.5e1 - .5)"), -14.5)
+
+    def test_plan_is_cached_by_text(self):
+        self.assertIs(compile_expression("a * b"), compile_expression("a * b"))
+        self.assertEqual(compile_expression("a * b + a").variables, ("a", "b"))
+
+    def test_calculator_errors_are_kept(self):
+        with self.assertRaises(ZeroDivisionError):
+            evaluate("a / (b - 2)", {"a": 1, "b": 2})
+        with self.assertRaises(TypeError):
+            evaluate("a + 1", {"a": "1"})
+
+    def test_unbound_variable(self):
+        with self.assertRaises(NameError):
+            evaluate("a + b", {"a": 1})
+
+    def test_variables_named_like_parameters(self):
+        self.assertEqual(evaluate("calculator * zero_division", {"calculator": 2, "zero_division": 3}), 6)
+        expression = compile_expression("values + columns")
+        self.assertEqual(expression.evaluate_many({"values": [1, 2], "columns": [3, 4]}), [4, 6])
+
+    def test_nesting_depth_is_capped(self):
+        self.assertEqual(evaluate("-" * 100 + "1"), 1)
+        self.assertEqual(evaluate("(" * 100 + "2" + ")" * 100), 2)
+        for text in ("-" * 3000 + "1", "(" * 3000 + "1" + ")" * 3000, "-(" * 60 + "1" + ")" * 60):
+            with self.subTest(length=len(text)):
+                with self.assertRaises(SyntaxError):
+                    compile_expression(text)
+
+    def test_syntax_errors(self):
+        for text in ("", "1 +", "(1 + 2", "1 2", "a ** 2", "__import__('os')"):
+            with self.subTest(text=text):
+                with self.assertRaises(SyntaxError):
+                    compile_expression(text)
+
+    def test_evaluate_many_matches_scalar(self):
+        expression = compile_expression("(a + b) * c / d - 1")
+        columns = {"a": [1, 2, 3], "b": [0.5, -2, 4], "c": [2, 2, 2], "d": [4, 1, 7]}
+        expected = [expression.evaluate(dict(zip(columns, row))) for row in zip(*columns.values())]
+        self.assertEqual(expression.evaluate_many(columns), expected)
+
+    def test_evaluate_many_zero_division(self):
+        expression = compile_expression("a / b")
+        with self.assertRaises(ZeroDivisionError):
+            expression.evaluate_many({"a": [1, 2], "b": [1, 0]})
+        results = expression.evaluate_many({"a": [1, 2], "b": [1, 0]}, zero_division="nan")
+        self.assertTrue(math.isnan(results[1]))
+        with self.assertRaises(ValueError):
+            expression.evaluate_many({"a": [1], "b": [1]}, zero_division="mask")
+
+    @unittest.skipIf(np is None, "NumPy is not installed")
+    def test_evaluate_many_numpy(self):
+        expression = compile_expression("-a * 2 + b")
+        results = expression.evaluate_many({"a": np.array([1.0, 2.0]), "b": np.array([3.0, 4.0])})
+        self.assertEqual(results.tolist(), [1.0, 0.0])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+import unittest
+from decimal import Decimal
+from main import Calculator, logger
+from expression import compile_expression
+from instrumentation import instrument
+
+
+class TestInstrumentation(unittest.TestCase):
+    def setUp(self):
+        self.calc = Calculator()
+        logger.disabled = True
+
+    def tearDown(self):
+        logger.disabled = False
+        del self.calc
+
+    def test_uninstrumented_calculator_is_untouched(self):
+        self.assertNotIn("add", vars(self.calc))
+        hooks = instrument(self.calc)
+        self.assertIn("add", vars(self.calc))
+        hooks.remove()
+        self.assertEqual(vars(self.calc).keys() & {"add", "divide_many"}, set())
+        self.assertEqual(self.calc.add(1, 2), 3)
+
+    def test_counts_calls_time_and_errors(self):
+        hooks = instrument(self.calc)
+        self.assertEqual(self.calc.add(1, 2), 3)
+        self.calc.add(3, 4)
+        with self.assertRaises(ZeroDivisionError):
+            self.calc.divide(1, 0)
+        with self.assertRaises(TypeError):
+            self.calc.divide("1", 2)
+        self.assertEqual(self.calc.multiply_many([1, 2], [3, 4]), [3, 8])
+        stats = hooks.as_dict()
+        self.assertEqual(set(stats), {"add", "divide", "multiply_many"})
+        self.assertEqual(stats["add"]["calls"], 2)
+        self.assertGreaterEqual(stats["add"]["seconds"], 0)
+        self.assertEqual(stats["divide"]["errors"], {"ZeroDivisionError": 1, "TypeError": 1})
+        self.assertEqual(stats["multiply_many"]["calls"], 1)
+
+    def test_instrumenting_twice_is_rejected(self):
+        instrument(self.calc)
+        with self.assertRaises(ValueError):
+            instrument(self.calc)
+
+    def test_memoization(self):
+        hooks = instrument(self.calc, cache_size=2)
+        for _ in range(3):
+            self.assertEqual(self.calc.multiply(6, 7), 42)
+        self.assertEqual(hooks.as_dict()["multiply"]["cache_hits"], 2)
+        self.calc.multiply(1, 1)
+        self.calc.multiply(2, 2)
+        self.assertEqual(hooks.cache_info(), {"size": 2, "max_size": 2})
+        self.calc.multiply(6, 7)
+        self.assertEqual(hooks.as_dict()["multiply"]["cache_misses"], 4)
+
+    def test_memoization_keeps_types_apart(self):
+        calc = Calculator("decimal")
+        instrument(calc, cache_size=8)
+        self.assertIsInstance(calc.add(1, 1), int)
+        self.assertIsInstance(calc.add(Decimal(1), 1), Decimal)
+
+    def test_errors_are_not_memoized(self):
+        hooks = instrument(self.calc, cache_size=8)
+        for _ in range(2):
+            with self.assertRaises(ZeroDivisionError):
+                self.calc.divide(1, 0)
+        self.assertEqual(hooks.as_dict()["divide"]["errors"], {"ZeroDivisionError": 2})
+        self.assertEqual(hooks.as_dict()["divide"]["cache_hits"], 0)
+
+    def test_expressions_use_the_hooks(self):
+        hooks = instrument(self.calc)
+        compile_expression("(a + b) * c").evaluate({"a": 1, "b": 2, "c": 3}, self.calc)
+        self.assertEqual(hooks.as_dict()["add"]["calls"], 1)
+        self.assertEqual(hooks.as_dict()["multiply"]["calls"], 1)
+
+    def test_prometheus_export(self):
+        hooks = instrument(self.calc)
+        self.calc.add(1, 2)
+        with self.assertRaises(ZeroDivisionError):
+            self.calc.divide(1, 0)
+        text = hooks.to_prometheus()
+        self.assertIn("# TYPE calculator_operation_calls_total counter", text)
+        self.assertIn('calculator_operation_calls_total{operation="add"} 1', text)
+        self.assertIn('calculator_operation_errors_total{operation="divide",error="ZeroDivisionError"} 1', text)
+        self.assertNotIn('operation="subtract"', text)
+
+if __name__ == '__main__':
+    unittest.main()
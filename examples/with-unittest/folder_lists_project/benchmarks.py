@@ -0,0 +1,83 @@
+"""
+Benchmarks for folder scanning.
+
+Run from this folder, e.g. ``python benchmarks.py scan --files 1000000``
+or ``python benchmarks.py parallel --files 2000000 --root /tmp/tree``.
+A synthetic tree is built under ``--root`` (a temporary folder by default)
+and kept there if ``--root`` is given, so it can be reused between runs.
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from main import Folder
+
+
+def _timed(label, operations, func):
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<40} {elapsed:8.3f}s {operations / elapsed:14,.0f} files/s")
+    return result
+
+
+def make_tree(root, files, files_per_folder=100, fan_out=10):
+    """Spread ``files`` empty files over a tree of folders ``fan_out`` wide."""
+    marker = os.path.join(root, f".tree-{files}")
+    if os.path.exists(marker):
+        return
+    for number in range(0, files, files_per_folder):
+        folder_number = number // files_per_folder
+        parts = []
+        while True:
+            parts.append(f"d{folder_number % fan_out}")
+            folder_number //= fan_out
+            if not folder_number:
+                break
+        folder = os.path.join(root, *parts)
+        os.makedirs(folder, exist_ok=True)
+        for file_number in range(number, min(number + files_per_folder, files)):
+            open(os.path.join(folder, f"f{file_number}.txt"), "w").close()
+    open(marker, "w").close()
+
+
+def bench_scan(root, files):
+    folder = Folder(root)
+    walked = _timed("list_files_walk (os.walk)", files, lambda: len(Folder(root).list_files_walk()))
+    scanned = _timed("scan (os.scandir stack)", files, lambda: sum(1 for _ in folder.scan()))
+    _timed("get_all_files", files, lambda: len(folder.get_all_files(root)))
+    _timed("first result from scan", 1, lambda: next(folder.scan()))
+    # The marker file is counted by both
+    print(f"files found: walk {walked:,}, scan {scanned:,}")
+
+
+def bench_parallel(root, files):
+    folder = Folder(root)
+    _timed("scan (one thread)", files, lambda: sum(1 for _ in folder.scan()))
+    for ordered in (False, True):
+        for threads in (1, 2, 4, 8, 16, 32):
+            label = f"scan_parallel threads={threads}" + (" ordered" if ordered else "")
+            _timed(label, files, lambda: sum(1 for _ in folder.scan_parallel(threads=threads, ordered=ordered)))
+
+
+BENCHMARKS = {
+    "parallel": bench_parallel,
+    "scan": bench_scan,
+}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("benchmark", choices=sorted(BENCHMARKS))
+    parser.add_argument("--files", type=int, default=1_000_000)
+    parser.add_argument("--root")
+    args = parser.parse_args()
+    if args.root:
+        os.makedirs(args.root, exist_ok=True)
+        make_tree(args.root, args.files)
+        BENCHMARKS[args.benchmark](args.root, args.files)
+    else:
+        with tempfile.TemporaryDirectory() as root:
+            make_tree(root, args.files)
+            BENCHMARKS[args.benchmark](root, args.files)
@@ -1,4 +1,34 @@
 import os
+import queue
+from concurrent.futures import ThreadPoolExecutor
+
+
+def _list_folder(folder, prefix, files, folders, ordered=False):
+    """
+    The paths in ``folder`` to report, each starting with ``prefix``, and
+    the ``(path, prefix)`` of every sub-folder to descend into.
+    """
+    names, children = [], []
+    try:
+        entries = os.scandir(folder)
+    except OSError:
+        return names, children
+    with entries:
+        if ordered:
+            entries = sorted(entries, key=lambda entry: entry.name)
+        for entry in entries:
+            try:
+                is_folder = entry.is_dir()
+            except OSError:
+                continue
+            if is_folder:
+                if folders:
+                    names.append(prefix + entry.name)
+                if not entry.is_symlink():
+                    children.append((entry.path, prefix + entry.name + os.sep))
+            elif files:
+                names.append(prefix + entry.name)
+    return names, children
 
 
 class File:
@@ -23,25 +53,103 @@ class Folder:
     def is_file(self, path):
         return os.path.isfile(path)
     
+    def scan(self, path=None, files=True, folders=False):
+        """
+        Lazily yield the paths under ``path`` (default ``self.path``), files
+        and/or folders, relative to ``path``.
+
+        Walks with an explicit stack of folders, each listed with
+        ``os.scandir``, instead of recursion, so depth is not limited by the
+        recursion limit, and uses the type each DirEntry already carries
+        instead of a stat per entry.
+        Symlinks to folders count as folders but are not followed, and
+        folders that cannot be read are skipped, as with ``os.walk``.
+        """
+        path = self.path if path is None else path
+        stack = [(path, "")]
+        while stack:
+            names, children = _list_folder(*stack.pop(), files, folders)
+            stack.extend(children)
+            yield from names
+
+    def scan_parallel(self, path=None, files=True, folders=False, threads=8, ordered=False, max_pending=None):
+        """
+        Like ``scan``, but lists folders in a pool of ``threads`` threads;
+        ``os.scandir`` releases the GIL while it waits on the filesystem.
+
+        At most ``max_pending`` folders (default ``4 * threads``) are being
+        listed or waiting to be consumed at a time, so however far the
+        caller lags behind, no more than that many listings are held.
+        Sub-folders found but not listed yet are kept too, as paths; like
+        the stack in ``scan`` there are as many of them as the sub-folders
+        of the folders on the way down, since the newest are listed first,
+        so a tree with very wide folders takes memory in proportion to
+        their width. Unordered, paths come in the order folders finish. With ``ordered`` every folder's paths come
+        sorted by name, followed by its sub-folders in the same order, so
+        the result is the same on every run.
+        """
+        path = self.path if path is None else path
+        max_pending = max_pending or 4 * threads
+        executor = ThreadPoolExecutor(threads, thread_name_prefix="scan")
+        try:
+            if ordered:
+                yield from self._scan_ordered(executor, path, files, folders, max_pending)
+            else:
+                yield from self._scan_unordered(executor, path, files, folders, max_pending)
+        finally:
+            executor.shutdown(cancel_futures=True)
+
+    @staticmethod
+    def _scan_unordered(executor, path, files, folders, max_pending):
+        finished = queue.SimpleQueue()
+        waiting = [(path, "")]
+        pending = 0
+        while waiting or pending:
+            while waiting and pending < max_pending:
+                future = executor.submit(_list_folder, *waiting.pop(), files, folders)
+                future.add_done_callback(finished.put)
+                pending += 1
+            names, children = finished.get().result()
+            pending -= 1
+            waiting.extend(children)
+            yield from names
+
+    @staticmethod
+    def _scan_ordered(executor, path, files, folders, max_pending):
+        # Folders still to be consumed, next on top, each with its listing
+        # once submitted; the ones nearest the top are submitted first
+        stack = [[(path, ""), None]]
+        pending = 0
+        while stack:
+            for waiting in reversed(stack):
+                if pending >= max_pending:
+                    break
+                if waiting[1] is None:
+                    waiting[1] = executor.submit(_list_folder, *waiting[0], files, folders, True)
+                    pending += 1
+            folder, future = stack.pop()
+            if future is None:
+                names, children = _list_folder(*folder, files, folders, True)
+            else:
+                names, children = future.result()
+                pending -= 1
+            stack.extend([child, None] for child in reversed(children))
+            yield from names
+
     def get_sub_folders(self, path):
         if os.path.exists(path):
-            all_files = [ entry for entry in os.listdir(path) if os.path.isdir(entry)]
-        return all_files
+            with os.scandir(path) as entries:
+                return sorted(entry.name for entry in entries if entry.is_dir())
+        return []
     
     def get_files(self, path):
         if os.path.exists(path):
-            all_files = [ entry for entry in os.listdir(path) if os.path.isfile(entry)]
-        return all_files
+            with os.scandir(path) as entries:
+                return sorted(entry.name for entry in entries if entry.is_file())
+        return []
     
     def get_all_files(self, path):
-        all_files =  []
-        if os.path.exists(path):
-            for entry in os.listdir(path):
-                if os.path.isfile(entry):
-                    all_files.append(entry)
-                else:
-                    self.get_all_files(entry)
-        return all_files
+        return list(self.scan(path))
     
     
     def list_files_walk(self):
@@ -54,24 +162,7 @@ class Folder:
         return self.all_files
     
     def get_all_sub_folders(self, path):
-        all_folders =  []
-        if os.path.exists(path):
-            for entry in os.listdir(path):
-                if os.path.isdir(entry):
-                    all_folders.append(entry)
-                else:
-                    self.get_all_sub_folders(entry)
-        return all_folders
-    
-    def get_all_sub_folders(self, path):
-        all_folders =  []
-        if os.path.exists(path):
-            for entry in os.listdir(path):
-                if os.path.isfile(entry):
-                    all_folders.append(entry)
-                else:
-                    self.get_all_sub_folders(entry)
-        return all_folders
+        return list(self.scan(path, files=False, folders=True))
 
 
 """
@@ -1,4 +1,7 @@
 import os
+import sys
+import tempfile
+import threading
 import unittest
 from main import Folder, File
 
@@ -19,18 +22,20 @@ class TestFolder(unittest.TestCase):
 
     def test_getting_current_folder_files(self):
         current_folder_files = [
-            "test_main.py",  "practice.py","main.py",
+            "test_main.py",  "practice.py","main.py", "benchmarks.py",
         ][::-1]
         self.assertListEqual(current_folder_files, self.folder.get_files("."))
 
     def test_getting_all_files_in_a_path(self):
         # path = "tests"
         # self.assertListEqual([], self.folder.get_all_sub_folders(path))
-        self.assertEqual(8, len(self.folder.list_files_walk()))
+        files = [path for path in self.folder.list_files_walk() if "__pycache__" not in path]
+        self.assertEqual(6, len(files))
 
     def test_getting_current_folder_sub_folders(self):
-        current_folder_files = ['.vscode', 'tests', '__pycache__']
-        self.assertEqual(current_folder_files, self.folder.get_sub_folders("."))
+        current_folder_files = ['.vscode', 'tests']
+        self.assertEqual(current_folder_files,
+                         [folder for folder in self.folder.get_sub_folders(".") if folder != "__pycache__"])
 
     def test_given_path_is_not_a_file(self):
         self.assertEqual(self.folder.is_folder("tests"), True)
@@ -39,8 +44,12 @@ class TestFolder(unittest.TestCase):
         self.assertEqual(self.folder.is_file("main.py"), True)
 
     def test_getting_files_in_all_child_folders(self):
-        current_folder_and_sub_folders_files = ['main.py', 'practice.py', 'test_main.py']
-        self.assertEqual(current_folder_and_sub_folders_files, self.folder.get_all_files("."))
+        current_folder_and_sub_folders_files = [os.path.join('.vscode', 'settings.json'),
+                                                'benchmarks.py', 'main.py', 'practice.py', 'test_main.py',
+                                                os.path.join('tests', 'tests2', 'tests2', 'tests2', 'log')]
+        all_files = self.folder.get_all_files(".")
+        self.assertEqual(current_folder_and_sub_folders_files,
+                         sorted(path for path in all_files if "__pycache__" not in path))
 
     def test_get_all_files(self):
         self.assertEqual([], self.folder.all_files)
@@ -53,6 +62,118 @@ class TestFolder(unittest.TestCase):
         self.assertEqual(True, os.path.exists(file_path))
 
 
+class TestFolderScan(unittest.TestCase):
+    def setUp(self):
+        self.temporary = tempfile.TemporaryDirectory()
+        self.root = self.temporary.name
+        for path in ("a.txt", "docs/b.txt", "docs/deep/c.txt", "empty/", "music/d.mp3"):
+            full_path = os.path.join(self.root, *path.split("/"))
+            if path.endswith("/"):
+                os.makedirs(full_path)
+            else:
+                os.makedirs(os.path.dirname(full_path), exist_ok=True)
+                open(full_path, "w").close()
+        self.folder = Folder(self.root)
+
+    def tearDown(self):
+        self.temporary.cleanup()
+        self.folder = None
+
+    def test_scan_files(self):
+        expected = ["a.txt", os.path.join("docs", "b.txt"), os.path.join("docs", "deep", "c.txt"),
+                    os.path.join("music", "d.mp3")]
+        self.assertEqual(expected, sorted(self.folder.scan()))
+        self.assertEqual(expected, sorted(self.folder.get_all_files(self.root)))
+
+    def test_scan_matches_list_files_walk(self):
+        walked = sorted(os.path.relpath(path, self.root) for path in self.folder.list_files_walk())
+        self.assertEqual(walked, sorted(self.folder.scan()))
+
+    def test_scan_sub_folders(self):
+        expected = ["docs", os.path.join("docs", "deep"), "empty", "music"]
+        self.assertEqual(expected, sorted(self.folder.get_all_sub_folders(self.root)))
+        self.assertEqual(len(expected) + 4, len(list(self.folder.scan(files=True, folders=True))))
+
+    def test_scan_is_lazy(self):
+        scan = self.folder.scan()
+        self.assertIsNotNone(next(scan))
+        scan.close()
+
+    def test_missing_path(self):
+        self.assertEqual([], list(self.folder.scan(os.path.join(self.root, "missing"))))
+        self.assertEqual([], self.folder.get_files(os.path.join(self.root, "missing")))
+
+    def test_direct_children(self):
+        self.assertEqual(["a.txt"], self.folder.get_files(self.root))
+        self.assertEqual(["docs", "empty", "music"], self.folder.get_sub_folders(self.root))
+
+    def test_deeper_than_recursion_limit(self):
+        depth = 300
+        path = os.path.join(self.root, *["d"] * depth)
+        os.makedirs(path)
+        open(os.path.join(path, "bottom.txt"), "w").close()
+        limit = sys.getrecursionlimit()
+        sys.setrecursionlimit(depth // 2)
+        try:
+            bottom = [found for found in self.folder.scan() if found.endswith("bottom.txt")]
+        finally:
+            sys.setrecursionlimit(limit)
+        self.assertEqual([os.path.join(*["d"] * depth, "bottom.txt")], bottom)
+
+    @unittest.skipUnless(hasattr(os, "symlink"), "symlinks are not supported")
+    def test_symlinked_folders_are_not_followed(self):
+        os.symlink(os.path.join(self.root, "docs"), os.path.join(self.root, "link"))
+        self.assertNotIn(os.path.join("link", "b.txt"), list(self.folder.scan()))
+        self.assertIn("link", self.folder.get_all_sub_folders(self.root))
+
+
+class TestFolderScanParallel(unittest.TestCase):
+    def setUp(self):
+        self.temporary = tempfile.TemporaryDirectory()
+        self.root = self.temporary.name
+        for first in "ba":
+            for second in "dc":
+                folder = os.path.join(self.root, first, second)
+                os.makedirs(folder)
+                for name in ("y.txt", "x.txt"):
+                    open(os.path.join(folder, name), "w").close()
+        open(os.path.join(self.root, "z.txt"), "w").close()
+        self.folder = Folder(self.root)
+
+    def tearDown(self):
+        self.temporary.cleanup()
+        self.folder = None
+
+    def test_matches_scan(self):
+        for threads in (1, 2, 8):
+            self.assertEqual(sorted(self.folder.scan()), sorted(self.folder.scan_parallel(threads=threads)))
+        self.assertEqual(sorted(self.folder.scan(folders=True)),
+                         sorted(self.folder.scan_parallel(folders=True, max_pending=1)))
+
+    def test_ordered(self):
+        expected = ["a", "b", "z.txt",
+                    os.path.join("a", "c"), os.path.join("a", "d"),
+                    os.path.join("a", "c", "x.txt"), os.path.join("a", "c", "y.txt"),
+                    os.path.join("a", "d", "x.txt"), os.path.join("a", "d", "y.txt"),
+                    os.path.join("b", "c"), os.path.join("b", "d"),
+                    os.path.join("b", "c", "x.txt"), os.path.join("b", "c", "y.txt"),
+                    os.path.join("b", "d", "x.txt"), os.path.join("b", "d", "y.txt")]
+        for threads, max_pending in ((1, None), (4, 1), (4, 2), (16, None)):
+            self.assertEqual(expected, list(self.folder.scan_parallel(
+                folders=True, threads=threads, ordered=True, max_pending=max_pending)))
+
+    def test_missing_path(self):
+        self.assertEqual([], list(self.folder.scan_parallel(os.path.join(self.root, "missing"))))
+        self.assertEqual([], list(self.folder.scan_parallel(os.path.join(self.root, "missing"), ordered=True)))
+
+    def test_stopping_early_shuts_the_pool_down(self):
+        for ordered in (False, True):
+            scan = self.folder.scan_parallel(threads=4, ordered=ordered)
+            self.assertIsNotNone(next(scan))
+            scan.close()
+        self.assertEqual([], [thread for thread in threading.enumerate() if thread.name.startswith("scan")])
+
+
 class TestFile(unittest.TestCase):
     def setUp(self):
         self.file = File("main.py")
@@ -0,0 +1,314 @@
+"""
+Benchmarks for the library.
+
+Run from this folder, e.g. ``python benchmarks.py search --materials 1000000``.
+"""
+import argparse
+import csv
+import itertools
+import json
+import logging
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+
+from main import Library, ReadingMaterialUnit
+
+WORDS = ("history", "science", "maths", "poems", "letters", "journal", "modern", "ancient", "river", "city",
+         "garden", "war", "peace", "stars", "ocean", "mountain", "machine", "language", "music", "winter")
+NAMES = ("ada", "alan", "grace", "chinua", "wole", "ngugi", "toni", "jane", "leo", "mary",
+         "kwame", "amina", "yaa", "buchi", "ayi", "tsitsi", "ben", "nadine", "bessie", "sefi")
+
+
+def _timed(label, operations, func):
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<40} {elapsed:8.3f}s {operations / elapsed:14,.0f} ops/s")
+    return result
+
+
+def material_fields(count, seed=1):
+    rng = random.Random(seed)
+    for number in range(count):
+        title = " ".join(rng.sample(WORDS, 3)) + f" volume {number % 500}"
+        author = f"{rng.choice(NAMES)} {rng.choice(NAMES)}son"
+        # Built per record, as a parser would, so repeats are separate objects
+        type_ = "".join(rng.choice((("bo", "ok"), ("bo", "ok"), ("bo", "ok"), ("arti", "cle"), ("news", "paper"))))
+        yield title, author, rng.randint(1900, 2025), f"isbn-{number}", type_
+
+
+def make_materials(count, seed=1):
+    for fields in material_fields(count, seed):
+        yield ReadingMaterialUnit(*fields)
+
+
+def bench_search(materials, queries=200):
+    logging.disable(logging.INFO)
+    library = Library("benchmark library")
+    units = list(make_materials(materials))
+    _timed("index materials", materials, lambda: [library.add_reading_material_unit(unit) for unit in units])
+    _timed("first range query (sorts years)", 1, lambda: library.search(year_from=2000, year_to=2000))
+
+    def linear_scan():
+        words = ("maths", "river")
+        return sorted((unit for unit in library.get_reading_materials().values()
+                       if all(word in unit.title.lower().split() for word in words)
+                       and 1990 <= unit.year_published <= 2000), key=lambda unit: -unit.year_published)[:10]
+
+    _timed("linear scan, 2 words + years", 1, linear_scan)
+    for label, query in (
+        ("rare word", {"text": "volume 7"}),
+        ("2 words + years", {"text": "maths river", "year_from": 1990, "year_to": 2000}),
+        ("author + type", {"author": "ada", "type_": "newspaper"}),
+        ("common word", {"text": "maths"}),
+    ):
+        _timed(f"query: {label}", queries, lambda: [library.search(**query) for _ in range(queries)])
+    logging.disable(logging.NOTSET)
+
+
+def _isbn13(number):
+    digits = f"978{number:09d}"
+    check = -sum(int(digit) * (3 if position % 2 else 1) for position, digit in enumerate(digits)) % 10
+    return f"{digits}{check}"
+
+
+def bench_ingest(materials):
+    from ingest import ingest, iter_reading_materials
+
+    logging.disable(logging.INFO)
+    with tempfile.TemporaryDirectory() as folder:
+        csv_path, jsonl_path = os.path.join(folder, "catalog.csv"), os.path.join(folder, "catalog.jsonl")
+        with open(csv_path, "w", newline="", encoding="utf-8") as csv_file, \
+                open(jsonl_path, "w", encoding="utf-8") as jsonl_file:
+            writer = csv.writer(csv_file)
+            writer.writerow(("title", "author", "year_published", "isbn", "type"))
+            for unit in make_materials(materials):
+                row = (unit.title, unit.author, unit.year_published, _isbn13(int(unit.isbn[5:])), unit.type)
+                writer.writerow(row)
+                jsonl_file.write(json.dumps(dict(zip(("title", "author", "year_published", "isbn", "type"), row))))
+                jsonl_file.write("\n")
+
+        def one_by_one():
+            library = Library("benchmark library")
+            with open(csv_path, newline="", encoding="utf-8") as handle:
+                for row in csv.DictReader(handle):
+                    library.add_reading_material_unit(ReadingMaterialUnit(
+                        row["title"], row["author"], int(row["year_published"]), row["isbn"], row["type"]))
+
+        _timed("one by one (CSV, no validation)", materials, one_by_one)
+        for path in (csv_path, jsonl_path):
+            for processes in (None, 4):
+                label = f"{os.path.splitext(path)[1][1:]}, {processes or 1} process(es)"
+                _timed(f"parse + validate: {label}", materials,
+                       lambda: sum(len(units) for units in iter_reading_materials(path, processes=processes)))
+        for processes in (None, 4):
+            report = ingest(Library("benchmark library"), csv_path, processes=processes)
+            print(f"ingest into library, {processes or 1} process(es): {report}")
+    logging.disable(logging.NOTSET)
+
+
+class _PlainReadingMaterialUnit:
+    # ReadingMaterialUnit before __slots__ and interning, for comparison
+    def __init__(self, title, author, year_published, isbn, typr_="book"):
+        self.title = title
+        self.author = author
+        self.year_published = year_published
+        self.isbn = isbn
+        self.type = typr_
+
+
+class _PlainEmployee:
+    def __init__(self, name, profession, age, race="african"):
+        self.name = name
+        self.age = age
+        self.profession = profession
+        self.race = race
+
+
+def _traced(label, count, build):
+    tracemalloc.start()
+    built = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del built
+    print(f"{label:<40} {size / 2 ** 20:10,.1f} MiB {size / count:8,.1f} bytes/record")
+
+
+def bench_memory(materials):
+    from main import Employee
+    from tables import ReadingMaterialTable
+
+    professions = ("librarian", "cleaner", "archivist", "cataloguer", "security")
+    employees = max(1, materials // 10)
+
+    def employee_fields():
+        for number in range(employees):
+            yield (f"employee {number}", "".join(professions[number % 5]), 20 + number % 40,
+                   "".join(("afri", "can")))
+
+    _traced("plain objects", materials,
+            lambda: [_PlainReadingMaterialUnit(*fields) for fields in material_fields(materials)])
+    _traced("__slots__ + interning", materials,
+            lambda: [ReadingMaterialUnit(*fields) for fields in material_fields(materials)])
+    _traced("columnar table", materials,
+            lambda: ReadingMaterialTable(ReadingMaterialUnit(*fields) for fields in material_fields(materials)))
+    _traced(f"plain employees ({employees:,})", employees,
+            lambda: [_PlainEmployee(*fields) for fields in employee_fields()])
+    _traced(f"slotted employees ({employees:,})", employees,
+            lambda: [Employee(*fields) for fields in employee_fields()])
+
+
+def bench_isbn_index(materials, lookups=100_000):
+    from isbn_index import IsbnIndex
+
+    logging.disable(logging.INFO)
+    rng = random.Random(4)
+    with tempfile.TemporaryDirectory() as folder:
+        with IsbnIndex(folder, merge_threshold=100_000) as index:
+            units = make_materials(materials)
+            _timed("append + merge every 100k", materials,
+                   lambda: [index.add_many(chunk) for chunk in iter(lambda: list(itertools.islice(units, 10_000)), [])])
+            index.merge()
+
+        start = time.perf_counter()
+        index = IsbnIndex(folder)
+        print(f"{'open index':<40} {(time.perf_counter() - start) * 1000:8.3f}ms")
+        isbns = [f"isbn-{rng.randrange(materials)}" for _ in range(lookups)]
+        _timed("get() from the mapped index", lookups, lambda: [index.get(isbn) for isbn in isbns])
+        _timed("membership only", lookups, lambda: [isbn in index for isbn in isbns])
+        index.add_many(make_materials(5_000, seed=9))
+        _timed("membership with a 5k delta", lookups, lambda: [isbn in index for isbn in isbns])
+        index.close()
+
+        def load_everything():
+            with open(os.path.join(folder, "records.jsonl"), encoding="utf-8") as handle:
+                return {record[3]: ReadingMaterialUnit(*record) for record in map(json.loads, handle)}
+
+        _timed("full load of records.jsonl, for comparison", materials, load_everything)
+    logging.disable(logging.NOTSET)
+
+
+def bench_reports(materials, days=30):
+    from datetime import date, timedelta
+
+    from reservations import ReservationEngine
+
+    logging.disable(logging.INFO)
+    rng = random.Random(5)
+    engine = ReservationEngine()
+    isbns = [f"isbn-{number}" for number in range(materials)]
+    for isbn in isbns:
+        engine.add_copies(isbn, 2)
+    start_day = date(2026, 1, 1)
+    loans = materials
+    _timed("checkouts over 60 days", loans, lambda: [
+        engine.checkout(isbn, f"member-{number}", today=start_day + timedelta(days=rng.randrange(60)))
+        for number, isbn in enumerate(isbns)])
+    report_days = [start_day + timedelta(days=30 + day) for day in range(days)]
+
+    def scan(today):
+        # What a report without the heap has to do
+        overdue = [loan for isbn in isbns for loan in engine.loans(isbn) if loan.due < today]
+        return sorted(overdue, key=lambda loan: loan.due)
+
+    _timed("daily overdue report, full scan", days, lambda: [len(scan(today)) for today in report_days])
+    _timed("daily overdue report, heap", days,
+           lambda: [sum(1 for _ in engine.overdue(today)) for today in report_days])
+    _timed("availability report", days, lambda: [sum(1 for _ in engine.ready()) for _ in report_days])
+    logging.disable(logging.NOTSET)
+
+
+def bench_staffing(employees, branches=50, desks=8, days=28, queries=100_000):
+    from datetime import datetime, timedelta
+
+    from main import Employee
+    from staffing import Staffing
+
+    # Every desk of a branch is staffed at once, so a branch needs at least
+    # one librarian per desk; fewer branches are used if there are not enough
+    if employees < desks:
+        raise ValueError(f"The staffing benchmark needs at least {desks} employees, one per desk.")
+    branches = min(branches, employees // desks)
+    rng = random.Random(6)
+    staffing = Staffing()
+    staff = [Employee(f"librarian {number}", "librarian", 20 + number % 40) for number in range(employees)]
+    per_branch = employees // branches
+    first_day = datetime(2026, 3, 2)
+    slots = [(first_day + timedelta(days=day, hours=start), first_day + timedelta(days=day, hours=start + 6))
+             for day in range(days) for start in (8, 14)]
+    desk_names = [f"desk {number}" for number in range(desks)]
+
+    def schedule():
+        for branch in range(branches):
+            team = staff[branch * per_branch:(branch + 1) * per_branch]
+            staffing.fill(f"branch {branch}", desk_names, slots, team)
+
+    shifts = branches * desks * len(slots)
+    _timed(f"fill {shifts:,} shifts", shifts, schedule)
+    moments = [first_day + timedelta(minutes=rng.randrange(days * 24 * 60)) for _ in range(queries)]
+    branch_names = [f"branch {rng.randrange(branches)}" for _ in range(queries)]
+    _timed("first query (builds timelines)", 1, lambda: staffing.on_duty(moments[0]))
+    _timed("on duty in one branch", queries,
+           lambda: [staffing.on_duty(moment, branch) for moment, branch in zip(moments, branch_names)])
+    all_shifts = [shift for person in staff for shift in staffing.shifts(person)]
+    sample = queries // 100
+    _timed("same, linear scan (1/100 sample)", sample, lambda: [
+        [shift for shift in all_shifts if shift.branch == branch and shift.start <= moment < shift.end]
+        for moment, branch in zip(moments[:sample], branch_names)])
+    _timed(f"on duty across {branches} branches", queries // 10,
+           lambda: [staffing.on_duty(moment) for moment in moments[:queries // 10]])
+    hours = sorted(staffing.hours(person) for person in staff)
+    print(f"hours per librarian: min {hours[0]:.0f}, max {hours[-1]:.0f}")
+
+
+def bench_recommendations(materials, members=50_000, loans_per_member=10, queries=20_000):
+    from recommendations import CoBorrowing
+
+    rng = random.Random(7)
+    titles = max(1, materials // 50)
+    # Log-uniform: a few titles are borrowed far more often than the long tail
+    loans = [(f"member-{member}", f"isbn-{int(titles ** rng.random()) - 1}")
+             for member in range(members) for _ in range(loans_per_member)]
+    incremental = CoBorrowing()
+    _timed(f"record {len(loans):,} checkouts", len(loans),
+           lambda: [incremental.record_checkout(member, isbn) for member, isbn in loans])
+    entries = sum(len(row) for row in incremental.pairs.values())
+    print(f"{'matrix entries':<40} {entries:>17,}")
+    isbns = [f"isbn-{int(titles ** rng.random()) - 1}" for _ in range(queries)]
+    _timed("top-5 queries", queries, lambda: [incremental.recommend(isbn) for isbn in isbns])
+    bounded = CoBorrowing(min_count=2, max_neighbours=50)
+    _timed(f"record {len(loans):,} checkouts, bounded", len(loans),
+           lambda: [bounded.record_checkout(member, isbn) for member, isbn in loans])
+    bounded.prune()
+    entries = sum(len(row) for row in bounded.pairs.values())
+    print(f"{'matrix entries, bounded':<40} {entries:>17,}")
+    for processes in (None, 4):
+        rebuilt = CoBorrowing(min_count=2, max_neighbours=50)
+        _timed(f"recompute, {processes or 1} process(es)", len(loans),
+               lambda: rebuilt.recompute(loans, shards=8, processes=processes))
+    entries = sum(len(row) for row in rebuilt.pairs.values())
+    print(f"{'matrix entries after pruning':<40} {entries:>17,}")
+    _timed("top-5 queries, pruned", queries, lambda: [rebuilt.recommend(isbn) for isbn in isbns])
+
+
+BENCHMARKS = {
+    "ingest": bench_ingest,
+    "isbn_index": bench_isbn_index,
+    "memory": bench_memory,
+    "recommendations": bench_recommendations,
+    "reports": bench_reports,
+    "search": bench_search,
+    "staffing": bench_staffing,
+}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("benchmark", choices=sorted(BENCHMARKS))
+    parser.add_argument("--materials", type=int, default=1_000_000)
+    parser.add_argument("--employees", type=int, default=3_000, help="for the staffing benchmark")
+    args = parser.parse_args()
+    BENCHMARKS[args.benchmark](args.employees if args.benchmark == "staffing" else args.materials)
@@ -0,0 +1,202 @@
+"""
+Bulk loading of reading materials from CSV or JSONL.
+
+The source is read as a stream in chunks of ``chunk_size`` records. Each
+chunk is validated, optionally in a process pool, into plain tuples:
+
+- the ISBN must be a valid ISBN-10 or ISBN-13 (hyphens and spaces are
+  ignored, and the ISBN is stored without them)
+- title is required and year_published, if present, must be a whole number
+
+Records whose ISBN was already seen, in this stream or in the library, are
+counted as duplicates and dropped. The first record with an ISBN wins.
+
+CSV files need a header with title, author, year_published and isbn
+columns (type is optional). JSONL files hold one object per line with
+the same keys.
+"""
+import csv
+import json
+import logging
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from operator import mul
+from pathlib import Path
+
+from main import ReadingMaterialUnit
+
+logger = logging.getLogger(__name__)
+
+FIELDS = ("title", "author", "year_published", "isbn", "type")
+_ISBN10_WEIGHTS = range(10, 1, -1)
+
+
+def normalize_isbn(isbn):
+    return str(isbn).replace("-", "").replace(" ", "").upper()
+
+
+def isbn_is_valid(isbn):
+    """Check the ISBN-10 or ISBN-13 checksum of a normalized ISBN."""
+    if len(isbn) == 10:
+        if not isbn[:9].isdigit() or not (isbn[9].isdigit() or isbn[9] == "X"):
+            return False
+        total = sum(map(mul, _ISBN10_WEIGHTS, map(int, isbn[:9])))
+        total += 10 if isbn[9] == "X" else int(isbn[9])
+        return total % 11 == 0
+    if len(isbn) == 13 and isbn.isdigit():
+        total = sum(map(int, isbn[::2])) + 3 * sum(map(int, isbn[1::2]))
+        return total % 10 == 0
+    return False
+
+
+class IngestReport:
+    __slots__ = ("read", "added", "duplicates", "invalid", "seconds")
+
+    def __init__(self):
+        self.read = 0
+        self.added = 0
+        self.duplicates = 0
+        self.invalid = 0
+        self.seconds = 0.0
+
+    @property
+    def records_per_second(self):
+        return self.read / self.seconds if self.seconds else 0.0
+
+    def __repr__(self):
+        return (f"IngestReport(read={self.read}, added={self.added}, duplicates={self.duplicates}, "
+                f"invalid={self.invalid}, records_per_second={self.records_per_second:,.0f})")
+
+
+def _validate(title, author, year_published, isbn, type_):
+    isbn = normalize_isbn(isbn or "")
+    if not title or not isbn_is_valid(isbn):
+        return None
+    if year_published in (None, ""):
+        year_published = None
+    else:
+        try:
+            year_published = int(year_published)
+        except (TypeError, ValueError):
+            return None
+    return (title, author or "", year_published, isbn, type_ or "book")
+
+
+def _parse_csv_chunk(rows, columns):
+    """Validated record tuples and the number of invalid rows in ``rows``."""
+    records, invalid = [], 0
+    for row in rows:
+        try:
+            record = _validate(*(row[position] if position is not None else None for position in columns))
+        except IndexError:
+            record = None
+        if record is None:
+            invalid += 1
+        else:
+            records.append(record)
+    return records, invalid
+
+
+def _parse_jsonl_chunk(lines, columns=None):
+    records, invalid = [], 0
+    for line in lines:
+        try:
+            document = json.loads(line)
+            record = _validate(*(document.get(field) for field in FIELDS))
+        except (ValueError, AttributeError):
+            record = None
+        if record is None:
+            invalid += 1
+        else:
+            records.append(record)
+    return records, invalid
+
+
+def _chunks(iterable, chunk_size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _open_chunks(handle, format_, chunk_size):
+    """The chunk parser, its extra argument and the raw chunks of ``handle``."""
+    if format_ == "csv":
+        reader = csv.reader(handle)
+        header = next(reader, [])
+        if not {"title", "isbn"} <= set(header):
+            raise ValueError("CSV catalog needs at least title and isbn columns")
+        columns = tuple(header.index(field) if field in header else None for field in FIELDS)
+        return _parse_csv_chunk, columns, _chunks(reader, chunk_size)
+    if format_ == "jsonl":
+        lines = (line for line in handle if line.strip())
+        return _parse_jsonl_chunk, None, _chunks(lines, chunk_size)
+    raise ValueError(f"Unsupported catalog format: {format_}")
+
+
+def _parsed_chunks(parse, columns, chunks, processes):
+    if not processes:
+        for chunk in chunks:
+            yield parse(chunk, columns)
+        return
+    # Keep a bounded window of chunks in flight so a huge source is never
+    # read into memory ahead of the workers; results come back in order
+    with ProcessPoolExecutor(processes) as executor:
+        pending = deque()
+        for chunk in chunks:
+            pending.append(executor.submit(parse, chunk, columns))
+            if len(pending) >= 2 * processes:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def iter_reading_materials(source, format_=None, chunk_size=10_000, processes=None, report=None, seen=None):
+    """
+    Yield lists of new ReadingMaterialUnit objects from ``source``, a path
+    or an open text stream. ``format_`` ("csv" or "jsonl") defaults to the
+    path's suffix. ``processes`` parses chunks in that many processes.
+    """
+    report = IngestReport() if report is None else report
+    seen = set() if seen is None else seen
+    if isinstance(source, (str, Path)):
+        format_ = format_ or Path(source).suffix.lstrip(".").lower()
+        with open(source, newline="", encoding="utf-8") as handle:
+            yield from iter_reading_materials(handle, format_, chunk_size, processes, report, seen)
+        return
+    if format_ is None:
+        raise ValueError("format_ is required when reading from a stream")
+    parse, columns, chunks = _open_chunks(source, format_, chunk_size)
+    for records, invalid in _parsed_chunks(parse, columns, chunks, processes):
+        report.read += len(records) + invalid
+        report.invalid += invalid
+        units = []
+        for record in records:
+            if record[3] in seen:
+                report.duplicates += 1
+                continue
+            seen.add(record[3])
+            units.append(ReadingMaterialUnit(*record))
+        report.added += len(units)
+        yield units
+
+
+def ingest(library, source, format_=None, chunk_size=10_000, processes=None, copies=1):
+    """
+    Add every new, valid reading material in ``source`` to ``library`` and
+    return an IngestReport. ISBNs the library already has count as
+    duplicates.
+    """
+    report = IngestReport()
+    start = time.perf_counter()
+    seen = set(library.get_reading_materials())
+    for units in iter_reading_materials(source, format_, chunk_size, processes, report, seen):
+        library.add_reading_material_units(units, copies)
+    report.seconds = time.perf_counter() - start
+    logger.info("Ingested %s: %s", getattr(source, "name", source), report)
+    return report
+
@@ -0,0 +1,254 @@
+"""
+Persistent ISBN index for the Library.
+
+An index directory holds two files:
+
+- ``records.jsonl``: every reading material ever added, one JSON array
+  per line, appended and never rewritten; a removal is a line holding
+  just the ISBN, as a one-element array
+- ``index.bin``: a header followed by fixed-width entries sorted by ISBN,
+  each the ISBN padded to ``KEY_WIDTH`` bytes and the byte offset of its
+  line in ``records.jsonl``
+
+``index.bin`` is memory-mapped and searched with a binary search, so
+opening an index and looking up one ISBN never reads the whole catalog.
+New records are appended to ``records.jsonl`` straight away and kept in a
+small in-memory delta; once the delta reaches ``merge_threshold`` entries
+it is merged with the mapped entries into a new ``index.bin`` (as in an
+LSM tree). A removed ISBN stays in the delta as a tombstone, hiding the
+mapped entry until the merge drops both. The header records how much of ``records.jsonl`` the index
+covers, so a delta that was never merged is rebuilt from the end of that
+file on open.
+
+Layout of ``index.bin`` (little-endian)::
+
+    b"ISBX" | format version u8 | entry count u64 | records bytes indexed u64
+    | (ISBN KEY_WIDTH bytes, NUL padded | record offset u64) * entry count
+"""
+import json
+import mmap
+import os
+import struct
+import threading
+from pathlib import Path
+
+from main import ReadingMaterialUnit
+
+MAGIC = b"ISBX"
+FORMAT_VERSION = 1
+KEY_WIDTH = 17
+_HEADER = struct.Struct("<4sBQQ")
+_ENTRY = struct.Struct(f"<{KEY_WIDTH}sQ")
+# Delta value of a removed ISBN
+_TOMBSTONE = None
+_MISSING = object()
+
+
+def _key(isbn):
+    key = str(isbn).encode("utf-8")
+    if len(key) > KEY_WIDTH:
+        raise ValueError(f"ISBN {isbn!r} is longer than {KEY_WIDTH} bytes")
+    return key.ljust(KEY_WIDTH, b"\0")
+
+
+class IsbnIndex:
+    """
+    Docstring for IsbnIndex
+
+    Opens (or creates) the index in ``directory``. Adding the same ISBN
+    again replaces the record it points to.
+    """
+    def __init__(self, directory, merge_threshold=10_000):
+        self.directory = Path(directory)
+        self.merge_threshold = merge_threshold
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._index_path = self.directory / "index.bin"
+        self._records_path = self.directory / "records.jsonl"
+        self._lock = threading.Lock()
+        if not self._index_path.exists():
+            self._write_index((), 0, 0)
+        self._open_map()
+        self._records = open(self._records_path, "a+b")
+        self._delta = {}
+        self._replay_delta()
+
+    def _open_map(self):
+        with open(self._index_path, "rb") as handle:
+            view = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, format_version, count, self._indexed_bytes = _HEADER.unpack_from(view)
+        if magic != MAGIC or format_version != FORMAT_VERSION:
+            raise ValueError(f"{self._index_path} is not an ISBN index, or an unsupported format version.")
+        if len(view) != _HEADER.size + count * _ENTRY.size:
+            raise ValueError(f"{self._index_path} is truncated.")
+        # Swapped in as one tuple, which each lookup reads once (see _find),
+        # so lookups racing a merge see a consistent map and count; the old
+        # map is closed once nothing refers to it
+        self._mapped = (view, count)
+
+    def _replay_delta(self):
+        self._records.seek(self._indexed_bytes)
+        offset = self._indexed_bytes
+        for line in self._records:
+            if not line.endswith(b"\n"):
+                # A torn final write: drop it so the next append starts clean
+                self._records.truncate(offset)
+                break
+            record = json.loads(line)
+            if len(record) == 1:
+                self._delta[_key(record[0])] = _TOMBSTONE
+            else:
+                self._delta[_key(record[3])] = offset
+            offset += len(line)
+
+    def _write_index(self, parts, count, indexed_bytes):
+        """Write ``count`` entries, given as raw bytes ``parts``, to a new index.bin atomically."""
+        temporary = self._index_path.with_suffix(".tmp")
+        with open(temporary, "wb") as handle:
+            handle.write(_HEADER.pack(MAGIC, FORMAT_VERSION, count, indexed_bytes))
+            for part in parts:
+                handle.write(part)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(temporary, self._index_path)
+
+    @staticmethod
+    def _lower_bound(view, count, key, low=0):
+        """Position of the first of ``count`` entries in ``view`` not less than ``key``, from ``low`` on."""
+        size = _ENTRY.size
+        high = count
+        while low < high:
+            middle = (low + high) // 2
+            start = _HEADER.size + middle * size
+            if view[start:start + KEY_WIDTH] < key:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def _find(self, key):
+        """Offset of ``key`` in the mapped entries, or None."""
+        # One snapshot for the whole lookup: a merge may swap in a new map
+        view, count = self._mapped
+        position = self._lower_bound(view, count, key)
+        if position < count:
+            key_at, offset = _ENTRY.unpack_from(view, _HEADER.size + position * _ENTRY.size)
+            if key_at == key:
+                return offset
+        return None
+
+    def _offset(self, isbn):
+        key = _key(isbn)
+        offset = self._delta.get(key, _MISSING)
+        return self._find(key) if offset is _MISSING else offset
+
+    def __contains__(self, isbn):
+        return self._offset(isbn) is not None
+
+    def __len__(self):
+        with self._lock:
+            count = self._mapped[1]
+            for key, offset in self._delta.items():
+                mapped = self._find(key) is not None
+                if offset is _TOMBSTONE:
+                    count -= mapped
+                else:
+                    count += not mapped
+            return count
+
+    def get(self, isbn):
+        """The ReadingMaterialUnit stored for ``isbn``, or None."""
+        offset = self._offset(isbn)
+        if offset is None:
+            return None
+        with self._lock:
+            self._records.seek(offset)
+            line = self._records.readline()
+        return ReadingMaterialUnit(*json.loads(line))
+
+    def add(self, reading_material):
+        self.add_many((reading_material,))
+
+    def add_many(self, reading_materials):
+        lines = []
+        keys = []
+        for reading_material in reading_materials:
+            keys.append(_key(reading_material.isbn))
+            lines.append(json.dumps([reading_material.title, reading_material.author,
+                                     reading_material.year_published, reading_material.isbn,
+                                     reading_material.type]).encode("utf-8") + b"\n")
+        with self._lock:
+            self._records.seek(0, os.SEEK_END)
+            offset = self._records.tell()
+            self._records.write(b"".join(lines))
+            self._records.flush()
+            for key, line in zip(keys, lines):
+                self._delta[key] = offset
+                offset += len(line)
+            if len(self._delta) >= self.merge_threshold:
+                self._merge()
+
+    def remove(self, isbn):
+        """Remove ``isbn`` from the index; nothing happens if it is not there."""
+        key = _key(isbn)
+        with self._lock:
+            if self._offset(isbn) is None:
+                return
+            self._records.seek(0, os.SEEK_END)
+            self._records.write(json.dumps([isbn]).encode("utf-8") + b"\n")
+            self._records.flush()
+            self._delta[key] = _TOMBSTONE
+            if len(self._delta) >= self.merge_threshold:
+                self._merge()
+
+    def merge(self):
+        """Fold the in-memory delta into index.bin now."""
+        with self._lock:
+            self._merge()
+
+    def _merge(self):
+        if not self._delta:
+            return
+        view, count = self._mapped
+        size = _ENTRY.size
+        # Where each delta key lands among the mapped entries; the runs of
+        # mapped entries between them are copied as raw bytes
+        placed = []
+        total = count
+        position = 0
+        for key, offset in sorted(self._delta.items()):
+            position = self._lower_bound(view, count, key, position)
+            replaces = position < count and view[_HEADER.size + position * size:
+                                                 _HEADER.size + position * size + KEY_WIDTH] == key
+            if offset is _TOMBSTONE:
+                # Drops the mapped entry, if there is one, and adds nothing
+                if replaces:
+                    placed.append((position, True, None))
+                    total -= 1
+                continue
+            total += not replaces
+            placed.append((position, replaces, _ENTRY.pack(key, offset)))
+
+        self._records.seek(0, os.SEEK_END)
+        with memoryview(view) as buffer:
+            def parts():
+                copied = 0
+                for position, replaces, entry in placed:
+                    yield buffer[_HEADER.size + copied * size:_HEADER.size + position * size]
+                    if entry is not None:
+                        yield entry
+                    copied = position + replaces
+                yield buffer[_HEADER.size + copied * size:_HEADER.size + count * size]
+
+            self._write_index(parts(), total, self._records.tell())
+        self._open_map()
+        self._delta = {}
+
+    def close(self):
+        self._records.close()
+        self._mapped[0].close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -1,4 +1,10 @@
 import logging
+import sys
+
+from recommendations import CoBorrowing
+from reservations import ReservationEngine
+from search import SearchIndex
+from staffing import Staffing
 
 logging.basicConfig(
     format='%(asctime)s - %(levelname)s - %(message)s',
@@ -13,25 +19,150 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
+
+def _intern(value):
+    """Share one copy of repeated low-cardinality strings between records."""
+    return sys.intern(value) if type(value) is str else value
+
 class Library:
     """
     Docstring for Library
 
     The instance which represents the Library
     """
-    def __init__(self, name):
+    def __init__(self, name, isbn_index=None):
         self.name = name
+        # Optional isbn_index.IsbnIndex: added materials are persisted to it
+        # and looked up there after a restart, see find_reading_material_unit
+        self.isbn_index = isbn_index
         self.reading_units = {}
         self.librarians = {}
         self.cart = {}
+        self.search_index = SearchIndex()
+        self.reservations = ReservationEngine()
+        self.staffing = Staffing()
+        self.co_borrowing = CoBorrowing()
     
     def get_reading_materials(self):
         return self.reading_units
 
+    def add_reading_material_unit(self, reading_material: "ReadingMaterialUnit", copies=1):
+        """
+        Docstring for add_reading_material_unit
+
+        Adds the reading material to the catalog and ``copies`` physical
+        copies of it to ``self.reservations`` for checkout.
+        """
+        self.add_reading_material_units((reading_material,), copies)
+
+    def add_reading_material_units(self, reading_materials, copies=1):
+        reading_materials = list(reading_materials)
+        for reading_material in reading_materials:
+            self.reading_units[reading_material.isbn] = reading_material
+            self.search_index.add(reading_material)
+            self.reservations.add_copies(reading_material.isbn, copies)
+        if self.isbn_index is not None:
+            self.isbn_index.add_many(reading_materials)
+
+    def find_reading_material_unit(self, isbn):
+        """
+        Docstring for find_reading_material_unit
+
+        The reading material with ``isbn``, from memory or else from the
+        persistent ISBN index, or None.
+        """
+        reading_material = self.reading_units.get(isbn)
+        if reading_material is None and self.isbn_index is not None:
+            reading_material = self.isbn_index.get(isbn)
+        return reading_material
+
+    def remove_reading_material_unit(self, isbn):
+        """
+        Docstring for remove_reading_material_unit
+
+        Removes the reading material, from memory and from the persistent
+        ISBN index, and retires its copies; raises ReservationError, leaving
+        it in place, while copies are on loan, and KeyError if the library
+        does not know ``isbn``.
+        """
+        reading_material = self.reading_units.get(isbn)
+        if reading_material is not None:
+            self.reservations.remove_title(isbn)
+            self.search_index.remove(isbn)
+            del self.reading_units[isbn]
+        if self.isbn_index is not None:
+            # After a restart the material may only be in the index
+            if reading_material is None:
+                reading_material = self.isbn_index.get(isbn)
+            self.isbn_index.remove(isbn)
+        if reading_material is None:
+            raise KeyError(isbn)
+        return reading_material
+
+    def search(self, text=None, author=None, year_from=None, year_to=None, type_=None, limit=10):
+        """
+        Docstring for search
+
+        Reading materials matching every given condition, best first.
+        See ``SearchIndex.search``.
+        """
+        return self.search_index.search(text, author, year_from, year_to, type_, limit)
+
+    def checkout_reading_material_unit(self, isbn, member, today=None):
+        """
+        Docstring for checkout_reading_material_unit
+
+        Lends a copy through ``self.reservations`` and records the loan for
+        recommendations.
+        """
+        loan = self.reservations.checkout(isbn, member, today)
+        self.co_borrowing.record_checkout(member, isbn)
+        return loan
+
+    def recommend(self, isbn, k=5):
+        """
+        Docstring for recommend
+
+        Up to ``k`` reading materials most often borrowed by members who
+        also borrowed ``isbn``.
+        """
+        return [self.find_reading_material_unit(other) for other, _ in self.co_borrowing.recommend(isbn, k)]
+
+    def overdue_report(self, today=None):
+        """
+        Docstring for overdue_report
+
+        Streams ``(reading_material, loan)`` for every loan due before
+        ``today``.
+        """
+        for loan in self.reservations.overdue(today):
+            yield self.find_reading_material_unit(loan.isbn), loan
+
+    def availability_report(self):
+        """
+        Docstring for availability_report
+
+        Streams ``(reading_material, copies)`` for every reading material
+        with copies ready to check out now.
+        """
+        for isbn, copies in self.reservations.ready():
+            yield self.find_reading_material_unit(isbn), copies
+
     def get_librarians(self):
         return self.librarians
+
+    def hire_librarian(self, employee: "Employee"):
+        self.librarians[employee.name] = employee
+
+    def librarians_on_duty(self, moment, branch=None):
+        """
+        Docstring for librarians_on_duty
+
+        Librarians with a shift at ``moment``, in ``branch`` or anywhere.
+        """
+        return [shift.employee for shift in self.staffing.on_duty(moment, branch)]
     
-    def book_reading_material_unit(self, reading_material: ReadingMaterialUnit):
+    def book_reading_material_unit(self, reading_material: "ReadingMaterialUnit"):
         if reading_material.isbn not in self.cart:
             self.cart[reading_material.isbn] = True
         else:
@@ -43,23 +174,26 @@ class ReadingMaterialUnit:
     Docstring for ReadingMaterialUnit
     
     """
+    __slots__ = ("title", "author", "year_published", "isbn", "type")
 
     def __init__(self, title, author, year_published, isbn, typr_ = "book"):
         self.title = title
-        self.author = author
+        self.author = _intern(author)
         self.year_published = year_published
         self.isbn = isbn
-        self.type = typr_
+        self.type = _intern(typr_)
 
     def __str__(self):
         return f"ReadingMaterialUnit({self.title=}, {self.author=}, {self.isbn=})"
     
 class Employee:
+    __slots__ = ("name", "age", "profession", "race")
+
     def __init__(self, name: str, profession: str, age: str, race: str = "african"):
         self.name = name
         self.age = age
-        self.profession = profession
-        self.race = race
+        self.profession = _intern(profession)
+        self.race = _intern(race)
 
     def __str__(self):
         return f"Employee({self.name=}, {self.profession=}, {self.age=})"
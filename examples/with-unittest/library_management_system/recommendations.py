@@ -0,0 +1,201 @@
+"""
+"Members who borrowed this also borrowed" suggestions.
+
+``CoBorrowing`` keeps a sparse co-occurrence matrix as a dict of Counters:
+``pairs[a][b]`` is the number of members who borrowed both ISBNs ``a`` and
+``b``. Each checkout of a new ISBN by a member adds one to the pairs it
+forms with the last ``max_history`` ISBNs that member borrowed. Top-k
+queries use a heap instead of sorting a whole row.
+
+``recompute`` rebuilds the matrix from a full loan history instead. The
+history is split into shards by member, so every member's loans land in
+one shard, and the shards can be counted in a process pool.
+
+Memory is bounded by pruning, which drops counts below ``min_count`` and
+cuts every row to its ``max_neighbours`` largest counts. ``recompute``
+prunes once at the end; as checkouts come in, a row is cut as soon as it
+grows past twice ``max_neighbours``, and the whole matrix is pruned every
+``prune_every`` checkouts (a cut keeps the largest counts but applies no
+``min_count``). A pair is dropped from both of its rows, so
+``pairs[a][b] == pairs[b][a]`` always holds. Pruned counts are forgotten:
+if the same pair is borrowed together again it starts over from 1, so
+rare pairs stay rare. Member histories keep only the last
+``max_history`` ISBNs; a member borrowing an ISBN that has fallen out of
+their history counts its pairs again.
+"""
+import heapq
+import threading
+from collections import Counter, OrderedDict, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+
+
+def _count_shard(histories, window):
+    """
+    Co-occurrence counts for ``histories``, a list of per-member lists of
+    distinct ISBNs in borrowing order, each paired with the ``window``
+    before and after it.
+    """
+    pairs = defaultdict(Counter)
+    for isbns in histories:
+        for position, isbn in enumerate(isbns):
+            row = pairs[isbn]
+            row.update(isbns[max(0, position - window):position])
+            row.update(isbns[position + 1:position + 1 + window])
+            if not row:
+                del pairs[isbn]
+    return pairs
+
+
+class CoBorrowing:
+    """
+    Docstring for CoBorrowing
+
+    ``min_count`` and ``max_neighbours`` bound the matrix, see the module
+    docstring; ``max_neighbours=None`` keeps whole rows and
+    ``prune_every=None`` only prunes on request.
+    """
+    def __init__(self, min_count=1, max_neighbours=None, prune_every=100_000, max_history=500):
+        self.min_count = min_count
+        self.max_neighbours = max_neighbours
+        self.prune_every = prune_every
+        self.max_history = max_history
+        self.pairs = defaultdict(Counter)
+        # member -> the ISBNs they borrowed, oldest first, as keys
+        self._histories = defaultdict(OrderedDict)
+        self._checkouts = 0
+        self._lock = threading.Lock()
+
+    def record_checkout(self, member, isbn):
+        """Count ``isbn`` against everything ``member`` borrowed before."""
+        with self._lock:
+            history = self._histories[member]
+            if isbn in history:
+                return
+            row = self.pairs[isbn]
+            for other in history:
+                row[other] += 1
+                self.pairs[other][isbn] += 1
+            if not row:
+                del self.pairs[isbn]
+            elif self.max_neighbours is not None:
+                # Every row that gained a pair may have outgrown the limit,
+                # not just this ISBN's
+                limit = 2 * self.max_neighbours
+                for other in [isbn, *history]:
+                    if len(self.pairs.get(other, ())) > limit:
+                        self._cut_row(other)
+            history[isbn] = None
+            if len(history) > self.max_history:
+                history.popitem(last=False)
+            self._checkouts += 1
+            if self.prune_every and self._checkouts % self.prune_every == 0:
+                self._prune(self.pairs)
+
+    def recommend(self, isbn, k=5, exclude=()):
+        """The ``k`` ISBNs most often borrowed with ``isbn``, as ``(isbn, count)``."""
+        # Under the lock: checkouts change and delete rows while ranking
+        # iterates them
+        with self._lock:
+            row = self.pairs.get(isbn)
+            if not row:
+                return []
+            return self._top(row, k, exclude)
+
+    @staticmethod
+    def _top(counts, k, exclude=()):
+        # The k-th largest count, found on the bare values, leaves only a
+        # few candidates to rank by (count, isbn) so ties stay deterministic
+        largest = heapq.nlargest(k + len(exclude), counts.values())
+        if not largest:
+            return []
+        threshold = largest[-1]
+        candidates = [(other, count) for other, count in counts.items()
+                      if count >= threshold and other not in exclude]
+        return heapq.nsmallest(k, candidates, key=lambda item: (-item[1], item[0]))
+
+    def recommend_for_member(self, member, k=5):
+        """Top ``k`` ISBNs co-borrowed with ``member``'s loans that they have not borrowed."""
+        with self._lock:
+            history = list(self._histories.get(member, ()))
+            scores = Counter()
+            for isbn in history:
+                scores.update(self.pairs.get(isbn, ()))
+        return self._top(scores, k, set(history))
+
+    def prune(self):
+        """Drop counts below ``min_count`` and cut rows to ``max_neighbours``."""
+        with self._lock:
+            self._prune(self.pairs)
+
+    def _kept(self, row):
+        """The ISBNs pruning keeps in ``row``."""
+        if self.min_count > 1:
+            row = {other: count for other, count in row.items() if count >= self.min_count}
+        if self.max_neighbours is not None and len(row) > self.max_neighbours:
+            return {other for other, _ in Counter(row).most_common(self.max_neighbours)}
+        return row.keys()
+
+    def _cut_row(self, isbn):
+        # Only max_neighbours here: min_count would drop every pair that is
+        # new to the row; low counts go at the next full prune instead
+        row = self.pairs[isbn]
+        kept = {other for other, _ in row.most_common(self.max_neighbours)}
+        for other in [other for other in row if other not in kept]:
+            del row[other]
+            other_row = self.pairs[other]
+            del other_row[isbn]
+            if not other_row:
+                del self.pairs[other]
+
+    def _prune(self, pairs):
+        if self.min_count <= 1 and self.max_neighbours is None:
+            return
+        kept = {isbn: self._kept(row) for isbn, row in pairs.items()}
+        for isbn in list(pairs):
+            # Both rows have to keep a pair for it to stay
+            row = Counter({other: count for other, count in pairs[isbn].items()
+                           if other in kept[isbn] and isbn in kept.get(other, ())})
+            if row:
+                pairs[isbn] = row
+            else:
+                del pairs[isbn]
+
+    def recompute(self, loans, shards=8, processes=None):
+        """
+        Rebuild the matrix from ``loans``, an iterable of ``(member, isbn)``
+        pairs in borrowing order, counting ``shards`` shards in
+        ``processes`` processes (in this process when None). Replaces the
+        member histories as well.
+        """
+        histories = defaultdict(dict)
+        for member, isbn in loans:
+            histories[member][isbn] = None
+        sharded = [[] for _ in range(shards)]
+        for member, isbns in histories.items():
+            sharded[hash(member) % shards].append(list(isbns))
+        windows = [self.max_history] * shards
+        if processes:
+            with ProcessPoolExecutor(processes) as executor:
+                counted = executor.map(_count_shard, sharded, windows)
+                pairs = self._merge(counted)
+        else:
+            pairs = self._merge(map(_count_shard, sharded, windows))
+        self._prune(pairs)
+        trimmed = defaultdict(OrderedDict)
+        for member, isbns in histories.items():
+            trimmed[member] = OrderedDict.fromkeys(list(isbns)[-self.max_history:])
+        with self._lock:
+            self.pairs = pairs
+            self._histories = trimmed
+            self._checkouts = 0
+
+    @staticmethod
+    def _merge(counted):
+        pairs = defaultdict(Counter)
+        for shard in counted:
+            for isbn, row in shard.items():
+                if isbn in pairs:
+                    pairs[isbn].update(row)
+                else:
+                    pairs[isbn] = row
+        return pairs
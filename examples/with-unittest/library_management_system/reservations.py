@@ -0,0 +1,244 @@
+"""
+Checkouts, returns and holds for the Library's physical copies.
+
+Every ISBN has its own lock, so requests for different titles never wait
+on each other; only registering or retiring an ISBN takes the
+engine-wide lock.
+Each title keeps its free copy numbers, the current loans by member and a
+FIFO hold queue. Free copies go to members with holds first: a member in
+the queue can check out while there are more free copies than members
+ahead of them, everyone else only while there are more free copies than
+holds.
+
+Reports are kept up to date as loans change rather than by scanning:
+
+- loans sit in a min-heap by due date; ``overdue`` pops the loans that
+  fell due since the last call (O(k log n)) into a due-ordered dict of
+  overdue loans, which returns remove them from
+- the number of copies ready for walk-in checkout (free copies not set
+  aside for holds) is recorded per ISBN after every change, in a dict that
+  only holds ISBNs with a copy ready
+"""
+import heapq
+import logging
+import threading
+from collections import deque
+from itertools import count
+from contextlib import nullcontext
+from datetime import date, timedelta
+
+logger = logging.getLogger(__name__)
+
+LOAN_DAYS = 14
+
+
+class ReservationError(Exception):
+    pass
+
+
+class Loan:
+    __slots__ = ("isbn", "member", "copy_number", "due")
+
+    def __init__(self, isbn, member, copy_number, due):
+        self.isbn = isbn
+        self.member = member
+        self.copy_number = copy_number
+        self.due = due
+
+    def __repr__(self):
+        return f"Loan(isbn={self.isbn!r}, member={self.member!r}, copy_number={self.copy_number}, due={self.due})"
+
+
+class _Title:
+    __slots__ = ("lock", "copies", "free", "loans", "holds")
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.copies = 0
+        self.free = []
+        self.loans = {}
+        self.holds = deque()
+
+
+class ReservationEngine:
+    """
+    Docstring for ReservationEngine
+
+    ``loan_days`` is the default loan length. ``max_loans`` optionally
+    caps how many copies one member can have out at a time; checkouts by
+    the same member then also take a per-member lock (always before the
+    ISBN lock).
+    """
+    def __init__(self, loan_days=LOAN_DAYS, max_loans=None):
+        self.loan_days = loan_days
+        self.max_loans = max_loans
+        self._titles = {}
+        self._titles_lock = threading.Lock()
+        # member -> {isbn: Loan}; single dict operations are atomic, and each
+        # isbn entry is only written under that isbn's lock
+        self._member_loans = {}
+        self._member_locks = {}
+        # Taken after an ISBN lock, never before one
+        self._due_lock = threading.Lock()
+        self._due = []
+        self._due_sequence = count()
+        self._overdue = {}
+        self._ready = {}
+
+    def _title(self, isbn):
+        try:
+            return self._titles[isbn]
+        except KeyError:
+            raise ReservationError(f"{isbn} is not held by the library") from None
+
+    def add_copies(self, isbn, count=1):
+        """Register ``count`` more physical copies of ``isbn``."""
+        if count < 1:
+            raise ValueError("count must be at least 1")
+        with self._titles_lock:
+            title = self._titles.get(isbn)
+            if title is None:
+                title = self._titles[isbn] = _Title()
+        with title.lock:
+            title.free.extend(range(title.copies + 1, title.copies + count + 1))
+            title.copies += count
+            self._update_ready(isbn, title)
+
+    def remove_title(self, isbn):
+        """
+        Retire every copy of ``isbn``. Raises ReservationError while copies
+        are out on loan; holds on it are dropped.
+        """
+        with self._titles_lock:
+            title = self._title(isbn)
+            with title.lock:
+                if title.loans:
+                    raise ReservationError(f"{len(title.loans)} copies of {isbn} are still on loan")
+                if title.holds:
+                    logger.info("Dropping %s holds on retired %s", len(title.holds), isbn)
+                # Checkouts that already looked the title up find no copies
+                title.free.clear()
+                title.holds.clear()
+                title.copies = 0
+                self._ready.pop(isbn, None)
+                del self._titles[isbn]
+
+    def _update_ready(self, isbn, title):
+        """Record how many copies of ``isbn`` are ready; call under ``title.lock``."""
+        ready = len(title.free) - len(title.holds)
+        if ready > 0:
+            self._ready[isbn] = ready
+        else:
+            self._ready.pop(isbn, None)
+
+    def checkout(self, isbn, member, today=None, loan_days=None):
+        """Lend a free copy of ``isbn`` to ``member`` and return the Loan."""
+        title = self._title(isbn)
+        loans = self._member_loans.setdefault(member, {})
+        if self.max_loans is None:
+            member_lock = nullcontext()
+        else:
+            member_lock = self._member_locks.setdefault(member, threading.Lock())
+        with member_lock, title.lock:
+            if member in title.loans:
+                raise ReservationError(f"{isbn} is already checked out to {member}")
+            if self.max_loans is not None and len(loans) >= self.max_loans:
+                raise ReservationError(f"{member} already has {self.max_loans} loans")
+            if member in title.holds:
+                ahead = title.holds.index(member)
+            else:
+                ahead = len(title.holds)
+            if len(title.free) <= ahead:
+                logger.info("No copy of %s available for %s", isbn, member)
+                raise ReservationError(f"No copy of {isbn} is available for {member}")
+            if ahead < len(title.holds) and title.holds[ahead] == member:
+                del title.holds[ahead]
+            due = (today or date.today()) + timedelta(days=self.loan_days if loan_days is None else loan_days)
+            loan = title.loans[member] = loans[isbn] = Loan(isbn, member, title.free.pop(), due)
+            self._update_ready(isbn, title)
+            with self._due_lock:
+                heapq.heappush(self._due, (due, next(self._due_sequence), loan))
+        return loan
+
+    def return_copy(self, isbn, member):
+        """End ``member``'s loan of ``isbn`` and return the finished Loan."""
+        title = self._title(isbn)
+        with title.lock:
+            loan = title.loans.pop(member, None)
+            if loan is None:
+                raise ReservationError(f"{isbn} is not checked out to {member}")
+            del self._member_loans[member][isbn]
+            title.free.append(loan.copy_number)
+            self._update_ready(isbn, title)
+            with self._due_lock:
+                # Still in the heap if not yet reported overdue; skipped there
+                # once popped because it is no longer a current loan
+                self._overdue.pop((isbn, member), None)
+        return loan
+
+    def place_hold(self, isbn, member):
+        """Queue ``member`` for ``isbn``; returns their position, 0 being next."""
+        title = self._title(isbn)
+        with title.lock:
+            if member in title.loans:
+                raise ReservationError(f"{isbn} is already checked out to {member}")
+            if member in title.holds:
+                raise ReservationError(f"{member} already has a hold on {isbn}")
+            title.holds.append(member)
+            self._update_ready(isbn, title)
+            return len(title.holds) - 1
+
+    def cancel_hold(self, isbn, member):
+        title = self._title(isbn)
+        with title.lock:
+            try:
+                title.holds.remove(member)
+            except ValueError:
+                raise ReservationError(f"{member} has no hold on {isbn}") from None
+            self._update_ready(isbn, title)
+
+    def available(self, isbn):
+        """Free copies of ``isbn``, including those set aside for holds."""
+        return len(self._title(isbn).free)
+
+    def holds(self, isbn):
+        title = self._title(isbn)
+        with title.lock:
+            return list(title.holds)
+
+    def loans(self, isbn):
+        title = self._title(isbn)
+        with title.lock:
+            return list(title.loans.values())
+
+    def member_loans(self, member):
+        return list(self._member_loans.get(member, {}).values())
+
+    def _is_current(self, loan):
+        title = self._titles.get(loan.isbn)
+        return title is not None and title.loans.get(loan.member) is loan
+
+    def overdue(self, today=None):
+        """
+        Stream the loans due before ``today``, in the order they fell due.
+        Only the loans that fell due since the previous call are taken off
+        the heap.
+        """
+        today = today or date.today()
+        with self._due_lock:
+            while self._due and self._due[0][0] < today:
+                _, _, loan = heapq.heappop(self._due)
+                if self._is_current(loan):
+                    self._overdue[loan.isbn, loan.member] = loan
+            overdue = list(self._overdue.values())
+        for loan in overdue:
+            # An earlier call may have used a later ``today``
+            if loan.due < today:
+                yield loan
+
+    def ready(self):
+        """Stream ``(isbn, copies)`` for every ISBN with copies ready for walk-in checkout."""
+        yield from list(self._ready.items())
+
+    def ready_copies(self, isbn):
+        return self._ready.get(isbn, 0)
@@ -0,0 +1,184 @@
+"""
+Search over the Library's reading materials.
+
+``SearchIndex`` keeps three indexes up to date as materials are added and
+removed:
+
+- an inverted index from lower-cased title and author words to materials
+- a sorted index on ``year_published`` for range queries (``bisect``)
+- a facet from material type to materials
+
+A query intersects the sets matching each condition, smallest first, and
+ranks the matches: title words count twice as much as author words, then
+newer materials come first, then titles alphabetically.
+"""
+import heapq
+import re
+from bisect import bisect_left, bisect_right
+
+_WORD = re.compile(r"\w+")
+
+
+def tokenize(text):
+    return _WORD.findall(str(text).lower())
+
+
+def _as_year(year_published):
+    try:
+        return int(year_published)
+    except (TypeError, ValueError):
+        return None
+
+
+class SearchIndex:
+    """
+    Docstring for SearchIndex
+
+    Materials are referred to by an internal integer id, so postings are
+    sets of ints rather than sets of objects.
+    """
+    def __init__(self):
+        self._materials = []
+        self._ids = {}
+        self._title_postings = {}
+        self._author_postings = {}
+        self._type_facet = {}
+        self._years = []
+        self._year_ids = []
+        self._pending_years = []
+
+    def __len__(self):
+        return len(self._ids)
+
+    def add(self, material):
+        """Index ``material``, replacing an earlier material with the same ISBN."""
+        if material.isbn in self._ids:
+            self.remove(material.isbn)
+        material_id = len(self._materials)
+        self._materials.append(material)
+        self._ids[material.isbn] = material_id
+        for word in set(tokenize(material.title)):
+            self._title_postings.setdefault(word, set()).add(material_id)
+        for word in set(tokenize(material.author)):
+            self._author_postings.setdefault(word, set()).add(material_id)
+        self._type_facet.setdefault(material.type, set()).add(material_id)
+        year = _as_year(material.year_published)
+        if year is not None:
+            # Sorted into the year index on the next range query, so bulk
+            # loads sort once instead of inserting one by one
+            self._pending_years.append((year, material_id))
+
+    def add_many(self, materials):
+        for material in materials:
+            self.add(material)
+
+    def remove(self, isbn):
+        material_id = self._ids.pop(isbn)
+        material = self._materials[material_id]
+        self._materials[material_id] = None
+        for postings, text in ((self._title_postings, material.title), (self._author_postings, material.author)):
+            for word in set(tokenize(text)):
+                postings[word].discard(material_id)
+                if not postings[word]:
+                    del postings[word]
+        self._type_facet[material.type].discard(material_id)
+        year = _as_year(material.year_published)
+        if year is not None:
+            self._sort_years()
+            position = bisect_left(self._years, year)
+            position += self._year_ids[position:bisect_right(self._years, year)].index(material_id)
+            del self._years[position], self._year_ids[position]
+        return material
+
+    def _sort_years(self):
+        if self._pending_years:
+            entries = list(zip(self._years, self._year_ids)) + self._pending_years
+            entries.sort()
+            self._years = [year for year, _ in entries]
+            self._year_ids = [material_id for _, material_id in entries]
+            self._pending_years = []
+
+    def _text_matches(self, word):
+        in_title, in_author = self._title_postings.get(word), self._author_postings.get(word)
+        if in_title and in_author:
+            return in_title | in_author
+        return in_title or in_author or set()
+
+    def search(self, text=None, author=None, year_from=None, year_to=None, type_=None, limit=10):
+        """
+        Materials matching every given condition, best first.
+
+        ``text`` words must each appear in the title or the author,
+        ``author`` words in the author. ``year_from`` and ``year_to`` are
+        inclusive. ``limit=None`` returns every match.
+        """
+        text_words, author_words = tokenize(text or ""), tokenize(author or "")
+        candidates = []
+        for word in text_words:
+            candidates.append(self._text_matches(word))
+        for word in author_words:
+            candidates.append(self._author_postings.get(word, set()))
+        if type_ is not None:
+            candidates.append(self._type_facet.get(type_, set()))
+        if year_from is not None or year_to is not None:
+            self._sort_years()
+            start = 0 if year_from is None else bisect_left(self._years, year_from)
+            stop = len(self._years) if year_to is None else bisect_right(self._years, year_to)
+            candidates.append(set(self._year_ids[start:stop]))
+        if not candidates:
+            matches = set(self._ids.values())
+        else:
+            candidates.sort(key=len)
+            matches = candidates[0].intersection(*candidates[1:])
+
+        return [self._materials[material_id] for material_id in self._rank(matches, text_words + author_words, limit)]
+
+    def _rank(self, matches, words, limit):
+        # Split the matches into score tiers with set operations instead of
+        # scoring every match: each word adds 2 for a title hit and 1 for an
+        # author hit
+        tiers = {0: matches}
+        for word in words:
+            in_title = self._title_postings.get(word, set())
+            in_author = self._author_postings.get(word, set())
+            split = {}
+            for score, members in tiers.items():
+                titled = members & in_title
+                authored = members & in_author
+                for extra, part in ((3, titled & authored), (2, titled - authored),
+                                    (1, authored - titled), (0, members - titled - authored)):
+                    if part:
+                        split.setdefault(score + extra, set()).update(part)
+            tiers = split
+        ranked = []
+        for score in sorted(tiers, reverse=True):
+            wanted = None if limit is None else limit - len(ranked)
+            if wanted == 0:
+                break
+            ranked.extend(self._newest_first(tiers[score], wanted))
+        return ranked
+
+    def _newest_first(self, members, wanted):
+        materials = self._materials
+
+        def key(material_id):
+            material = materials[material_id]
+            year = _as_year(material.year_published)
+            return (year is None, -(year or 0), material.title)
+
+        # A large tier is cheaper to fill by walking the year index from the
+        # newest end than by sorting it
+        if wanted is not None and wanted * len(self._ids) < len(members) ** 2:
+            self._sort_years()
+            years, year_ids = self._years, self._year_ids
+            picked, last_year = [], None
+            for position in range(len(year_ids) - 1, -1, -1):
+                material_id = year_ids[position]
+                if material_id in members:
+                    if len(picked) >= wanted and years[position] != last_year:
+                        return sorted(picked, key=key)[:wanted]
+                    picked.append(material_id)
+                    last_year = years[position]
+        if wanted is None:
+            return sorted(members, key=key)
+        return heapq.nsmallest(wanted, members, key=key)
@@ -0,0 +1,169 @@
+"""
+Librarian shifts across one or more library branches.
+
+Each branch has a timeline of its shifts. A timeline splits time at every
+shift start and end; within each piece the same shifts are on duty, so
+"who is on duty at T" is one ``bisect`` into the sorted boundaries,
+O(log n). The pieces are rebuilt lazily after shifts change.
+
+``Staffing.fill`` assigns librarians to open desk slots, always giving the
+next slot to the free librarian with the fewest hours so far (a min-heap
+of hours), which spreads the work evenly across people and desks.
+Shifts are half-open: a shift from 9:00 to 13:00 is not on duty at 13:00.
+"""
+import heapq
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from datetime import timedelta
+from itertools import count
+
+
+class StaffingError(Exception):
+    pass
+
+
+def _hours(start, end):
+    length = end - start
+    return length / timedelta(hours=1) if isinstance(length, timedelta) else length
+
+
+class Shift:
+    __slots__ = ("employee", "branch", "desk", "start", "end")
+
+    def __init__(self, employee, branch, desk, start, end):
+        if not start < end:
+            raise StaffingError("A shift must end after it starts")
+        self.employee = employee
+        self.branch = branch
+        self.desk = desk
+        self.start = start
+        self.end = end
+
+    @property
+    def hours(self):
+        return _hours(self.start, self.end)
+
+    def __repr__(self):
+        return (f"Shift(employee={self.employee.name!r}, branch={self.branch!r}, desk={self.desk!r}, "
+                f"start={self.start}, end={self.end})")
+
+
+class _Timeline:
+    """The shifts of one branch, split into pieces with the same staff on duty."""
+
+    def __init__(self):
+        self.shifts = set()
+        self._bounds = None
+        self._on_duty = None
+
+    def add(self, shift):
+        self.shifts.add(shift)
+        self._bounds = None
+
+    def remove(self, shift):
+        self.shifts.discard(shift)
+        self._bounds = None
+
+    def _build(self):
+        starts, ends = defaultdict(list), defaultdict(list)
+        for shift in self.shifts:
+            starts[shift.start].append(shift)
+            ends[shift.end].append(shift)
+        bounds = sorted(starts.keys() | ends.keys())
+        on_duty, active = [], set()
+        for bound in bounds:
+            active.difference_update(ends.get(bound, ()))
+            active.update(starts.get(bound, ()))
+            on_duty.append(tuple(active))
+        self._bounds, self._on_duty = bounds, on_duty
+
+    def at(self, moment):
+        if self._bounds is None:
+            self._build()
+        piece = bisect_right(self._bounds, moment) - 1
+        return self._on_duty[piece] if piece >= 0 else ()
+
+
+class Staffing:
+    """
+    Docstring for Staffing
+
+    Shifts for every branch, indexed by branch for on-duty queries and by
+    employee (sorted by start) for overlap checks and hours.
+    """
+    def __init__(self):
+        self._timelines = defaultdict(_Timeline)
+        self._by_employee = defaultdict(list)
+        self._hours = defaultdict(float)
+
+    def _overlaps(self, employee, start, end):
+        shifts = self._by_employee[employee]
+        # Shifts of one employee never overlap, so sorted by start they are
+        # also sorted by end: only the neighbours of the new shift can clash
+        position = bisect_left(shifts, start, key=lambda shift: shift.start)
+        return (position > 0 and shifts[position - 1].end > start) or \
+               (position < len(shifts) and shifts[position].start < end)
+
+    def assign(self, employee, branch, desk, start, end):
+        """Put ``employee`` on ``desk`` at ``branch`` from ``start`` to ``end``."""
+        if self._overlaps(employee, start, end):
+            raise StaffingError(f"{employee.name} already has a shift between {start} and {end}")
+        shift = Shift(employee, branch, desk, start, end)
+        shifts = self._by_employee[employee]
+        shifts.insert(bisect_left(shifts, start, key=lambda other: other.start), shift)
+        self._timelines[branch].add(shift)
+        self._hours[employee] += shift.hours
+        return shift
+
+    def unassign(self, shift):
+        self._by_employee[shift.employee].remove(shift)
+        self._timelines[shift.branch].remove(shift)
+        self._hours[shift.employee] -= shift.hours
+
+    def on_duty(self, moment, branch=None):
+        """Shifts on duty at ``moment`` in ``branch``, or in every branch."""
+        if branch is not None:
+            timeline = self._timelines.get(branch)
+            return list(timeline.at(moment)) if timeline is not None else []
+        return [shift for timeline in self._timelines.values() for shift in timeline.at(moment)]
+
+    def shifts(self, employee):
+        return list(self._by_employee.get(employee, ()))
+
+    def hours(self, employee):
+        return self._hours.get(employee, 0.0)
+
+    def desk_hours(self, branch):
+        """Hours staffed per desk at ``branch``."""
+        totals = defaultdict(float)
+        timeline = self._timelines.get(branch)
+        for shift in timeline.shifts if timeline is not None else ():
+            totals[shift.desk] += shift.hours
+        return dict(totals)
+
+    def fill(self, branch, desks, slots, employees):
+        """
+        Staff every desk in ``desks`` for every ``(start, end)`` in
+        ``slots`` from ``employees``, each slot going to a free employee
+        with the fewest hours. Returns the new shifts; raises StaffingError
+        if a slot cannot be staffed (earlier slots stay assigned).
+        """
+        sequence = count()
+        by_hours = [(self.hours(employee), next(sequence), employee) for employee in employees]
+        heapq.heapify(by_hours)
+        assigned = []
+        for start, end in slots:
+            for desk in desks:
+                busy = []
+                while by_hours:
+                    hours, _, employee = heapq.heappop(by_hours)
+                    if not self._overlaps(employee, start, end):
+                        break
+                    busy.append((hours, next(sequence), employee))
+                else:
+                    raise StaffingError(f"Nobody is free for {desk} at {branch} from {start} to {end}")
+                assigned.append(self.assign(employee, branch, desk, start, end))
+                heapq.heappush(by_hours, (self.hours(employee), next(sequence), employee))
+                for entry in busy:
+                    heapq.heappush(by_hours, entry)
+        return assigned
@@ -0,0 +1,86 @@
+"""
+Columnar storage for large reading material catalogs.
+
+``ReadingMaterialTable`` keeps one column per field instead of one object
+per record. Titles and ISBNs are plain lists of strings. Years are an
+``array('h')``. Authors and types are dictionary-encoded: each distinct
+value is stored once and the column holds small integer codes. Rows are
+turned back into ReadingMaterialUnit objects only when read.
+"""
+from array import array
+
+from main import ReadingMaterialUnit
+
+_NO_YEAR = -32768
+
+
+class _Dictionary:
+    """Distinct values of a low-cardinality column and their codes."""
+    __slots__ = ("values", "codes")
+
+    def __init__(self):
+        self.values = []
+        self.codes = {}
+
+    def encode(self, value):
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+
+class ReadingMaterialTable:
+    """
+    Docstring for ReadingMaterialTable
+
+    Years must be whole numbers between -32767 and 32767, or None.
+    """
+    def __init__(self, reading_materials=()):
+        self.titles = []
+        self.isbns = []
+        self.years = array("h")
+        self.author_codes = array("I")
+        self.type_codes = array("B")
+        self._authors = _Dictionary()
+        self._types = _Dictionary()
+        self.extend(reading_materials)
+
+    def append(self, reading_material):
+        year = reading_material.year_published
+        if len(self._types.values) == 255 and reading_material.type not in self._types.codes:
+            raise ValueError("A table holds at most 255 material types")
+        self.years.append(_NO_YEAR if year is None else year)
+        self.titles.append(reading_material.title)
+        self.isbns.append(reading_material.isbn)
+        self.author_codes.append(self._authors.encode(reading_material.author))
+        self.type_codes.append(self._types.encode(reading_material.type))
+
+    def extend(self, reading_materials):
+        for reading_material in reading_materials:
+            self.append(reading_material)
+
+    def __len__(self):
+        return len(self.isbns)
+
+    def __getitem__(self, row):
+        year = self.years[row]
+        return ReadingMaterialUnit(self.titles[row], self._authors.values[self.author_codes[row]],
+                                   None if year == _NO_YEAR else year, self.isbns[row],
+                                   self._types.values[self.type_codes[row]])
+
+    def __iter__(self):
+        for row in range(len(self)):
+            yield self[row]
+
+    def authors(self):
+        """Distinct authors, indexed by author code."""
+        return list(self._authors.values)
+
+    def types(self):
+        """Distinct material types, indexed by type code."""
+        return list(self._types.values)
+
+    def rows_of_type(self, type_):
+        code = self._types.codes.get(type_)
+        return [row for row, type_code in enumerate(self.type_codes) if type_code == code]
@@ -30,3 +30,11 @@ class TestEmployee(unittest.TestCase):
     def test_employee_string_representation(self):
         self.assertIn(self.employee.name, str(self.employee))
         self.assertIn(str(self.employee.age), str(self.employee))
+
+    def test_employee_is_slotted(self):
+        self.assertFalse(hasattr(self.employee, "__dict__"))
+
+    def test_employee_repeated_strings_are_shared(self):
+        other = Employee(name="other", age=30, profession="".join(["clea", "ner"]))
+        self.assertIs(other.profession, self.employee.profession)
+        self.assertIs(other.race, self.employee.race)
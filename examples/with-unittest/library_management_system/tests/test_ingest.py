@@ -0,0 +1,84 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+from ingest import ingest, isbn_is_valid, iter_reading_materials, normalize_isbn
+from main import Library, ReadingMaterialUnit
+
+CSV = """title,author,year_published,isbn,type
+Things Fall Apart,Chinua Achebe,1958,978-0-385-47454-2,book
+Arrow of God,Chinua Achebe,1964,0-8044-2957-X,book
+Duplicate,Someone,2000,9780385474542,book
+Bad Checksum,Someone,2000,9780385474543,book
+No Year,Someone,,9780306406157,article
+Bad Year,Someone,soon,9781861972712,book
+"""
+
+
+class TestIsbn(unittest.TestCase):
+    def test_valid_isbns(self):
+        for isbn in ("9780385474542", "080442957X", "0306406152", "9780306406157"):
+            with self.subTest(isbn=isbn):
+                self.assertTrue(isbn_is_valid(isbn))
+
+    def test_invalid_isbns(self):
+        for isbn in ("9780385474543", "0385014801", "978038547454", "isbn", "03850148X0", ""):
+            with self.subTest(isbn=isbn):
+                self.assertFalse(isbn_is_valid(isbn))
+
+    def test_normalize(self):
+        self.assertEqual(normalize_isbn("0-8044-2957-x"), "080442957X")
+
+
+class TestIngest(unittest.TestCase):
+    def setUp(self):
+        self.library = Library("name of library")
+
+    def tearDown(self):
+        self.library = None
+
+    def test_csv_ingest(self):
+        report = ingest(self.library, io.StringIO(CSV), "csv")
+        self.assertEqual((report.read, report.added, report.duplicates, report.invalid), (6, 3, 1, 2))
+        units = self.library.get_reading_materials()
+        self.assertEqual(sorted(units), ["080442957X", "9780306406157", "9780385474542"])
+        self.assertEqual(units["9780385474542"].title, "Things Fall Apart")
+        self.assertEqual(units["9780385474542"].year_published, 1958)
+        self.assertIsNone(units["9780306406157"].year_published)
+        self.assertEqual(units["9780306406157"].type, "article")
+        self.assertEqual(self.library.search("achebe", limit=None)[0].title, "Arrow of God")
+        self.assertEqual(self.library.reservations.available("080442957X"), 1)
+        self.assertGreater(report.records_per_second, 0)
+
+    def test_jsonl_ingest_skips_existing_isbns(self):
+        self.library.add_reading_material_unit(ReadingMaterialUnit("Already Here", "author", 2001, "9780385474542"))
+        lines = [json.dumps({"title": "Things Fall Apart", "isbn": "9780385474542"}),
+                 "",
+                 json.dumps({"title": "Arrow of God", "author": "Chinua Achebe", "isbn": "080442957X"}),
+                 "not json",
+                 json.dumps(["a", "list"])]
+        report = ingest(self.library, io.StringIO("\n".join(lines)), "jsonl")
+        self.assertEqual((report.read, report.added, report.duplicates, report.invalid), (4, 1, 1, 2))
+        self.assertEqual(self.library.get_reading_materials()["9780385474542"].title, "Already Here")
+
+    def test_chunks_and_process_pool(self):
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "catalog.csv")
+            with open(path, "w", encoding="utf-8") as handle:
+                handle.write(CSV)
+            chunks = list(iter_reading_materials(path, chunk_size=2))
+            self.assertEqual([len(chunk) for chunk in chunks], [2, 0, 1])
+            report = ingest(self.library, path, chunk_size=2, processes=2)
+        self.assertEqual(report.added, 3)
+        self.assertEqual(len(self.library.get_reading_materials()), 3)
+
+    def test_rejects_unknown_formats(self):
+        with self.assertRaises(ValueError):
+            ingest(self.library, io.StringIO(CSV), "marc")
+        with self.assertRaises(ValueError):
+            ingest(self.library, io.StringIO("name,price\n"), "csv")
+
+    def test_reading_material_unit_is_slotted(self):
+        unit = ReadingMaterialUnit("title", "author", 2000, "isbn")
+        self.assertFalse(hasattr(unit, "__dict__"))
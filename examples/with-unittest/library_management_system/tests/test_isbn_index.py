@@ -0,0 +1,128 @@
+import os
+import tempfile
+import unittest
+from isbn_index import IsbnIndex
+from main import Library, ReadingMaterialUnit
+
+class TestIsbnIndex(unittest.TestCase):
+    def setUp(self):
+        self.folder = tempfile.TemporaryDirectory()
+        self.directory = self.folder.name
+
+    def tearDown(self):
+        self.folder.cleanup()
+
+    def unit(self, number, title=None):
+        return ReadingMaterialUnit(title or f"Title {number}", "author", 2000 + number % 20, f"isbn-{number:05d}")
+
+    def test_lookup_from_delta_and_after_merge(self):
+        with IsbnIndex(self.directory, merge_threshold=1000) as index:
+            index.add_many(self.unit(number) for number in range(10))
+            self.assertEqual(index.get("isbn-00003").title, "Title 3")
+            index.merge()
+            self.assertEqual(index.get("isbn-00003").title, "Title 3")
+            self.assertEqual(index.get("isbn-00003").year_published, 2003)
+            self.assertIsNone(index.get("isbn-99999"))
+            self.assertIn("isbn-00009", index)
+            self.assertEqual(len(index), 10)
+
+    def test_reopen_keeps_merged_and_unmerged_records(self):
+        with IsbnIndex(self.directory, merge_threshold=5) as index:
+            index.add_many(self.unit(number) for number in range(7))
+            index.add(self.unit(99))
+        with IsbnIndex(self.directory) as index:
+            self.assertEqual(len(index), 8)
+            for number in (0, 6, 99):
+                self.assertEqual(index.get(f"isbn-{number:05d}").title, f"Title {number}")
+
+    def test_newer_record_replaces_older(self):
+        with IsbnIndex(self.directory, merge_threshold=3) as index:
+            index.add_many(self.unit(number) for number in range(3))
+            index.add(self.unit(1, title="Second Edition"))
+            self.assertEqual(index.get("isbn-00001").title, "Second Edition")
+            index.merge()
+            self.assertEqual(index.get("isbn-00001").title, "Second Edition")
+            self.assertEqual(len(index), 3)
+
+    def test_merges_interleave_keys(self):
+        with IsbnIndex(self.directory, merge_threshold=4) as index:
+            for number in list(range(0, 40, 2)) + list(range(1, 40, 2)):
+                index.add(self.unit(number))
+            index.merge()
+            self.assertEqual(len(index), 40)
+            self.assertTrue(all(f"isbn-{number:05d}" in index for number in range(40)))
+
+    def test_removed_isbn_stays_removed(self):
+        with IsbnIndex(self.directory, merge_threshold=1000) as index:
+            index.add_many(self.unit(number) for number in range(5))
+            index.merge()
+            index.add(self.unit(7))
+            index.remove("isbn-00001")
+            index.remove("isbn-00007")
+            index.remove("isbn-99999")
+            self.assertNotIn("isbn-00001", index)
+            self.assertIsNone(index.get("isbn-00007"))
+            self.assertEqual(len(index), 4)
+        with IsbnIndex(self.directory, merge_threshold=1000) as index:
+            self.assertNotIn("isbn-00001", index)
+            self.assertEqual(len(index), 4)
+            index.merge()
+            self.assertNotIn("isbn-00001", index)
+            self.assertNotIn("isbn-00007", index)
+            self.assertEqual(index.get("isbn-00002").title, "Title 2")
+            self.assertEqual(len(index), 4)
+            index.add(self.unit(1, title="Back Again"))
+            index.merge()
+            self.assertEqual(index.get("isbn-00001").title, "Back Again")
+        with IsbnIndex(self.directory) as index:
+            self.assertEqual(len(index), 5)
+
+    def test_torn_final_record_is_dropped(self):
+        with IsbnIndex(self.directory) as index:
+            index.add(self.unit(1))
+        with open(os.path.join(self.directory, "records.jsonl"), "ab") as handle:
+            handle.write(b'["Half')
+        with IsbnIndex(self.directory) as index:
+            self.assertEqual(len(index), 1)
+            index.add(self.unit(2))
+        with IsbnIndex(self.directory) as index:
+            self.assertEqual(index.get("isbn-00002").title, "Title 2")
+
+    def test_rejects_long_keys_and_corrupt_files(self):
+        with IsbnIndex(self.directory) as index:
+            with self.assertRaises(ValueError):
+                index.add(ReadingMaterialUnit("title", "author", 2000, "x" * 18))
+        with open(os.path.join(self.directory, "index.bin"), "r+b") as handle:
+            handle.write(b"JUNK")
+        with self.assertRaises(ValueError):
+            IsbnIndex(self.directory)
+
+    def test_library_finds_materials_after_restart(self):
+        with IsbnIndex(self.directory) as index:
+            Library("name of library", isbn_index=index).add_reading_material_unit(self.unit(5))
+        with IsbnIndex(self.directory) as index:
+            library = Library("name of library", isbn_index=index)
+            self.assertEqual(library.get_reading_materials(), {})
+            self.assertEqual(library.find_reading_material_unit("isbn-00005").title, "Title 5")
+            self.assertIsNone(library.find_reading_material_unit("isbn-00006"))
+
+    def test_library_removal_reaches_the_index(self):
+        with IsbnIndex(self.directory) as index:
+            library = Library("name of library", isbn_index=index)
+            library.add_reading_material_unit(self.unit(5))
+            library.remove_reading_material_unit("isbn-00005")
+            self.assertIsNone(library.find_reading_material_unit("isbn-00005"))
+        with IsbnIndex(self.directory) as index:
+            self.assertIsNone(Library("name of library", isbn_index=index).find_reading_material_unit("isbn-00005"))
+
+    def test_library_removes_materials_only_in_the_index(self):
+        with IsbnIndex(self.directory) as index:
+            Library("name of library", isbn_index=index).add_reading_material_unit(self.unit(5))
+        with IsbnIndex(self.directory) as index:
+            library = Library("name of library", isbn_index=index)
+            self.assertEqual(library.remove_reading_material_unit("isbn-00005").title, "Title 5")
+            self.assertIsNone(library.find_reading_material_unit("isbn-00005"))
+            with self.assertRaises(KeyError):
+                library.remove_reading_material_unit("isbn-00005")
+        with IsbnIndex(self.directory) as index:
+            self.assertIsNone(Library("name of library", isbn_index=index).find_reading_material_unit("isbn-00005"))
@@ -21,4 +21,10 @@ class TestReadingMaterialUnit(unittest.TestCase):
         self.assertIn(self.reading_material_unit.title, str(self.reading_material_unit))
         self.assertIn(self.reading_material_unit.author, str(self.reading_material_unit))
 
-    
\ No newline at end of file
+    
+
+    def test_reading_material_repeated_strings_are_shared(self):
+        other = ReadingMaterialUnit(title="other", author="".join(["auth", "or"]), isbn="other", year_published=2000,
+                                    typr_="".join(["bo", "ok"]))
+        self.assertIs(other.author, self.reading_material_unit.author)
+        self.assertIs(other.type, self.reading_material_unit.type)
@@ -0,0 +1,128 @@
+import threading
+import unittest
+from main import Library, ReadingMaterialUnit
+from recommendations import CoBorrowing
+
+LOANS = [
+    ("amina", "maths"), ("amina", "physics"), ("amina", "poems"),
+    ("kwame", "maths"), ("kwame", "physics"),
+    ("yaa", "maths"), ("yaa", "chemistry"),
+    ("ben", "poems"), ("ben", "novels"),
+]
+
+class TestCoBorrowing(unittest.TestCase):
+    def setUp(self):
+        self.engine = CoBorrowing()
+        for member, isbn in LOANS:
+            self.engine.record_checkout(member, isbn)
+
+    def tearDown(self):
+        self.engine = None
+
+    def test_pair_counts(self):
+        self.assertEqual(self.engine.pairs["maths"], {"physics": 2, "poems": 1, "chemistry": 1})
+        self.assertEqual(self.engine.pairs["physics"]["maths"], 2)
+        self.assertNotIn("maths", self.engine.pairs["maths"])
+
+    def test_repeat_checkouts_count_once(self):
+        self.engine.record_checkout("kwame", "physics")
+        self.assertEqual(self.engine.pairs["maths"]["physics"], 2)
+
+    def test_top_k(self):
+        self.assertEqual(self.engine.recommend("maths", k=2), [("physics", 2), ("chemistry", 1)])
+        self.assertEqual(self.engine.recommend("maths", k=1, exclude={"physics"}), [("chemistry", 1)])
+        self.assertEqual(self.engine.recommend("unknown"), [])
+
+    def test_recommend_for_member(self):
+        self.assertEqual(self.engine.recommend_for_member("kwame"), [("poems", 2), ("chemistry", 1)])
+
+    def test_recompute_matches_incremental(self):
+        for processes in (None, 2):
+            with self.subTest(processes=processes):
+                rebuilt = CoBorrowing()
+                rebuilt.recompute(LOANS, shards=3, processes=processes)
+                self.assertEqual(dict(rebuilt.pairs), dict(self.engine.pairs))
+
+    def test_pruning(self):
+        pruned = CoBorrowing(min_count=2)
+        pruned.recompute(LOANS)
+        self.assertEqual(dict(pruned.pairs), {"maths": {"physics": 2}, "physics": {"maths": 2}})
+        self.engine.max_neighbours = 1
+        self.engine.prune()
+        self.assertEqual(self.engine.pairs["maths"], {"physics": 2})
+        self.assertTrue(all(len(row) <= 1 for row in self.engine.pairs.values()))
+
+    def assertSymmetric(self, pairs):
+        for isbn, row in pairs.items():
+            for other, count in row.items():
+                self.assertEqual(pairs[other][isbn], count)
+
+    def test_pruning_keeps_pairs_symmetric(self):
+        self.engine.max_neighbours = 1
+        self.engine.prune()
+        self.assertSymmetric(self.engine.pairs)
+        self.assertNotIn("poems", self.engine.pairs)
+
+    def test_rows_are_cut_as_they_grow(self):
+        engine = CoBorrowing(max_neighbours=2, prune_every=None)
+        for member in range(10):
+            engine.record_checkout(f"member-{member}", "maths")
+            engine.record_checkout(f"member-{member}", f"isbn-{member}")
+        self.assertTrue(all(len(row) <= 4 for row in engine.pairs.values()))
+        self.assertSymmetric(engine.pairs)
+
+    def test_rows_gaining_pairs_from_other_checkouts_are_cut(self):
+        for prune_every in (None, 100_000):
+            with self.subTest(prune_every=prune_every):
+                engine = CoBorrowing(max_neighbours=5, prune_every=prune_every)
+                for member in range(1000):
+                    engine.record_checkout(f"member-{member}", "A")
+                    engine.record_checkout(f"member-{member}", f"X{member}")
+                self.assertTrue(all(len(row) <= 10 for row in engine.pairs.values()))
+                self.assertSymmetric(engine.pairs)
+
+    def test_queries_during_checkouts(self):
+        engine = CoBorrowing(max_neighbours=5)
+        errors = []
+
+        def query():
+            try:
+                for _ in range(2000):
+                    engine.recommend("A")
+                    engine.recommend_for_member("member-0")
+            except Exception as error:
+                errors.append(error)
+
+        thread = threading.Thread(target=query)
+        thread.start()
+        for member in range(2000):
+            engine.record_checkout(f"member-{member % 50}", "A")
+            engine.record_checkout(f"member-{member % 50}", f"X{member}")
+        thread.join()
+        self.assertEqual(errors, [])
+
+    def test_prunes_every_n_checkouts(self):
+        engine = CoBorrowing(min_count=2, prune_every=len(LOANS))
+        for member, isbn in LOANS:
+            engine.record_checkout(member, isbn)
+        self.assertEqual(dict(engine.pairs), {"maths": {"physics": 2}, "physics": {"maths": 2}})
+
+    def test_member_history_is_bounded(self):
+        engine = CoBorrowing(max_history=2)
+        for isbn in ("a", "b", "c", "d"):
+            engine.record_checkout("amina", isbn)
+        self.assertEqual(engine.pairs["d"], {"b": 1, "c": 1})
+        self.assertEqual(engine.pairs["a"], {"b": 1, "c": 1})
+        # "a" and "b" fell out of the history, so they are suggested again
+        self.assertEqual(engine.recommend_for_member("amina"), [("b", 2), ("a", 1)])
+        rebuilt = CoBorrowing(max_history=2)
+        rebuilt.recompute([("amina", isbn) for isbn in ("a", "b", "c", "d")])
+        self.assertEqual(dict(rebuilt.pairs), dict(engine.pairs))
+
+    def test_library_checkout_feeds_recommendations(self):
+        library = Library("name of library")
+        for isbn, title in (("maths", "New Maths"), ("physics", "Physics"), ("poems", "Poems")):
+            library.add_reading_material_unit(ReadingMaterialUnit(title, "author", 2001, isbn), copies=2)
+        for member, isbn in LOANS[:5]:
+            library.checkout_reading_material_unit(isbn, member)
+        self.assertEqual([unit.title for unit in library.recommend("maths")], ["Physics", "Poems"])
@@ -0,0 +1,198 @@
+import threading
+import unittest
+from datetime import date
+from main import Library, ReadingMaterialUnit
+from reservations import ReservationEngine, ReservationError
+
+class TestReservationEngine(unittest.TestCase):
+    def setUp(self):
+        self.engine = ReservationEngine()
+        self.engine.add_copies("isbn", 2)
+
+    def tearDown(self):
+        self.engine = None
+
+    def test_checkout_and_return(self):
+        loan = self.engine.checkout("isbn", "amina", today=date(2026, 1, 1))
+        self.assertEqual(loan.due, date(2026, 1, 15))
+        self.assertEqual(self.engine.available("isbn"), 1)
+        self.assertEqual(self.engine.member_loans("amina"), [loan])
+        self.assertIs(self.engine.return_copy("isbn", "amina"), loan)
+        self.assertEqual(self.engine.available("isbn"), 2)
+        self.assertEqual(self.engine.member_loans("amina"), [])
+
+    def test_copies_run_out(self):
+        first = self.engine.checkout("isbn", "amina")
+        second = self.engine.checkout("isbn", "kwame")
+        self.assertNotEqual(first.copy_number, second.copy_number)
+        with self.assertRaises(ReservationError):
+            self.engine.checkout("isbn", "yaa")
+
+    def test_member_cannot_borrow_same_isbn_twice(self):
+        self.engine.checkout("isbn", "amina")
+        with self.assertRaises(ReservationError):
+            self.engine.checkout("isbn", "amina")
+        with self.assertRaises(ReservationError):
+            self.engine.place_hold("isbn", "amina")
+
+    def test_unknown_isbn_and_loan(self):
+        with self.assertRaises(ReservationError):
+            self.engine.checkout("other", "amina")
+        with self.assertRaises(ReservationError):
+            self.engine.return_copy("isbn", "amina")
+
+    def test_holds_are_served_first_in_order(self):
+        self.engine.checkout("isbn", "amina")
+        self.engine.checkout("isbn", "kwame")
+        self.assertEqual(self.engine.place_hold("isbn", "yaa"), 0)
+        self.assertEqual(self.engine.place_hold("isbn", "ben"), 1)
+        self.engine.return_copy("isbn", "amina")
+        with self.assertRaises(ReservationError):
+            self.engine.checkout("isbn", "walk-in")
+        with self.assertRaises(ReservationError):
+            self.engine.checkout("isbn", "ben")
+        self.engine.checkout("isbn", "yaa")
+        self.assertEqual(self.engine.holds("isbn"), ["ben"])
+
+    def test_cancel_hold(self):
+        self.engine.place_hold("isbn", "yaa")
+        self.engine.cancel_hold("isbn", "yaa")
+        self.assertEqual(self.engine.holds("isbn"), [])
+        with self.assertRaises(ReservationError):
+            self.engine.cancel_hold("isbn", "yaa")
+
+    def test_max_loans(self):
+        engine = ReservationEngine(max_loans=1)
+        engine.add_copies("a")
+        engine.add_copies("b")
+        engine.checkout("a", "amina")
+        with self.assertRaises(ReservationError):
+            engine.checkout("b", "amina")
+
+    def test_library_registers_copies(self):
+        library = Library("name of library")
+        library.add_reading_material_unit(ReadingMaterialUnit("New Maths", "author", 2001, "isbn"), copies=3)
+        self.assertEqual(library.reservations.available("isbn"), 3)
+
+
+class TestReservationEngineConcurrency(unittest.TestCase):
+    def run_threads(self, count, target):
+        barrier = threading.Barrier(count)
+        errors = []
+
+        def run(number):
+            barrier.wait()
+            try:
+                target(number)
+            except Exception as error:
+                errors.append(error)
+
+        threads = [threading.Thread(target=run, args=(number,)) for number in range(count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return errors
+
+    def test_checkout_never_oversells_copies(self):
+        engine = ReservationEngine()
+        engine.add_copies("isbn", 50)
+        errors = self.run_threads(2000, lambda number: engine.checkout("isbn", f"member-{number}"))
+        self.assertEqual(len(errors), 1950)
+        self.assertTrue(all(isinstance(error, ReservationError) for error in errors))
+        loans = engine.loans("isbn")
+        self.assertEqual(len(loans), 50)
+        self.assertEqual(sorted(loan.copy_number for loan in loans), list(range(1, 51)))
+        self.assertEqual(engine.available("isbn"), 0)
+
+    def test_checkout_and_return_cycles(self):
+        engine = ReservationEngine(max_loans=2)
+        isbns = [f"isbn-{number}" for number in range(10)]
+        for isbn in isbns:
+            engine.add_copies(isbn, 3)
+
+        def borrow(number):
+            member = f"member-{number % 100}"
+            for isbn in isbns[number % 10:] + isbns[:number % 10]:
+                try:
+                    engine.checkout(isbn, member)
+                except ReservationError:
+                    continue
+                engine.return_copy(isbn, member)
+
+        self.assertEqual(self.run_threads(1000, borrow), [])
+        for isbn in isbns:
+            self.assertEqual(engine.available(isbn), 3)
+            self.assertEqual(engine.loans(isbn), [])
+
+
+class TestReservationReports(unittest.TestCase):
+    def setUp(self):
+        self.library = Library("name of library")
+        self.library.add_reading_material_unit(ReadingMaterialUnit("New Maths", "author", 2001, "maths"), copies=2)
+        self.library.add_reading_material_unit(ReadingMaterialUnit("Old Maths", "author", 1950, "old"))
+        self.engine = self.library.reservations
+
+    def tearDown(self):
+        self.library = None
+
+    def test_overdue_in_due_order(self):
+        self.engine.checkout("maths", "amina", today=date(2026, 1, 5))
+        self.engine.checkout("old", "kwame", today=date(2026, 1, 1))
+        self.engine.checkout("maths", "yaa", today=date(2026, 2, 1))
+        self.assertEqual(list(self.engine.overdue(date(2026, 1, 15))), [])
+        overdue = list(self.engine.overdue(date(2026, 1, 20)))
+        self.assertEqual([(loan.isbn, loan.member) for loan in overdue], [("old", "kwame"), ("maths", "amina")])
+        # Still reported on later days, until returned
+        self.engine.return_copy("old", "kwame")
+        self.assertEqual([loan.member for loan in self.engine.overdue(date(2026, 1, 21))], ["amina"])
+        self.assertEqual([loan.member for loan in self.engine.overdue(date(2026, 3, 1))], ["amina", "yaa"])
+        self.assertEqual([loan.member for loan in self.engine.overdue(date(2026, 1, 1))], [])
+
+    def test_returned_before_due_is_never_overdue(self):
+        self.engine.checkout("maths", "amina", today=date(2026, 1, 1))
+        self.engine.return_copy("maths", "amina")
+        self.engine.checkout("maths", "amina", today=date(2026, 1, 10))
+        overdue = list(self.engine.overdue(date(2026, 1, 20)))
+        self.assertEqual(overdue, [])
+
+    def test_ready_counts_follow_checkouts_and_holds(self):
+        self.assertEqual(dict(self.engine.ready()), {"maths": 2, "old": 1})
+        self.engine.checkout("old", "amina")
+        self.engine.checkout("maths", "kwame")
+        self.assertEqual(dict(self.engine.ready()), {"maths": 1})
+        self.engine.place_hold("maths", "yaa")
+        self.assertEqual(self.engine.ready_copies("maths"), 0)
+        self.engine.cancel_hold("maths", "yaa")
+        self.engine.return_copy("old", "amina")
+        self.assertEqual(dict(self.engine.ready()), {"maths": 1, "old": 1})
+
+    def test_library_reports(self):
+        self.library.reservations.checkout("old", "amina", today=date(2026, 1, 1))
+        [(material, loan)] = self.library.overdue_report(date(2026, 2, 1))
+        self.assertEqual((material.title, loan.member), ("Old Maths", "amina"))
+        self.assertEqual([(material.title, copies) for material, copies in self.library.availability_report()],
+                         [("New Maths", 2)])
+
+    def test_removed_material_leaves_the_reports(self):
+        self.engine.checkout("maths", "amina", today=date(2026, 1, 1))
+        self.engine.checkout("old", "kwame", today=date(2026, 1, 1))
+        self.engine.return_copy("old", "kwame")
+        self.engine.place_hold("old", "yaa")
+        self.library.remove_reading_material_unit("old")
+        with self.assertRaises(ReservationError):
+            self.engine.checkout("old", "yaa")
+        self.assertEqual([(material.title, copies) for material, copies in self.library.availability_report()],
+                         [("New Maths", 1)])
+        self.assertEqual([(material.title, loan.member) for material, loan in self.library.overdue_report(date(2026, 2, 1))],
+                         [("New Maths", "amina")])
+
+    def test_material_on_loan_cannot_be_removed(self):
+        self.engine.checkout("maths", "amina")
+        with self.assertRaises(ReservationError):
+            self.library.remove_reading_material_unit("maths")
+        self.assertEqual(self.library.find_reading_material_unit("maths").title, "New Maths")
+        self.assertEqual(self.library.search("maths")[0].isbn, "maths")
+        self.engine.return_copy("maths", "amina")
+        self.library.remove_reading_material_unit("maths")
+        self.assertEqual(dict(self.engine.ready()), {"old": 1})
@@ -0,0 +1,68 @@
+import unittest
+from main import Library, ReadingMaterialUnit
+from search import SearchIndex
+
+class TestLibrarySearch(unittest.TestCase):
+    def setUp(self):
+        self.library = Library("name of library")
+        for unit in (
+            ReadingMaterialUnit("New Maths", "Ada Lovelace", 1999, "isbn-1"),
+            ReadingMaterialUnit("Old Maths", "Alan Turing", 1950, "isbn-2"),
+            ReadingMaterialUnit("Maths Weekly", "Ada Byron", 2021, "isbn-3", "newspaper"),
+            ReadingMaterialUnit("Poems of Ada", "Anonymous", 2005, "isbn-4"),
+            ReadingMaterialUnit("Untitled", "author", "year_published", "isbn-5"),
+        ):
+            self.library.add_reading_material_unit(unit)
+
+    def tearDown(self):
+        self.library = None
+
+    def isbns(self, results):
+        return [unit.isbn for unit in results]
+
+    def test_materials_are_added_to_library(self):
+        self.assertEqual(len(self.library.get_reading_materials()), 5)
+        self.assertEqual(len(self.library.search_index), 5)
+
+    def test_text_search_matches_title_and_author(self):
+        self.assertEqual(self.isbns(self.library.search("maths")), ["isbn-3", "isbn-1", "isbn-2"])
+        self.assertEqual(self.isbns(self.library.search("TURING")), ["isbn-2"])
+        self.assertEqual(self.library.search("calculus"), [])
+
+    def test_words_are_intersected(self):
+        self.assertEqual(self.isbns(self.library.search("ada maths")), ["isbn-3", "isbn-1"])
+
+    def test_title_matches_rank_above_author_matches(self):
+        self.assertEqual(self.isbns(self.library.search("ada")), ["isbn-4", "isbn-3", "isbn-1"])
+
+    def test_author_field(self):
+        self.assertEqual(self.isbns(self.library.search(author="ada")), ["isbn-3", "isbn-1"])
+
+    def test_year_range(self):
+        self.assertEqual(self.isbns(self.library.search(year_from=1999, year_to=2005)), ["isbn-4", "isbn-1"])
+        self.assertEqual(self.isbns(self.library.search(year_to=1999)), ["isbn-1", "isbn-2"])
+        self.assertEqual(self.isbns(self.library.search("maths", year_from=2000)), ["isbn-3"])
+
+    def test_type_facet(self):
+        self.assertEqual(self.isbns(self.library.search(type_="newspaper")), ["isbn-3"])
+        self.assertEqual(len(self.library.search(type_="book", limit=None)), 4)
+        self.assertEqual(self.library.search(type_="article"), [])
+
+    def test_limit(self):
+        self.assertEqual(len(self.library.search(limit=2)), 2)
+        self.assertEqual(len(self.library.search(limit=None)), 5)
+
+    def test_remove_updates_every_index(self):
+        removed = self.library.remove_reading_material_unit("isbn-1")
+        self.assertEqual(removed.title, "New Maths")
+        self.assertEqual(self.isbns(self.library.search("maths")), ["isbn-3", "isbn-2"])
+        self.assertEqual(self.isbns(self.library.search(year_from=1999, year_to=1999)), [])
+        self.assertNotIn("isbn-1", self.library.get_reading_materials())
+
+    def test_same_isbn_replaces_material(self):
+        index = SearchIndex()
+        index.add(ReadingMaterialUnit("First", "author", 2000, "isbn"))
+        index.add(ReadingMaterialUnit("Second", "author", 2001, "isbn"))
+        self.assertEqual(len(index), 1)
+        self.assertEqual(index.search("first"), [])
+        self.assertEqual([unit.title for unit in index.search(year_from=2000)], ["Second"])
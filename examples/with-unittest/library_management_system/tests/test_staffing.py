@@ -0,0 +1,74 @@
+import unittest
+from datetime import datetime
+from main import Employee, Library
+from staffing import Staffing, StaffingError
+
+def at(hour, day=1):
+    return datetime(2026, 3, day, hour)
+
+class TestStaffing(unittest.TestCase):
+    def setUp(self):
+        self.staffing = Staffing()
+        self.amina = Employee(name="amina", age=30, profession="librarian")
+        self.kwame = Employee(name="kwame", age=41, profession="librarian")
+        self.yaa = Employee(name="yaa", age=25, profession="librarian")
+
+    def tearDown(self):
+        self.staffing = None
+
+    def names(self, shifts):
+        return sorted(shift.employee.name for shift in shifts)
+
+    def test_on_duty(self):
+        self.staffing.assign(self.amina, "central", "front", at(9), at(13))
+        self.staffing.assign(self.kwame, "central", "archive", at(11), at(17))
+        self.staffing.assign(self.yaa, "east", "front", at(9), at(17))
+        self.assertEqual(self.names(self.staffing.on_duty(at(8))), [])
+        self.assertEqual(self.names(self.staffing.on_duty(at(9), "central")), ["amina"])
+        self.assertEqual(self.names(self.staffing.on_duty(at(12), "central")), ["amina", "kwame"])
+        self.assertEqual(self.names(self.staffing.on_duty(at(13), "central")), ["kwame"])
+        self.assertEqual(self.names(self.staffing.on_duty(at(12))), ["amina", "kwame", "yaa"])
+        self.assertEqual(self.staffing.on_duty(at(12), "west"), [])
+        self.assertEqual(self.names(self.staffing.on_duty(at(17))), [])
+
+    def test_overlapping_shifts_are_rejected(self):
+        self.staffing.assign(self.amina, "central", "front", at(9), at(13))
+        with self.assertRaises(StaffingError):
+            self.staffing.assign(self.amina, "east", "front", at(12), at(14))
+        with self.assertRaises(StaffingError):
+            self.staffing.assign(self.amina, "east", "front", at(8), at(10))
+        self.staffing.assign(self.amina, "east", "front", at(13), at(15))
+        with self.assertRaises(StaffingError):
+            self.staffing.assign(self.kwame, "east", "front", at(15), at(14))
+
+    def test_unassign_updates_index_and_hours(self):
+        shift = self.staffing.assign(self.amina, "central", "front", at(9), at(13))
+        self.assertEqual(self.staffing.hours(self.amina), 4)
+        self.staffing.unassign(shift)
+        self.assertEqual(self.staffing.on_duty(at(10)), [])
+        self.assertEqual(self.staffing.hours(self.amina), 0)
+
+    def test_fill_balances_hours(self):
+        slots = [(at(9, day), at(13, day)) for day in range(1, 7)] + [(at(13, day), at(17, day)) for day in range(1, 7)]
+        shifts = self.staffing.fill("central", ["front", "archive"], slots,
+                                    [self.amina, self.kwame, self.yaa])
+        self.assertEqual(len(shifts), 24)
+        self.assertEqual([self.staffing.hours(person) for person in (self.amina, self.kwame, self.yaa)],
+                         [32, 32, 32])
+        self.assertEqual(self.staffing.desk_hours("central"), {"front": 48, "archive": 48})
+        for moment in (at(10, 3), at(15, 5)):
+            self.assertEqual(len(self.staffing.on_duty(moment, "central")), 2)
+
+    def test_fill_skips_busy_staff_and_reports_gaps(self):
+        self.staffing.assign(self.amina, "east", "front", at(9), at(17))
+        [shift] = self.staffing.fill("central", ["front"], [(at(9), at(13))], [self.amina, self.kwame])
+        self.assertIs(shift.employee, self.kwame)
+        with self.assertRaises(StaffingError):
+            self.staffing.fill("central", ["front", "archive"], [(at(10), at(12))], [self.amina, self.yaa])
+
+    def test_library_librarians_on_duty(self):
+        library = Library("name of library")
+        library.hire_librarian(self.amina)
+        self.assertIs(library.get_librarians()["amina"], self.amina)
+        library.staffing.assign(self.amina, "central", "front", at(9), at(13))
+        self.assertEqual(library.librarians_on_duty(at(10)), [self.amina])
@@ -0,0 +1,33 @@
+import unittest
+from main import ReadingMaterialUnit
+from tables import ReadingMaterialTable
+
+class TestReadingMaterialTable(unittest.TestCase):
+    def setUp(self):
+        self.units = [
+            ReadingMaterialUnit("Things Fall Apart", "Chinua Achebe", 1958, "9780385474542"),
+            ReadingMaterialUnit("Arrow of God", "Chinua Achebe", 1964, "080442957X"),
+            ReadingMaterialUnit("Daily News", "Staff", None, "9780306406157", "newspaper"),
+        ]
+        self.table = ReadingMaterialTable(self.units)
+
+    def tearDown(self):
+        self.table = None
+
+    def test_rows_round_trip(self):
+        self.assertEqual(len(self.table), 3)
+        for row, unit in zip(self.table, self.units):
+            self.assertEqual((row.title, row.author, row.year_published, row.isbn, row.type),
+                             (unit.title, unit.author, unit.year_published, unit.isbn, unit.type))
+
+    def test_low_cardinality_columns_are_encoded(self):
+        self.assertEqual(self.table.authors(), ["Chinua Achebe", "Staff"])
+        self.assertEqual(list(self.table.author_codes), [0, 0, 1])
+        self.assertEqual(self.table.types(), ["book", "newspaper"])
+        self.assertEqual(self.table.rows_of_type("newspaper"), [2])
+        self.assertEqual(self.table.rows_of_type("article"), [])
+
+    def test_rejects_years_out_of_range(self):
+        with self.assertRaises(OverflowError):
+            self.table.append(ReadingMaterialUnit("Far Future", "author", 40000, "isbn"))
+        self.assertEqual(len(self.table), 3)
@@ -1,6 +1,8 @@
 import logging
 from abc import ABC, abstractmethod
 
+from money import Money
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -28,8 +30,8 @@ class PercentageDiscount(DiscountInterface):
         self.percentage = percentage
 
     def apply_discount(self, total: float) -> float:
-        discount_amount = total * (self.percentage / 100)
-        return total - discount_amount
+        # Computed in integer cents so the result is exact to the cent
+        return float(Money.from_amount(total).apply_percentage_discount(self.percentage))
 
 class ShoppingCart:
     def __init__(self, discount_strategy: DiscountInterface = None):
@@ -0,0 +1,159 @@
+"""
+Exact money arithmetic backed by integer cents.
+
+``Money`` is a small immutable value type, and ``scale_cents`` the integer
+rounding behind it; the carts price with these. The batch helpers work on
+plain sequences of cents and quantities (lists, ``array('q')`` or NumPy
+arrays) for pricing many lines or carts at once, e.g. ``batch_pricing`` in
+shopping_cart_with_discount.
+
+shopping_cart_project and shopping_cart_with_discount each carry a copy
+of this module; the two must stay identical (checked by
+shopping_cart_project/tests/test_money.py).
+"""
+from decimal import Decimal, ROUND_HALF_UP
+from fractions import Fraction
+from functools import lru_cache, total_ordering
+from operator import mul
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional, the pure Python path gives the same results
+    np = None
+
+
+def to_cents(amount):
+    """Convert an amount in currency units (e.g. ``2.5``) to integer cents."""
+    return int((Decimal(str(amount)) * 100).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+
+
+def _round_half_up(value):
+    """Round a Fraction to the nearest integer, halves away from zero."""
+    if value < 0:
+        return -_round_half_up(-value)
+    return int(value + Fraction(1, 2))
+
+
+def _as_fraction(number):
+    return Fraction(str(number)) if isinstance(number, float) else Fraction(number)
+
+
+@lru_cache(maxsize=256)
+def _percentage_ratio(percentage):
+    """``percentage / 100`` as an integer (numerator, denominator) pair."""
+    fraction = _as_fraction(percentage)
+    return fraction.numerator, fraction.denominator * 100
+
+
+def scale_cents(cents, numerator, denominator):
+    """``cents * numerator / denominator`` rounded half-up, in integers only."""
+    scaled = cents * numerator
+    magnitude = (abs(scaled) * 2 + denominator) // (2 * denominator)
+    return magnitude if scaled >= 0 else -magnitude
+
+
+@total_ordering
+class Money:
+    __slots__ = ("cents",)
+
+    def __init__(self, cents=0):
+        if not isinstance(cents, int):
+            raise TypeError("Money is built from integer cents, use Money.from_amount()")
+        self.cents = cents
+
+    @classmethod
+    def from_amount(cls, amount):
+        return cls(to_cents(amount))
+
+    @property
+    def amount(self):
+        return Decimal(self.cents) / 100
+
+    def __add__(self, other):
+        if isinstance(other, Money):
+            return Money(self.cents + other.cents)
+        return NotImplemented
+
+    def __sub__(self, other):
+        if isinstance(other, Money):
+            return Money(self.cents - other.cents)
+        return NotImplemented
+
+    def __mul__(self, quantity):
+        if isinstance(quantity, int):
+            return Money(self.cents * quantity)
+        return NotImplemented
+
+    __rmul__ = __mul__
+
+    def __neg__(self):
+        return Money(-self.cents)
+
+    def __eq__(self, other):
+        if isinstance(other, Money):
+            return self.cents == other.cents
+        return NotImplemented
+
+    def __lt__(self, other):
+        if isinstance(other, Money):
+            return self.cents < other.cents
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(self.cents)
+
+    def __bool__(self):
+        return self.cents != 0
+
+    def __float__(self):
+        return self.cents / 100
+
+    def __repr__(self):
+        return f"Money({self.cents})"
+
+    def __str__(self):
+        return f"{self.amount:.2f}"
+
+    def percentage(self, percentage):
+        """``percentage`` percent of this amount, rounded half-up to the cent."""
+        return Money(scale_cents(self.cents, *_percentage_ratio(percentage)))
+
+    def apply_percentage_discount(self, percentage):
+        if percentage < 0 or percentage > 100:
+            raise ValueError("Discount percentage must be between 0 and 100.")
+        return self - self.percentage(percentage)
+
+    def remove_percentage_discount(self, percentage):
+        """
+        Recover the pre-discount amount from a discounted one.
+
+        A 100% discount leaves nothing to recover from, so it is rejected
+        instead of dividing by zero.
+        """
+        if percentage < 0 or percentage >= 100:
+            raise ValueError("Discount percentage must be between 0 and 100 (exclusive) to be removed.")
+        return Money(_round_half_up(self.cents * Fraction(100) / (100 - _as_fraction(percentage))))
+
+
+def line_totals(prices_cents, quantities):
+    """Element-wise ``price * quantity`` in cents."""
+    if np is not None and isinstance(prices_cents, np.ndarray):
+        return np.multiply(prices_cents, quantities, dtype=np.int64)
+    return list(map(mul, prices_cents, quantities))
+
+
+def sum_line_totals(prices_cents, quantities):
+    """Sum of ``price * quantity`` over all lines, as Money."""
+    if np is not None and isinstance(prices_cents, np.ndarray):
+        return Money(int(np.dot(prices_cents.astype(np.int64), np.asarray(quantities, dtype=np.int64))))
+    return Money(sum(map(mul, prices_cents, quantities)))
+
+
+def percentage_batch(amounts_cents, percentage):
+    """``percentage`` percent of every amount, rounded half-up like ``Money.percentage``."""
+    numerator, denominator = _percentage_ratio(percentage)
+    if np is not None and isinstance(amounts_cents, np.ndarray):
+        scaled = amounts_cents.astype(np.int64) * numerator
+        magnitude = (np.abs(scaled) * 2 + denominator) // (2 * denominator)
+        return np.sign(scaled) * magnitude
+    return [scale_cents(cents, numerator, denominator) for cents in amounts_cents]
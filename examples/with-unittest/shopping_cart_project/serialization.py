@@ -0,0 +1,94 @@
+"""
+Compact snapshots of a ShoppingCart.
+
+Binary layout (little-endian)::
+
+    b"SCRT" | format version u8 | line count u32
+    then per line: name length u16 | name utf-8 | price cents i64 | quantity u32
+
+The cart's logger and discount strategy are not part of the snapshot.
+Lines are keyed by product name, so both forms reject a name listed
+twice, a quantity that is not positive and a negative price.
+"""
+import json
+import struct
+
+from main import Product, ShoppingCart
+from money import Money
+
+MAGIC = b"SCRT"
+FORMAT_VERSION = 1
+_HEADER = struct.Struct("<4sBI")
+_NAME_LENGTH = struct.Struct("<H")
+_LINE = struct.Struct("<qI")
+
+
+def dumps_cart(cart: ShoppingCart) -> bytes:
+    parts = [_HEADER.pack(MAGIC, FORMAT_VERSION, len(cart.products))]
+    for name, line in cart.products.items():
+        encoded = name.encode("utf-8")
+        parts.append(_NAME_LENGTH.pack(len(encoded)))
+        parts.append(encoded)
+        parts.append(_LINE.pack(Money.from_amount(line["product"].price).cents, line["quantity"]))
+    return b"".join(parts)
+
+
+def loads_cart(data, discount_strategy=None) -> ShoppingCart:
+    """Decode bytes from ``dumps_cart``; ``data`` is read through a memoryview."""
+    view = memoryview(data)
+    try:
+        magic, format_version, count = _HEADER.unpack_from(view)
+        if magic != MAGIC or format_version != FORMAT_VERSION:
+            raise ValueError("Not a cart snapshot, or an unsupported format version.")
+        offset = _HEADER.size
+        lines = []
+        for _ in range(count):
+            (length,) = _NAME_LENGTH.unpack_from(view, offset)
+            offset += _NAME_LENGTH.size
+            name = str(view[offset:offset + length], "utf-8")
+            offset += length
+            price_cents, quantity = _LINE.unpack_from(view, offset)
+            offset += _LINE.size
+            lines.append((name, float(Money(price_cents)), quantity))
+    except struct.error as error:
+        raise ValueError("Cart snapshot is truncated.") from error
+    if offset != len(view):
+        raise ValueError("Cart snapshot has trailing data.")
+    return _build_cart(lines, discount_strategy)
+
+
+def _build_cart(lines, discount_strategy):
+    products = {}
+    for name, price, quantity in lines:
+        if name in products:
+            raise ValueError("Cart snapshot lists a product more than once.")
+        if quantity <= 0:
+            raise ValueError("Cart snapshot has a quantity that is not positive.")
+        if price < 0:
+            raise ValueError("Cart snapshot has a negative price.")
+        products[name] = {"product": Product(name, price), "quantity": quantity}
+    cart = ShoppingCart(discount_strategy)
+    cart.products = products
+    return cart
+
+
+def cart_to_json(cart: ShoppingCart) -> str:
+    return json.dumps({
+        "format": "shopping-cart",
+        "version": FORMAT_VERSION,
+        "lines": [[name, line["product"].price, line["quantity"]] for name, line in cart.products.items()],
+    })
+
+
+def cart_from_json(text: str, discount_strategy=None) -> ShoppingCart:
+    document = json.loads(text)
+    if document.get("format") != "shopping-cart" or document.get("version") != FORMAT_VERSION:
+        raise ValueError("Not a cart snapshot, or an unsupported format version.")
+    lines = document["lines"]
+    if not all(isinstance(line, list) and len(line) == 3 and type(line[0]) is str for line in lines):
+        raise ValueError("Cart snapshot has a malformed line.")
+    if not all(type(price) in (int, float) for _, price, _ in lines):
+        raise ValueError("Cart snapshot has a price that is not a number.")
+    if not all(type(quantity) is int for _, _, quantity in lines):
+        raise ValueError("Cart snapshot has a quantity that is not an integer.")
+    return _build_cart(lines, discount_strategy)
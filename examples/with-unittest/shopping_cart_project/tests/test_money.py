@@ -0,0 +1,75 @@
+import os
+import unittest
+from array import array
+from decimal import Decimal
+
+import money
+from money import (Money, line_totals, np, percentage_batch, scale_cents,
+                   sum_line_totals, to_cents)
+
+SHARED_COPY = os.path.join(os.path.dirname(money.__file__), "..", "shopping_cart_with_discount", "money.py")
+
+class TestMoney(unittest.TestCase):
+    def test_to_cents(self):
+        self.assertEqual(to_cents(2.35), 235)
+        self.assertEqual(to_cents(0.1), 10)
+        self.assertEqual(to_cents("19.995"), 2000)
+
+    def test_arithmetic_is_exact(self):
+        total = Money(0)
+        for _ in range(10):
+            total += Money.from_amount(0.1)
+        self.assertEqual(total, Money(100))
+        self.assertEqual(Money(235) * 2, Money(470))
+        self.assertEqual(Money(100) - Money(35), Money(65))
+        self.assertEqual(str(Money(1999)), "19.99")
+        self.assertEqual(Money(1999).amount, Decimal("19.99"))
+        self.assertEqual(float(Money(235)), 2.35)
+
+    def test_money_requires_integer_cents(self):
+        with self.assertRaises(TypeError):
+            Money(1.5)
+
+    def test_percentage_discount(self):
+        self.assertEqual(Money(70).percentage(15), Money(11))
+        self.assertEqual(Money(1000).apply_percentage_discount(12.5), Money(875))
+        self.assertEqual(Money(9000).remove_percentage_discount(10), Money(10000))
+        with self.assertRaises(ValueError):
+            Money(1000).apply_percentage_discount(101)
+        with self.assertRaises(ValueError):
+            Money(0).remove_percentage_discount(100)
+
+    def test_scale_cents_rounds_half_up(self):
+        self.assertEqual(scale_cents(5, 1, 2), 3)
+        self.assertEqual(scale_cents(-5, 1, 2), -3)
+        self.assertEqual(scale_cents(1000, 7, 8), 875)
+
+
+class TestMoneyBatch(unittest.TestCase):
+    def setUp(self):
+        self.prices = [100, 50, 235, 1999]
+        self.quantities = [3, 0, 7, 2]
+
+    def test_line_totals(self):
+        self.assertEqual(line_totals(array("q", self.prices), self.quantities), [300, 0, 1645, 3998])
+        self.assertEqual(sum_line_totals(self.prices, self.quantities), Money(5943))
+
+    def test_percentage_batch_matches_scalar(self):
+        expected = [Money(cents).percentage(12.5).cents for cents in self.prices + [-70]]
+        self.assertEqual(percentage_batch(self.prices + [-70], 12.5), expected)
+
+    @unittest.skipIf(np is None, "NumPy is not installed")
+    def test_numpy_batch_matches_pure_python(self):
+        prices = np.array(self.prices, dtype=np.int64)
+        self.assertEqual(sum_line_totals(prices, self.quantities), sum_line_totals(self.prices, self.quantities))
+        self.assertEqual(list(percentage_batch(prices, 12.5)), percentage_batch(self.prices, 12.5))
+
+
+class TestSharedCopy(unittest.TestCase):
+    @unittest.skipUnless(os.path.exists(SHARED_COPY), "shopping_cart_with_discount is not next to this project")
+    def test_same_as_shopping_cart_with_discount(self):
+        with open(money.__file__, "rb") as ours, open(SHARED_COPY, "rb") as theirs:
+            self.assertEqual(ours.read(), theirs.read(), "money.py changed in one project only")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+import json
+import struct
+import unittest
+from main import ShoppingCart, logger
+from serialization import cart_from_json, cart_to_json, dumps_cart, loads_cart
+
+class TestCartSerialization(unittest.TestCase):
+    def setUp(self):
+        self.cart = ShoppingCart()
+        self.cart.add_product("Apple", 1.0)
+        self.cart.add_product("Apple", 1.0)
+        self.cart.add_product("Grapes", 2.35)
+
+    def tearDown(self):
+        del self.cart
+
+    def assertSameCart(self, loaded, original):
+        self.assertEqual(
+            {name: (line["product"].price, line["quantity"]) for name, line in loaded.products.items()},
+            {name: (line["product"].price, line["quantity"]) for name, line in original.products.items()},
+        )
+
+    def test_binary_round_trip(self):
+        logger.info("Testing binary cart snapshot.")
+        self.assertSameCart(loads_cart(dumps_cart(self.cart)), self.cart)
+
+    def test_binary_from_bytearray(self):
+        self.assertSameCart(loads_cart(bytearray(dumps_cart(self.cart))), self.cart)
+
+    def test_empty_cart(self):
+        self.assertEqual(loads_cart(dumps_cart(ShoppingCart())).products, {})
+
+    def test_truncated_snapshot(self):
+        with self.assertRaises(ValueError):
+            loads_cart(dumps_cart(self.cart)[:-3])
+
+    def test_json_round_trip(self):
+        self.assertSameCart(cart_from_json(cart_to_json(self.cart)), self.cart)
+
+    def json_snapshot(self, lines):
+        return json.dumps({"format": "shopping-cart", "version": 1, "lines": lines})
+
+    def test_json_rejects_bad_lines(self):
+        for lines in (
+            [["apple", 1.0, 2], ["apple", 1.0, 1]],
+            [["apple", 1.0, 0]],
+            [["apple", 1.0, -1]],
+            [["apple", 1.0, 1.5]],
+            [["apple", -1.0, 1]],
+            [["apple", "1.0", 1]],
+            [["apple", 1.0]],
+        ):
+            with self.subTest(lines=lines), self.assertRaises(ValueError):
+                cart_from_json(self.json_snapshot(lines))
+
+    def test_binary_rejects_duplicate_names_and_zero_quantities(self):
+        header = struct.pack("<4sBI", b"SCRT", 1, 2)
+        def line(name, cents, quantity):
+            return struct.pack("<H", len(name)) + name + struct.pack("<qI", cents, quantity)
+        with self.assertRaises(ValueError):
+            loads_cart(header + line(b"apple", 100, 1) + line(b"apple", 100, 2))
+        with self.assertRaises(ValueError):
+            loads_cart(header + line(b"apple", 100, 1) + line(b"pear", 100, 0))
+        with self.assertRaises(ValueError):
+            loads_cart(header + line(b"apple", 100, 1) + line(b"pear", -100, 1))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,5 @@
 import unittest
-from main import ShoppingCart, logger
+from main import PercentageDiscount, ShoppingCart, logger
 
 class TestShoppingCart(unittest.TestCase):
     def setUp(self):
@@ -55,6 +55,20 @@ class TestShoppingCart(unittest.TestCase):
         logger.info("Testing remove_product method not implemented.")
         self.cart.remove_product("mango")  # Assuming remove_product is not implemented
         self.assertNotIn("mango", self.cart.products)
+
+
+class TestPercentageDiscount(unittest.TestCase):
+    def test_apply_discount(self):
+        self.assertEqual(PercentageDiscount(10).apply_discount(100.0), 90.0)
+
+    def test_apply_discount_is_exact_to_the_cent(self):
+        self.assertEqual(PercentageDiscount(15).apply_discount(0.7), 0.59)  # 10.5c discount rounds to 11c
+        self.assertEqual(PercentageDiscount(100).apply_discount(19.99), 0.0)
+
+    def test_invalid_percentage(self):
+        with self.assertRaises(ValueError):
+            PercentageDiscount(150).apply_discount(10.0)
+
     
 if __name__ == '__main__':
     unittest.main()
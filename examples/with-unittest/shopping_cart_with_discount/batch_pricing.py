@@ -0,0 +1,106 @@
+"""
+Batch pricing of many carts at once with NumPy.
+
+Carts are laid out as columns (cart position, product index, quantity)
+against one price vector. Carts are grouped by their catalog
+(``ShoppingCart.products``): every catalog in the batch gets its own run
+of the price vector, so carts opened before and after a catalog reload
+keep the prices they were opened with. Build the batch once with
+``CartBatch.from_carts`` and reprice it for every promotion change;
+results are in integer cents and identical to the scalar strategies.
+"""
+from array import array
+
+import numpy as np
+
+from cart import (BuyOneGetOneFreeStrategy, BuyXGetYFreeStrategy,
+                  PercentageDiscountStrategy)
+from money import percentage_batch
+
+
+class CartBatch:
+    def __init__(self, product_names, prices_cents, cart_positions, product_indices, quantities, cart_count):
+        self.product_names = product_names
+        self.prices_cents = np.asarray(prices_cents, dtype=np.int64)
+        self.cart_positions = np.asarray(cart_positions, dtype=np.int64)
+        self.product_indices = np.asarray(product_indices, dtype=np.int64)
+        self.quantities = np.asarray(quantities, dtype=np.int64)
+        self.cart_count = cart_count
+        self._line_prices = self.prices_cents[self.product_indices]
+
+    @classmethod
+    def from_carts(cls, carts, products=None):
+        """
+        Lay out ``carts`` column-wise. Prices come from each cart's own
+        catalog, or from ``products`` for every cart when given; a cart
+        line missing from ``products`` raises ValueError.
+        """
+        product_names = []
+        prices_cents = array("q")
+        # id(catalog) -> (catalog, index of each product name in the price vector)
+        catalogs = {}
+
+        def layout(catalog):
+            entry = catalogs.get(id(catalog))
+            if entry is None:
+                names = list(catalog)
+                index_of = {name: len(product_names) + index for index, name in enumerate(names)}
+                product_names.extend(names)
+                prices_cents.extend(catalog[name].price_cents for name in names)
+                entry = catalogs[id(catalog)] = (catalog, index_of)
+            return entry[1]
+
+        cart_positions = array("q")
+        product_indices = array("q")
+        quantities = array("q")
+        for position, shopping_cart in enumerate(carts):
+            index_of = layout(shopping_cart.products if products is None else products)
+            for product, quantity in shopping_cart.lines():
+                try:
+                    product_indices.append(index_of[product.name])
+                except KeyError:
+                    raise ValueError(f"{product.name} is not in the batch's catalog.") from None
+                cart_positions.append(position)
+                quantities.append(quantity)
+        return cls(product_names, prices_cents, cart_positions, product_indices, quantities, len(carts))
+
+    def _sum_per_cart(self, line_cents):
+        totals = np.zeros(self.cart_count, dtype=np.int64)
+        np.add.at(totals, self.cart_positions, line_cents)
+        return totals
+
+    def totals(self):
+        """Undiscounted total of every cart, in cents."""
+        return self._sum_per_cart(self._line_prices * self.quantities)
+
+    def item_counts(self):
+        return self._sum_per_cart(self.quantities)
+
+    def percentage(self, percentage_discount):
+        if percentage_discount < 0 or percentage_discount > 100:
+            raise ValueError("Discount percentage must be between 0 and 100.")
+        totals = self.totals()
+        return totals - percentage_batch(totals, percentage_discount)
+
+    def buy_x_get_y(self, x=1, y=1):
+        payable = self.quantities - self.quantities // (x + y)
+        return self._sum_per_cart(self._line_prices * payable)
+
+    def bogo(self):
+        return self.buy_x_get_y(1, 1)
+
+    def price(self, discount_strategy=None, discount_value=0):
+        """Per-cart price in cents for one of the scalar discount strategies."""
+        if discount_strategy is None:
+            return self.totals()
+        if isinstance(discount_strategy, PercentageDiscountStrategy):
+            return self.percentage(discount_value)
+        if isinstance(discount_strategy, BuyOneGetOneFreeStrategy):
+            return self.bogo()
+        if isinstance(discount_strategy, BuyXGetYFreeStrategy):
+            return self.buy_x_get_y(discount_strategy.x, discount_strategy.y)
+        raise TypeError(f"{type(discount_strategy).__name__} is not supported in batch pricing.")
+
+    def final_prices(self, discount_strategy=None, discount_value=0):
+        """Per-cart prices as floats, the same values ``final_price_after_discount`` returns."""
+        return (self.price(discount_strategy, discount_value) / 100).tolist()
@@ -0,0 +1,380 @@
+"""
+Benchmarks for the shopping cart.
+
+Run from this folder, e.g. ``python benchmarks.py tracing --operations 1000000``.
+"""
+import argparse
+import logging
+import random
+import time
+from array import array
+from decimal import Decimal
+
+from cart import (BuyOneGetOneFreeStrategy, BuyXGetYFreeStrategy, CompactShoppingCart, DiscountPipeline,
+                  FixedAmountDiscountStrategy, PercentageDiscountStrategy, Product,
+                  ShoppingCart, configure_tracing, logger)
+from catalog import ProductCatalog, get_catalog, load_catalog, set_catalog
+from money import Money, np, percentage_batch, sum_line_totals
+
+
+def _timed(label, operations, func):
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    print(f"{label:<40} {elapsed:8.3f}s {operations / elapsed:14,.0f} ops/s")
+    return elapsed
+
+
+def _cart_workload(operations):
+    shopping_cart = ShoppingCart()
+    names = ("apple", "banana", "guava")
+    for i in range(operations // 3):
+        name = names[i % 3]
+        shopping_cart.add_product(name, 2)
+        shopping_cart.remove_product(name, 1)
+        shopping_cart.total_price()
+
+
+def _unguarded_workload(operations):
+    # What every hot-path call used to pay: build the f-string, then let
+    # logger.debug discard it.
+    shopping_cart = ShoppingCart()
+    names = ("apple", "banana", "guava")
+    for i in range(operations // 3):
+        name = names[i % 3]
+        shopping_cart.add_product(name, 2)
+        logger.debug(f"Updated {name} quantity to {shopping_cart.items[name]['quantity']}.")
+        shopping_cart.remove_product(name, 1)
+        logger.debug(f"Reduced {name} quantity to {shopping_cart.items[name]['quantity']}.")
+        total = shopping_cart.total_price()
+        logger.debug(f"Total price calculated: {total}")
+
+
+def bench_tracing(operations):
+    root = logging.getLogger()
+    handlers = root.handlers[:]
+    root.handlers = [logging.NullHandler()]
+    try:
+        configure_tracing(enabled=False)
+        baseline = _timed("tracing off, unguarded f-strings", operations,
+                          lambda: _unguarded_workload(operations))
+        guarded = _timed("tracing off, guarded", operations,
+                         lambda: _cart_workload(operations))
+        configure_tracing(enabled=True, sample_every=1000)
+        _timed("tracing on, 1/1000 sampled", operations,
+               lambda: _cart_workload(operations))
+        configure_tracing(enabled=True, sample_every=1)
+        _timed("tracing on, every event", operations,
+               lambda: _cart_workload(operations))
+        print(f"speed-up with tracing off: {baseline / guarded:.2f}x")
+    finally:
+        root.handlers = handlers
+        configure_tracing(enabled=True, sample_every=1)
+
+
+def bench_money(operations):
+    rng = random.Random(42)
+    cents = [rng.randrange(1, 100_000) for _ in range(operations)]
+    quantities = [rng.randrange(1, 20) for _ in range(operations)]
+    floats = [c / 100 for c in cents]
+    decimals = [Decimal(c).scaleb(-2) for c in cents]
+    moneys = [Money(c) for c in cents]
+
+    def float_loop():
+        total = 0.0
+        for price, quantity in zip(floats, quantities):
+            total += price * quantity * 0.9
+
+    def decimal_loop():
+        total = Decimal(0)
+        rate = Decimal("0.9")
+        for price, quantity in zip(decimals, quantities):
+            total += (price * quantity * rate).quantize(Decimal("0.01"))
+
+    def money_loop():
+        total = Money(0)
+        for price, quantity in zip(moneys, quantities):
+            line = price * quantity
+            total += line - line.percentage(10)
+
+    def cents_batch():
+        lines = array("q", map(int.__mul__, cents, quantities))
+        sum(lines) - sum(percentage_batch(lines, 10))
+
+    _timed("float (inexact)", operations, float_loop)
+    _timed("Decimal, quantized per line", operations, decimal_loop)
+    _timed("Money objects", operations, money_loop)
+    _timed("integer cents, batch helpers", operations, cents_batch)
+    if np is not None:
+        np_cents = np.array(cents, dtype=np.int64)
+        np_quantities = np.array(quantities, dtype=np.int64)
+
+        def numpy_batch():
+            lines = np_cents * np_quantities
+            int(lines.sum()) - int(percentage_batch(lines, 10).sum())
+
+        _timed("integer cents, NumPy batch", operations, numpy_batch)
+    _timed("sum_line_totals", operations, lambda: sum_line_totals(cents, quantities))
+
+
+def _large_catalog(size, rng):
+    return ProductCatalog(Product(f"product-{i}", rng.randrange(10, 10_000) / 100, sku=f"SKU{i:08d}")
+                          for i in range(size))
+
+
+def _large_cart(lines, rng):
+    shopping_cart = ShoppingCart(_large_catalog(lines, rng))
+    for name in shopping_cart.products:
+        shopping_cart.add_product(name, rng.randrange(1, 12))
+    return shopping_cart
+
+
+def bench_pipeline(operations, lines=1000, promotions=100):
+    rng = random.Random(7)
+    configure_tracing(enabled=False)
+    shopping_cart = _large_cart(lines, rng)
+    names = list(shopping_cart.products)
+    pipeline = DiscountPipeline()
+    for i in range(promotions):
+        kind = i % 4
+        targets = rng.sample(names, rng.randrange(10, 100)) if i % 10 else None
+        if kind == 0:
+            pipeline.add(PercentageDiscountStrategy(), rng.choice((5, 10, 15)), products=targets)
+        elif kind == 1:
+            pipeline.add(BuyOneGetOneFreeStrategy(), products=targets)
+        elif kind == 2:
+            pipeline.add(BuyXGetYFreeStrategy(x=rng.randrange(2, 5), y=1), products=targets)
+        else:
+            pipeline.add(FixedAmountDiscountStrategy(), rng.randrange(1, 20))
+
+    def strategy_by_strategy():
+        # Reference: each of the promotions prices the whole cart on its own,
+        # one after another, as without a pipeline
+        for _ in range(repeats):
+            for strategy, value, _ in pipeline.rules:
+                strategy.apply_discount(shopping_cart, value)
+
+    repeats = max(1, operations // (lines * promotions))
+    _timed("compile plan", promotions, pipeline.compile)
+    _timed(f"{promotions} strategies one by one x{repeats}", repeats * lines * promotions, strategy_by_strategy)
+    _timed(f"compiled pipeline x{repeats}", repeats * lines * promotions,
+           lambda: [pipeline.apply_discount(shopping_cart) for _ in range(repeats)])
+    configure_tracing(enabled=True)
+
+
+def bench_batch(operations, lines_per_cart=3):
+    from batch_pricing import CartBatch
+
+    rng = random.Random(11)
+    configure_tracing(enabled=False)
+    carts = []
+    for _ in range(operations):
+        shopping_cart = ShoppingCart()
+        for name in ("apple", "banana", "guava")[:lines_per_cart]:
+            shopping_cart.add_product(name, rng.randrange(1, 30))
+        carts.append(shopping_cart)
+    strategy = BuyXGetYFreeStrategy(x=2, y=1)
+    batches = []
+    _timed("lay out batch", operations, lambda: batches.append(CartBatch.from_carts(carts)))
+    batch = batches[0]
+    _timed("scalar Buy X Get Y per cart", operations,
+           lambda: [c.final_price_after_discount(strategy) for c in carts])
+    _timed("batch Buy X Get Y", operations, lambda: batch.final_prices(strategy))
+    _timed("scalar 10% per cart", operations,
+           lambda: [c.final_price_after_discount(PercentageDiscountStrategy(), 10) for c in carts])
+    _timed("batch 10%", operations, lambda: batch.final_prices(PercentageDiscountStrategy(), 10))
+    configure_tracing(enabled=True)
+
+
+def bench_catalog(operations):
+    import csv
+    import os
+    import tempfile
+
+    rng = random.Random(5)
+    configure_tracing(enabled=False)
+    previous = get_catalog()
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "catalog.csv")
+        with open(path, "w", newline="") as handle:
+            writer = csv.writer(handle)
+            writer.writerow(["sku", "name", "price"])
+            for i in range(operations):
+                writer.writerow([f"SKU{i:08d}", f"product-{i}", rng.randrange(10, 10_000) / 100])
+        loaded = []
+        _timed("load CSV catalog", operations, lambda: loaded.append(load_catalog(path)))
+    catalog = loaded[0]
+    names = [f"product-{rng.randrange(operations)}" for _ in range(operations)]
+    skus = [f"SKU{rng.randrange(operations):08d}" for _ in range(operations)]
+    _timed("lookup by name", operations, lambda: [catalog[name] for name in names])
+    _timed("lookup by SKU", operations, lambda: [catalog.by_sku(sku) for sku in skus])
+    _timed("create carts on shared catalog", operations,
+           lambda: [ShoppingCart(catalog) for _ in range(operations)])
+    set_catalog(previous)
+    configure_tracing(enabled=True)
+
+
+def bench_compact(operations, lines=1000):
+    import tracemalloc
+
+    rng = random.Random(13)
+    configure_tracing(enabled=False)
+    catalog = _large_catalog(lines, rng)
+    names = list(catalog)
+    sessions = max(1, operations // lines)
+    strategy = BuyOneGetOneFreeStrategy()
+    for cart_class in (ShoppingCart, CompactShoppingCart):
+        tracemalloc.start()
+        carts = []
+
+        def fill():
+            for _ in range(sessions):
+                shopping_cart = cart_class(catalog)
+                for name in names:
+                    shopping_cart.add_product(name, 3)
+                carts.append(shopping_cart)
+
+        label = cart_class.__name__
+        _timed(f"{label}: add {sessions} x {lines} lines", sessions * lines, fill)
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"{label}: {current / (sessions * lines):.1f} bytes per line")
+        _timed(f"{label}: BOGO over all carts", sessions * lines,
+               lambda: [strategy.apply_discount(c) for c in carts])
+        _timed(f"{label}: remove every line", sessions * lines,
+               lambda: [c.remove_product(name, 3) for c in carts for name in names])
+    configure_tracing(enabled=True)
+
+
+def bench_store(operations, sessions=100_000):
+    import threading
+
+    from store import CartStore
+
+    configure_tracing(enabled=False)
+    for threads in (1, 2, 4, 8, 16):
+        store = CartStore(shards=256)
+        per_thread = operations // threads
+
+        def worker(seed):
+            rng = random.Random(seed)
+            for _ in range(per_thread):
+                store.add(rng.randrange(sessions), "apple")
+
+        def run():
+            pool = [threading.Thread(target=worker, args=(seed,)) for seed in range(threads)]
+            for thread in pool:
+                thread.start()
+            for thread in pool:
+                thread.join()
+
+        _timed(f"{threads:>2} threads", per_thread * threads, run)
+        added = sum(store.get(session_id).total_number_of_items()
+                    for session_id in range(sessions) if session_id in store)
+        assert added == per_thread * threads, "lost updates"
+    configure_tracing(enabled=True)
+
+
+def bench_serialization(operations):
+    import pickle
+
+    from serialization import cart_from_json, cart_to_json, dumps_cart, loads_cart
+
+    rng = random.Random(17)
+    configure_tracing(enabled=False)
+    carts = []
+    for _ in range(operations):
+        shopping_cart = ShoppingCart()
+        for name in rng.sample(["apple", "banana", "guava"], rng.randrange(1, 4)):
+            shopping_cart.add_product(name, rng.randrange(1, 30))
+        carts.append(shopping_cart)
+    # A dict of bytes stands in for a Redis-like key/value store.
+    store = {}
+    _timed("pickle.dumps", operations, lambda: [pickle.dumps(c) for c in carts])
+    _timed("binary dumps", operations, lambda: store.update((i, dumps_cart(c)) for i, c in enumerate(carts)))
+    pickled = [pickle.dumps(c) for c in carts]
+    _timed("pickle.loads", operations, lambda: [pickle.loads(p) for p in pickled])
+    _timed("binary loads", operations, lambda: [loads_cart(store[i]) for i in range(operations)])
+    _timed("binary loads, compact carts", operations,
+           lambda: [loads_cart(store[i], cart_class=CompactShoppingCart) for i in range(operations)])
+    documents = [cart_to_json(c) for c in carts]
+    _timed("JSON loads", operations, lambda: [cart_from_json(d) for d in documents])
+    print(f"average size: binary {sum(map(len, store.values())) / operations:.0f} B, "
+          f"pickle {sum(map(len, pickled)) / operations:.0f} B")
+    configure_tracing(enabled=True)
+
+
+def bench_memo(operations, lines=1000, edits_every=50):
+    from cart import discount_cache_stats
+
+    rng = random.Random(19)
+    configure_tracing(enabled=False)
+    strategy = BuyXGetYFreeStrategy(x=2, y=1)
+    for cache_size in (0, 32):
+        shopping_cart = _large_cart(lines, rng)
+        shopping_cart.discount_cache_size = cache_size
+        names = list(shopping_cart.products)
+
+        def poll():
+            for i in range(operations):
+                if i % edits_every == 0:
+                    shopping_cart.add_product(rng.choice(names))
+                shopping_cart.final_price_after_discount(strategy)
+
+        _timed(f"poll, one edit per {edits_every}, cache={cache_size}", operations, poll)
+    print(f"hit rate: {discount_cache_stats()['hit_rate']:.1%}")
+    configure_tracing(enabled=True)
+
+
+def bench_tiers(operations, tiers=5000, lines=10_000):
+    from cart import QuantityBreakDiscountStrategy, SpendTieredDiscountStrategy
+
+    rng = random.Random(23)
+    configure_tracing(enabled=False)
+    shopping_cart = _large_cart(lines, rng)
+    spend = SpendTieredDiscountStrategy((step * 10, min(50, step / 100)) for step in range(1, tiers + 1))
+    breaks = QuantityBreakDiscountStrategy(
+        tiers=[(q, min(30, q)) for q in range(2, 12)],
+        product_tiers={name: [(q, min(40, q / 2)) for q in range(1, tiers // 100)]
+                       for name in list(shopping_cart.products)[::2]},
+    )
+    values = [rng.randrange(0, tiers * 1000) for _ in range(operations)]
+
+    def linear_lookup():
+        thresholds, percentages = spend.thresholds, spend.percentages
+        for value in values[:max(1, operations // 100)]:
+            chosen = 0
+            for threshold, percentage in zip(thresholds, percentages):
+                if threshold > value:
+                    break
+                chosen = percentage
+
+    _timed(f"linear scan of {tiers} tiers (1/100 sample)", max(1, operations // 100), linear_lookup)
+    _timed(f"bisect over {tiers} tiers", operations, lambda: [spend.percentage_for(v) for v in values])
+    repeats = max(1, operations // lines)
+    shopping_cart.discount_cache_size = 0
+    _timed(f"quantity breaks, {lines}-line cart x{repeats}", repeats * lines,
+           lambda: [breaks.apply_discount(shopping_cart) for _ in range(repeats)])
+    configure_tracing(enabled=True)
+
+
+BENCHMARKS = {
+    "tracing": bench_tracing,
+    "money": bench_money,
+    "pipeline": bench_pipeline,
+    "batch": bench_batch,
+    "catalog": bench_catalog,
+    "compact": bench_compact,
+    "store": bench_store,
+    "serialization": bench_serialization,
+    "memo": bench_memo,
+    "tiers": bench_tiers,
+}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("benchmark", choices=sorted(BENCHMARKS))
+    parser.add_argument("--operations", type=int, default=1_000_000)
+    args = parser.parse_args()
+    BENCHMARKS[args.benchmark](args.operations)
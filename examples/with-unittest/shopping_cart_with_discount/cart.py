@@ -1,6 +1,16 @@
 from abc import abstractmethod, ABC
+import copy
+from array import array
+from bisect import bisect_right
+from collections import OrderedDict
+from collections.abc import Mapping
 import logging
 
+from fractions import Fraction
+
+from catalog import Product, get_catalog
+from money import Money, scale_cents, to_cents
+
 logging.basicConfig(
     format='%(asctime)s - %(levelname)s - %(message)s',
     datefmt='%Y-%m-%d %H:%M:%S',
@@ -14,6 +24,44 @@ logging.basicConfig(
 
 logger = logging.getLogger(__name__)
 
+
+class CartTracer:
+    """
+    Structured, sampled debug tracing for the cart hot paths.
+
+    Call sites guard with ``if tracer.enabled and tracer.sampled():`` so that no
+    message is formatted when tracing is off. Events are logged lazily with
+    %-style arguments and the fields are attached as ``record.trace``.
+    """
+
+    def __init__(self, logger, sample_every=1):
+        self.logger = logger
+        self.sample_every = sample_every
+        self._counter = 0
+
+    @property
+    def enabled(self):
+        return self.logger.isEnabledFor(logging.DEBUG)
+
+    def sampled(self):
+        if self.sample_every <= 1:
+            return True
+        self._counter += 1
+        return self._counter % self.sample_every == 0
+
+    def event(self, event, **fields):
+        self.logger.debug("%s %s", event, fields, extra={"trace": {"event": event, **fields}})
+
+
+tracer = CartTracer(logger)
+
+
+def configure_tracing(enabled=True, sample_every=1):
+    """Switch cart debug tracing on or off and keep one event in every ``sample_every``."""
+    logger.setLevel(logging.DEBUG if enabled else logging.INFO)
+    tracer.sample_every = max(1, int(sample_every))
+    tracer._counter = 0
+
 class DiscountStrategy(ABC):
     @abstractmethod
     def apply_discount(self, cart, percentage_discount = 0):
@@ -23,41 +71,99 @@ class DiscountStrategy(ABC):
     def remove_discount(self, cart, percentage_discount = 0):
         pass
 
+    def cache_key(self, discount_value=0):
+        """
+        Hashable identity of this strategy's parameters and ``discount_value``,
+        or None if the result must not be memoized.
+        """
+        parameters = tuple(sorted((name, value) for name, value in vars(self).items() if name != 'cart'))
+        key = (type(self), parameters, discount_value)
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
+
+_MISSING = object()
+_cache_totals = {"hits": 0, "misses": 0, "evictions": 0}
+
+
+def discount_cache_stats():
+    """Process-wide discount cache counters across all carts, with the hit rate."""
+    lookups = _cache_totals["hits"] + _cache_totals["misses"]
+    return dict(_cache_totals, hit_rate=_cache_totals["hits"] / lookups if lookups else 0.0)
+
+
+class DiscountCache:
+    """
+    Bounded LRU of discount results for one cart.
+
+    Entries are only valid for the cart version they were computed at; the
+    whole cache is dropped as soon as a lookup sees a newer version.
+    """
+    def __init__(self, maxsize=32):
+        self.maxsize = maxsize
+        self.version = None
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, version, key):
+        if version != self.version:
+            self.entries.clear()
+            self.version = version
+        result = self.entries.get(key, _MISSING)
+        if result is _MISSING:
+            self.misses += 1
+            _cache_totals["misses"] += 1
+        else:
+            self.entries.move_to_end(key)
+            self.hits += 1
+            _cache_totals["hits"] += 1
+        return result
+
+    def put(self, key, result):
+        self.entries[key] = result
+        if len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+            _cache_totals["evictions"] += 1
+
+    def info(self):
+        lookups = self.hits + self.misses
+        return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                "size": len(self.entries), "maxsize": self.maxsize,
+                "hit_rate": self.hits / lookups if lookups else 0.0}
+
 class PercentageDiscountStrategy(DiscountStrategy):
     def __init__(self, cart=None):
         self.cart = cart
 
 
     def apply_discount(self, cart, percentage_discount=0):
-        if percentage_discount < 0 or percentage_discount > 100:
-            raise ValueError("Discount percentage must be between 0 and 100.")
-        total_price = cart.total_price()
-        discount_amount = total_price * (percentage_discount / 100)
-        final_price = total_price - discount_amount
-        return final_price
+        final_price = cart.subtotal().apply_percentage_discount(percentage_discount)
+        return float(final_price)
     
     def remove_discount(self, cart, percentage_discount=0):
-        # final_price = cart.total_price() 
-        # Since removing discount means going back to original price
-        # removing discount means final_price = 90 * (100 / 90)
-        # which is 100 * 1 = 100 (approximately original price)
-        total_price = cart.total_price()
-        final_price = total_price * (100 / ( 100 - percentage_discount))
-        return final_price
+        # Removing the discount means going back to the original price,
+        # e.g. 90 * 100 / (100 - 10) = 100, computed exactly in cents.
+        # A 100% discount cannot be reversed and raises ValueError.
+        final_price = cart.subtotal().remove_percentage_discount(percentage_discount)
+        return float(final_price)
     
 class BuyOneGetOneFreeStrategy(DiscountStrategy):
     def __init__(self, cart=None):
         self.cart = cart
 
-    def apply_discount(self, cart):
+    def apply_discount(self, cart, discount_value=0):
         # Implementation for BOGO discount
-        total_price = 0
-        for item in cart.items.values():
-            quantity = item['quantity']
+        total_cents = 0
+        for product, quantity in cart.lines():
             free_items = quantity // 2
-            total_price_per_item = item['product'].price * (quantity - free_items)
-            total_price += total_price_per_item
-        return total_price
+            total_cents += product.price_cents * (quantity - free_items)
+        return float(Money(total_cents))
 
         
 
@@ -71,16 +177,14 @@ class BuyXGetYFreeStrategy(DiscountStrategy):
         self.x = x
         self.y = y
     
-    def apply_discount(self, cart):
+    def apply_discount(self, cart, discount_value=0):
         """Implementation for Buy X Get Y Free discount"""
 
-        total_price = 0
-        for item in cart.items.values():
-            quantity = item['quantity']
+        total_cents = 0
+        for product, quantity in cart.lines():
             free_items = quantity // (self.x + self.y)
-            total_price_per_item = item['product'].price * (quantity - free_items)
-            total_price += total_price_per_item
-        return total_price
+            total_cents += product.price_cents * (quantity - free_items)
+        return float(Money(total_cents))
     
     def remove_discount(self, cart = None):
         return self.cart.total_price() if cart else 0
@@ -94,82 +198,414 @@ class FixedAmountDiscountStrategy(DiscountStrategy):
 
     def apply_discount(self, cart, amount=0):
         # Implementation for fixed amount discount
-        total_price = cart.total_price()
+        total_price = cart.subtotal()
+        discount = Money.from_amount(amount)
         if amount < 0:
             raise ValueError("Discount amount must be non-negative.")
-        elif total_price < amount:
+        elif total_price < discount:
             raise ValueError("Discount amount cannot exceed total price.")
-        elif (cart.total_number_of_items()) > self.NUMBER_OF_ITEMS and total_price > amount:
-            logger.debug(f"Applying fixed amount discount of {amount} for more than {self.NUMBER_OF_ITEMS} items.")
-            final_price = total_price - amount
-            return final_price
-        return total_price        
+        elif (cart.total_number_of_items()) > self.NUMBER_OF_ITEMS and total_price > discount:
+            if tracer.enabled and tracer.sampled():
+                tracer.event("discount.fixed.apply", amount=amount, threshold=self.NUMBER_OF_ITEMS)
+            final_price = total_price - discount
+            return float(final_price)
+        return float(total_price)        
 
 
     def remove_discount(self, cart, amount=0):
         # Implementation to remove fixed amount discount
-        total_price = cart.total_price()
+        total_price = cart.subtotal()
+        discount = Money.from_amount(amount)
         if amount < 0:
             raise ValueError("Discount amount must be non-negative.")
-        elif total_price < amount:
+        elif total_price < discount:
             raise ValueError("Discount amount cannot exceed total price.")
-        elif (cart.total_number_of_items()) > self.NUMBER_OF_ITEMS and total_price > amount:
-            logger.debug(f"Applying fixed amount discount of {amount} for more than {self.NUMBER_OF_ITEMS} items.")
-            final_price = total_price + amount
-            return final_price
-        return total_price
-
-class Product:
-    def __init__(self, name, price):
-        self.name = name
-        self.price = price
-        logger.debug(f"Created product: {self.name} with price {self.price}")
+        elif (cart.total_number_of_items()) > self.NUMBER_OF_ITEMS and total_price > discount:
+            if tracer.enabled and tracer.sampled():
+                tracer.event("discount.fixed.remove", amount=amount, threshold=self.NUMBER_OF_ITEMS)
+            final_price = total_price + discount
+            return float(final_price)
+        return float(total_price)
+
+def _sorted_tiers(tiers, to_threshold=int):
+    """Validate ``(threshold, percentage)`` pairs into parallel sorted arrays."""
+    thresholds = array('q')
+    percentages = []
+    for threshold, percentage in sorted((to_threshold(t), p) for t, p in tiers):
+        if threshold < 0:
+            raise ValueError("Tier thresholds must be non-negative.")
+        if percentage < 0 or percentage > 100:
+            raise ValueError("Discount percentage must be between 0 and 100.")
+        if thresholds and thresholds[-1] == threshold:
+            raise ValueError(f"Duplicate tier threshold: {threshold}")
+        thresholds.append(threshold)
+        percentages.append(percentage)
+    return thresholds, tuple(percentages)
+
+
+class TieredDiscountStrategy(DiscountStrategy):
+    """
+    Docstring for TieredDiscountStrategy
+
+    Base for discounts picked from a list of ``(threshold, percentage)``
+    tiers. Tiers are kept as sorted parallel arrays and the tier for a value
+    is the highest threshold not above it, found with ``bisect``.
+    """
+    def __init__(self, tiers=(), cart=None):
+        self.cart = cart
+        self.thresholds, self.percentages = _sorted_tiers(tiers, self.to_threshold)
+
+    @staticmethod
+    def to_threshold(threshold):
+        return int(threshold)
+
+    def percentage_for(self, value):
+        index = bisect_right(self.thresholds, value) - 1
+        return self.percentages[index] if index >= 0 else 0
+
+    def remove_discount(self, cart, discount_value=0):
+        return cart.total_price()
+
+    def cache_key(self, discount_value=0):
+        return (type(self), tuple(self.thresholds), self.percentages, discount_value)
+
+class SpendTieredDiscountStrategy(TieredDiscountStrategy):
+    """
+    Percentage off the whole cart picked by its subtotal, e.g.
+    ``SpendTieredDiscountStrategy([(100, 5), (500, 10)])`` is 5% from 100 and
+    10% from 500.
+    """
+    to_threshold = staticmethod(to_cents)
+
+    def apply_discount(self, cart, discount_value=0):
+        subtotal = cart.subtotal()
+        return float(subtotal.apply_percentage_discount(self.percentage_for(subtotal.cents)))
+
+class QuantityBreakDiscountStrategy(TieredDiscountStrategy):
+    """
+    Percentage off each line picked by the line's quantity. ``tiers`` apply
+    to every product; ``product_tiers`` maps a product name to its own
+    quantity breaks, which replace the shared ones for that product.
+    """
+    def __init__(self, tiers=(), product_tiers=None, cart=None):
+        super().__init__(tiers, cart)
+        self.product_tiers = {name: _sorted_tiers(breaks) for name, breaks in (product_tiers or {}).items()}
+
+    def apply_discount(self, cart, discount_value=0):
+        default = (self.thresholds, self.percentages)
+        get_tiers = self.product_tiers.get
+        total_cents = 0
+        for product, quantity in cart.lines():
+            thresholds, percentages = get_tiers(product.name, default)
+            line_cents = product.price_cents * quantity
+            index = bisect_right(thresholds, quantity) - 1
+            if index >= 0 and percentages[index]:
+                line_cents -= Money(line_cents).percentage(percentages[index]).cents
+            total_cents += line_cents
+        return float(Money(total_cents))
+
+    def cache_key(self, discount_value=0):
+        product_tiers = tuple(sorted((name, tuple(thresholds), percentages)
+                                     for name, (thresholds, percentages) in self.product_tiers.items()))
+        return super().cache_key(discount_value) + (product_tiers,)
+
+class DiscountPipeline(DiscountStrategy):
+    """
+    Docstring for DiscountPipeline
+
+    Chains several discount strategies and prices a cart in one pass over its
+    items. Rules are added with ``add`` and compiled once into a per-product
+    plan of ``(group_size, numerator, denominator)``:
+
+    - quantity promotions (BOGO, Buy X Get Y) on a line do not stack, the one
+      giving the most free items wins, which is the smallest ``x + y`` group
+    - percentage discounts compound on the line's payable amount
+    - fixed amount discounts are applied to the cart total afterwards, with
+      the same item threshold as ``FixedAmountDiscountStrategy``, and raise
+      ValueError like it does when the amount exceeds the total so far
+
+    Rules with ``products=None`` apply to every product. ``add`` keeps a
+    copy of the strategy, so changing the strategy afterwards does not
+    change the pipeline or its compiled plan.
+    """
+    def __init__(self, cart=None):
+        self.cart = cart
+        self.rules = []
+        self._plan = None
+
+    def add(self, strategy, discount_value=0, products=None):
+        if not isinstance(strategy, (PercentageDiscountStrategy, BuyOneGetOneFreeStrategy,
+                                     BuyXGetYFreeStrategy, FixedAmountDiscountStrategy)):
+            raise TypeError(f"{type(strategy).__name__} cannot be added to a discount pipeline.")
+        if isinstance(strategy, PercentageDiscountStrategy) and not 0 <= discount_value <= 100:
+            raise ValueError("Discount percentage must be between 0 and 100.")
+        if isinstance(strategy, FixedAmountDiscountStrategy) and discount_value < 0:
+            raise ValueError("Discount amount must be non-negative.")
+        # A copy, so the compiled plan cannot go stale under the caller's changes
+        self.rules.append((copy.copy(strategy), discount_value, None if products is None else frozenset(products)))
+        self._plan = None
+        return self
+
+    def compile(self):
+        default = [0, Fraction(1)]
+        targeted = {}
+        fixed_amounts = []
+        for strategy, discount_value, products in self.rules:
+            if isinstance(strategy, FixedAmountDiscountStrategy):
+                fixed_amounts.append((to_cents(discount_value), strategy.NUMBER_OF_ITEMS))
+                continue
+            if products is None:
+                entries = [default] + list(targeted.values())
+            else:
+                entries = [targeted.setdefault(name, list(default)) for name in products]
+            for entry in entries:
+                if isinstance(strategy, PercentageDiscountStrategy):
+                    entry[1] *= 1 - Fraction(str(discount_value)) / 100
+                else:
+                    group = 2 if isinstance(strategy, BuyOneGetOneFreeStrategy) else strategy.x + strategy.y
+                    entry[0] = group if entry[0] == 0 else min(entry[0], group)
+        def to_plan(entry):
+            return entry[0], entry[1].numerator, entry[1].denominator
+        self._plan = ({name: to_plan(entry) for name, entry in targeted.items()},
+                      to_plan(default), fixed_amounts)
+        return self._plan
+
+    def apply_discount(self, cart, discount_value=0):
+        line_plans, default, fixed_amounts = self._plan or self.compile()
+        get_plan = line_plans.get
+        total_cents = 0
+        for product, quantity in cart.lines():
+            group, numerator, denominator = get_plan(product.name, default)
+            if group:
+                quantity -= quantity // group
+            line_cents = product.price_cents * quantity
+            if numerator != denominator:
+                line_cents = scale_cents(line_cents, numerator, denominator)
+            total_cents += line_cents
+        item_count = cart.total_number_of_items()
+        for amount_cents, threshold in fixed_amounts:
+            if total_cents < amount_cents:
+                raise ValueError("Discount amount cannot exceed total price.")
+            if item_count > threshold and total_cents > amount_cents:
+                total_cents -= amount_cents
+        return float(Money(total_cents))
+
+    def remove_discount(self, cart, discount_value=0):
+        return cart.total_price()
+
+    def cache_key(self, discount_value=0):
+        rules = []
+        for strategy, value, products in self.rules:
+            key = strategy.cache_key(value)
+            if key is None:
+                return None
+            rules.append((key, products))
+        return (type(self), tuple(rules), discount_value)
 
 class ShoppingCart:
-    def __init__(self):
+    """
+    Docstring for ShoppingCart
+
+    ``add_product``/``remove_product`` keep a running subtotal in integer cents
+    and a running item count, so ``total_price`` and ``total_number_of_items``
+    are O(1). Change ``items`` through those methods only.
+
+    ``products`` is the shared catalog the cart was created with (the current
+    process-wide one by default); lines reference its ``Product`` records.
+
+    ``version`` goes up on every change, and ``final_price_after_discount``
+    memoizes its result per strategy parameters for the current version in
+    a small LRU (``discount_cache_size`` entries, 0 disables it).
+    """
+    discount_cache_size = 32
+
+    def __init__(self, catalog=None):
         self.items = {}
-        self.products = {
-            "apple": Product(**{"price": 1.0, "name": "apple"}),
-            "banana": Product(**{"price": 0.5, "name": "banana"}),
-            "guava": Product(**{"price": 2.5, "name": "guava"}),
-        }
-        logger.debug("Initialized an empty shopping cart.")
+        self.version = 0
+        self._discount_cache = None
+        self._subtotal_cents = 0
+        self._item_count = 0
+        self.products = get_catalog() if catalog is None else catalog
+        if tracer.enabled and tracer.sampled():
+            tracer.event("cart.created")
 
 
     def add_product(self, product_name, quantity=1):
         if product_name in self.items:
-            self.items[product_name]['quantity'] += quantity
-            logger.debug(f"Updated {product_name} quantity to {self.items[product_name]['quantity']}.")
+            item = self.items[product_name]
+            item['quantity'] += quantity
+            self.version += 1
+            self._subtotal_cents += item['product'].price_cents * quantity
+            self._item_count += quantity
+            if tracer.enabled and tracer.sampled():
+                tracer.event("cart.update", product=product_name, quantity=item['quantity'])
         else:
-            self.items[product_name] = {'product': self.products[product_name], 'quantity': quantity}
-            logger.debug(f"Added {product_name} to cart with quantity {quantity}.")
+            product = self.products[product_name]
+            self.items[product_name] = {'product': product, 'quantity': quantity}
+            self.version += 1
+            self._subtotal_cents += product.price_cents * quantity
+            self._item_count += quantity
+            if tracer.enabled and tracer.sampled():
+                tracer.event("cart.add", product=product_name, quantity=quantity)
 
     def remove_product(self, product_name, quantity=1):
         if product_name in self.items:
-            if self.items[product_name]['quantity'] > 1:
-                self.items[product_name]['quantity'] -= quantity
-                logger.debug(f"Reduced {product_name} quantity to {self.items[product_name]['quantity']}.")
+            item = self.items[product_name]
+            if item['quantity'] > quantity:
+                item['quantity'] -= quantity
+                self.version += 1
+                self._subtotal_cents -= item['product'].price_cents * quantity
+                self._item_count -= quantity
+                if tracer.enabled and tracer.sampled():
+                    tracer.event("cart.reduce", product=product_name, quantity=item['quantity'])
             else:
                 del self.items[product_name]
-                logger.debug(f"Removed {product_name} from cart.", self.items)
+                self.version += 1
+                self._subtotal_cents -= item['product'].price_cents * item['quantity']
+                self._item_count -= item['quantity']
+                if tracer.enabled and tracer.sampled():
+                    tracer.event("cart.remove", product=product_name)
 
         else:
-            logger.warning(f"Attempted to remove {product_name} which is not in the cart.")
+            logger.warning("Attempted to remove %s which is not in the cart.", product_name)
+
+    def lines(self):
+        """Iterate the cart as ``(product, quantity)`` pairs."""
+        return ((item['product'], item['quantity']) for item in self.items.values())
+
+    def subtotal(self):
+        return Money(self._subtotal_cents)
 
     def total_price(self):
-        total = sum(item['product'].price * item['quantity'] for item in self.items.values())
-        logger.debug(f"Total price calculated: {total}")
+        total = self._subtotal_cents / 100
+        if tracer.enabled and tracer.sampled():
+            tracer.event("cart.total", total=total)
         return total
     
     def final_price_after_discount(self, discount_strategy: DiscountStrategy, discount_value=0):
         if isinstance(discount_strategy, DiscountStrategy):
-            discounted_price = discount_strategy.apply_discount(self, discount_value)
-            logger.debug(f"Final price after applying discount: {discounted_price}")
+            key = discount_strategy.cache_key(discount_value) if self.discount_cache_size else None
+            if key is None:
+                discounted_price = discount_strategy.apply_discount(self, discount_value)
+            else:
+                if self._discount_cache is None:
+                    self._discount_cache = DiscountCache(self.discount_cache_size)
+                discounted_price = self._discount_cache.get(self.version, key)
+                if discounted_price is _MISSING:
+                    discounted_price = discount_strategy.apply_discount(self, discount_value)
+                    self._discount_cache.put(key, discounted_price)
+            if tracer.enabled and tracer.sampled():
+                tracer.event("cart.final_price", strategy=type(discount_strategy).__name__, price=discounted_price)
             return discounted_price
         return self.total_price()
     
     def total_number_of_items(self):
-        total = 0
-        for item in self.items.values():
-            total += item['quantity']
-        return total
+        return self._item_count
+
+    def discount_cache_info(self):
+        if self._discount_cache is None:
+            return DiscountCache(self.discount_cache_size).info()
+        return self._discount_cache.info()
+
+    def recompute_totals(self):
+        """Full O(n) recompute of the running totals, e.g. to audit them."""
+        subtotal_cents = 0
+        item_count = 0
+        for product, quantity in self.lines():
+            subtotal_cents += product.price_cents * quantity
+            item_count += quantity
+        return subtotal_cents, item_count
+
+
+class _CompactItems(Mapping):
+    """Read-only ``{name: {'product': ..., 'quantity': ...}}`` view of a CompactShoppingCart."""
+    def __init__(self, cart):
+        self._cart = cart
+
+    def __getitem__(self, product_name):
+        cart = self._cart
+        slot = cart._slots[cart.products.product_id(product_name)]
+        return {'product': cart.products.product(cart.product_ids[slot]), 'quantity': cart.quantities[slot]}
+
+    def __contains__(self, product_name):
+        return product_name in self._cart.products and self._cart.products.product_id(product_name) in self._cart._slots
+
+    def __iter__(self):
+        product = self._cart.products.product
+        return (product(product_id).name for product_id in self._cart.product_ids)
+
+    def __len__(self):
+        return len(self._cart.product_ids)
+
+
+class CompactShoppingCart(ShoppingCart):
+    """
+    Docstring for CompactShoppingCart
+
+    Same public API as ``ShoppingCart`` but the lines are stored in two
+    parallel ``array('i')`` columns of catalog product ids and quantities,
+    4 bytes each per line instead of a dict per line. ``items`` is a
+    read-only view built on demand; discounts iterate ``lines()``.
+
+    Removing a line moves the last line into its slot, so line order is not
+    preserved.
+    """
+    def __init__(self, catalog=None):
+        self.products = get_catalog() if catalog is None else catalog
+        self.product_ids = array('i')
+        self.quantities = array('i')
+        self._slots = {}
+        self.version = 0
+        self._discount_cache = None
+        self._subtotal_cents = 0
+        self._item_count = 0
+        if tracer.enabled and tracer.sampled():
+            tracer.event("cart.created")
+
+    @property
+    def items(self):
+        return _CompactItems(self)
+
+    def add_product(self, product_name, quantity=1):
+        product_id = self.products.product_id(product_name)
+        slot = self._slots.get(product_id)
+        if slot is None:
+            self._slots[product_id] = len(self.product_ids)
+            self.product_ids.append(product_id)
+            self.quantities.append(quantity)
+        else:
+            self.quantities[slot] += quantity
+        self.version += 1
+        self._subtotal_cents += self.products.product(product_id).price_cents * quantity
+        self._item_count += quantity
+        if tracer.enabled and tracer.sampled():
+            tracer.event("cart.add", product=product_name, quantity=quantity)
+
+    def remove_product(self, product_name, quantity=1):
+        slot = self._slots.get(self.products.product_id(product_name)) if product_name in self.products else None
+        if slot is None:
+            logger.warning("Attempted to remove %s which is not in the cart.", product_name)
+            return
+        price_cents = self.products.product(self.product_ids[slot]).price_cents
+        current = self.quantities[slot]
+        if current > quantity:
+            self.quantities[slot] = current - quantity
+            removed = quantity
+        else:
+            removed = current
+            last = len(self.product_ids) - 1
+            del self._slots[self.product_ids[slot]]
+            if slot != last:
+                self.product_ids[slot] = self.product_ids[last]
+                self.quantities[slot] = self.quantities[last]
+                self._slots[self.product_ids[slot]] = slot
+            self.product_ids.pop()
+            self.quantities.pop()
+        self.version += 1
+        self._subtotal_cents -= price_cents * removed
+        self._item_count -= removed
+        if tracer.enabled and tracer.sampled():
+            tracer.event("cart.remove", product=product_name, quantity=removed)
+
+    def lines(self):
+        return zip(map(self.products.product, self.product_ids), self.quantities)
@@ -0,0 +1,156 @@
+"""
+Shared, read-only product catalog.
+
+One ``ProductCatalog`` is current for the whole process (``get_catalog``).
+Carts keep a reference to the catalog they were created with, so a hot
+reload (``load_catalog``/``reload_catalog``) swaps in a new version for new
+carts without changing prices under carts that are already open.
+"""
+import csv
+import hashlib
+import json
+import logging
+import threading
+from collections.abc import Mapping
+from pathlib import Path
+
+from money import to_cents
+
+logger = logging.getLogger(__name__)
+
+
+class Product:
+    __slots__ = ("name", "price", "price_cents", "sku")
+
+    def __init__(self, name, price, sku=None):
+        self.name = name
+        self.price = price
+        self.price_cents = to_cents(price)
+        self.sku = name if sku is None else sku
+
+    def __repr__(self):
+        return f"Product(name={self.name!r}, price={self.price!r}, sku={self.sku!r})"
+
+
+class ProductCatalog(Mapping):
+    """
+    Docstring for ProductCatalog
+
+    A read-only mapping of product name to ``Product``. Every product also
+    has an integer id (its position in the catalog) and can be looked up by
+    SKU. ``fingerprint`` hashes the product names in id order, so two
+    catalogs with the same fingerprint map every id to the same product,
+    whichever process loaded them.
+    """
+    def __init__(self, products=(), version=1, source=None):
+        self.version = version
+        self.source = source
+        self._products = []
+        self._by_name = {}
+        self._by_sku = {}
+        for product in products:
+            if product.name in self._by_name:
+                raise ValueError(f"Duplicate product name in catalog: {product.name}")
+            if product.sku in self._by_sku:
+                raise ValueError(f"Duplicate SKU in catalog: {product.sku}")
+            self._by_name[product.name] = len(self._products)
+            self._by_sku[product.sku] = len(self._products)
+            self._products.append(product)
+        names = "\0".join(product.name for product in self._products).encode("utf-8")
+        self.fingerprint = int.from_bytes(hashlib.blake2b(names, digest_size=8).digest(), "little")
+
+    @classmethod
+    def load(cls, path, version=1):
+        """Load a catalog from a ``.csv`` (name,price[,sku]) or ``.json`` file."""
+        path = Path(path)
+        if path.suffix == ".csv":
+            products = cls._read_csv(path)
+        elif path.suffix == ".json":
+            products = cls._read_json(path)
+        else:
+            raise ValueError(f"Unsupported catalog format: {path.suffix}")
+        catalog = cls(products, version=version, source=path)
+        logger.info("Loaded catalog %s version %s with %s products.", path, version, len(catalog))
+        return catalog
+
+    @staticmethod
+    def _read_csv(path):
+        with open(path, newline="", encoding="utf-8") as handle:
+            reader = csv.reader(handle)
+            header = next(reader)
+            name_at, price_at = header.index("name"), header.index("price")
+            sku_at = header.index("sku") if "sku" in header else None
+            for row in reader:
+                yield Product(row[name_at], float(row[price_at]), row[sku_at] if sku_at is not None else None)
+
+    @staticmethod
+    def _read_json(path):
+        with open(path, encoding="utf-8") as handle:
+            records = json.load(handle)
+        for record in records:
+            yield Product(record["name"], record["price"], record.get("sku"))
+
+    def __getitem__(self, name):
+        return self._products[self._by_name[name]]
+
+    def __iter__(self):
+        return iter(self._by_name)
+
+    def __len__(self):
+        return len(self._products)
+
+    def __contains__(self, name):
+        return name in self._by_name
+
+    def by_sku(self, sku):
+        return self._products[self._by_sku[sku]]
+
+    def product_id(self, name):
+        return self._by_name[name]
+
+    def product(self, product_id):
+        return self._products[product_id]
+
+    def products_by_id(self):
+        """Every product, indexed by product id. Do not modify the list."""
+        return self._products
+
+    def prices_cents(self):
+        """Price of every product in cents, indexed by product id."""
+        return [product.price_cents for product in self._products]
+
+
+DEFAULT_PRODUCTS = (
+    Product("apple", 1.0),
+    Product("banana", 0.5),
+    Product("guava", 2.5),
+)
+
+_current = ProductCatalog(DEFAULT_PRODUCTS)
+_reload_lock = threading.Lock()
+
+
+def get_catalog():
+    return _current
+
+
+def set_catalog(catalog):
+    """Make ``catalog`` the process-wide catalog, e.g. in tests."""
+    global _current
+    _current = catalog
+    return catalog
+
+
+def load_catalog(path):
+    """Load ``path`` as the next catalog version and make it current."""
+    global _current
+    with _reload_lock:
+        _current = ProductCatalog.load(path, version=_current.version + 1)
+        return _current
+
+
+def reload_catalog():
+    """Re-read the current catalog's source file as a new version."""
+    if _current.source is None:
+        raise ValueError("The current catalog was not loaded from a file.")
+    return load_catalog(_current.source)
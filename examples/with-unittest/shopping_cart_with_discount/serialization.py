@@ -0,0 +1,129 @@
+"""
+Compact snapshots of carts.
+
+Binary layout (little-endian)::
+
+    b"CART" | format version u8 | catalog fingerprint u64 | line count u32
+    | product ids  int32 * line count
+    | quantities   int32 * line count
+
+Product ids are positions in the cart's catalog, so a binary snapshot can
+only be loaded against a catalog with the same products in the same
+order. The header carries the catalog's ``fingerprint`` rather than its
+version, which only counts reloads within one process; ``loads_cart``
+raises ValueError when the fingerprints differ. The JSON form stores
+product names and survives catalog reloads.
+"""
+import json
+import struct
+import sys
+from array import array
+
+from cart import CompactShoppingCart, ShoppingCart
+from catalog import get_catalog
+
+MAGIC = b"CART"
+FORMAT_VERSION = 2
+_HEADER = struct.Struct("<4sBQI")
+
+
+def _to_little_endian(column):
+    if sys.byteorder == "big":
+        column = array(column.typecode, column)
+        column.byteswap()
+    return column
+
+
+def dumps_cart(cart):
+    """Encode a ShoppingCart or CompactShoppingCart as bytes."""
+    catalog = cart.products
+    if isinstance(cart, CompactShoppingCart):
+        product_ids, quantities = cart.product_ids, cart.quantities
+    else:
+        product_ids = array("i", (catalog.product_id(name) for name in cart.items))
+        quantities = array("i", (item['quantity'] for item in cart.items.values()))
+    header = _HEADER.pack(MAGIC, FORMAT_VERSION, catalog.fingerprint, len(product_ids))
+    return b"".join((header, _to_little_endian(product_ids).tobytes(), _to_little_endian(quantities).tobytes()))
+
+
+def loads_cart(data, catalog=None, cart_class=ShoppingCart):
+    """
+    Decode bytes written by ``dumps_cart`` into a new ``cart_class``.
+
+    ``data`` may be any bytes-like object; it is read through a memoryview
+    without copying the line columns.
+    """
+    catalog = get_catalog() if catalog is None else catalog
+    view = memoryview(data)
+    if len(view) < _HEADER.size:
+        raise ValueError("Cart snapshot is truncated.")
+    magic, format_version, fingerprint, count = _HEADER.unpack_from(view)
+    if magic != MAGIC or format_version != FORMAT_VERSION:
+        raise ValueError("Not a cart snapshot, or an unsupported format version.")
+    if fingerprint != catalog.fingerprint:
+        raise ValueError("Cart snapshot was written against a different catalog.")
+    if len(view) != _HEADER.size + 8 * count:
+        raise ValueError("Cart snapshot is truncated.")
+    columns = view[_HEADER.size:].cast("i")
+    product_ids, quantities = columns[:count], columns[count:]
+    if sys.byteorder == "big":
+        product_ids, quantities = _to_little_endian(array("i", product_ids)), _to_little_endian(array("i", quantities))
+    return _build_cart(cart_class, catalog, product_ids, quantities)
+
+
+def _check_lines(catalog, product_ids, quantities):
+    if not product_ids:
+        return
+    if min(product_ids) < 0 or max(product_ids) >= len(catalog):
+        raise ValueError("Cart snapshot refers to a product that is not in the catalog.")
+    if len(set(product_ids)) != len(product_ids):
+        raise ValueError("Cart snapshot lists a product more than once.")
+    if min(quantities) <= 0:
+        raise ValueError("Cart snapshot has a quantity that is not positive.")
+
+
+def _build_cart(cart_class, catalog, product_ids, quantities):
+    _check_lines(catalog, product_ids, quantities)
+    cart = cart_class(catalog)
+    product = catalog.products_by_id().__getitem__
+    subtotal_cents = 0
+    if issubclass(cart_class, CompactShoppingCart):
+        cart.product_ids = array("i", product_ids)
+        cart.quantities = array("i", quantities)
+        cart._slots = {product_id: slot for slot, product_id in enumerate(cart.product_ids)}
+        for product_id, quantity in zip(product_ids, quantities):
+            subtotal_cents += product(product_id).price_cents * quantity
+    else:
+        items = cart.items
+        for product_id, quantity in zip(product_ids, quantities):
+            line_product = product(product_id)
+            items[line_product.name] = {'product': line_product, 'quantity': quantity}
+            subtotal_cents += line_product.price_cents * quantity
+    cart._subtotal_cents = subtotal_cents
+    cart._item_count = sum(quantities)
+    return cart
+
+
+def cart_to_json(cart):
+    """JSON fallback keyed by product name, readable against any catalog version."""
+    return json.dumps({
+        "format": "cart",
+        "version": FORMAT_VERSION,
+        "lines": [[product.name, quantity] for product, quantity in cart.lines()],
+    })
+
+
+def cart_from_json(text, catalog=None, cart_class=ShoppingCart):
+    catalog = get_catalog() if catalog is None else catalog
+    document = json.loads(text)
+    if document.get("format") != "cart" or document.get("version") != FORMAT_VERSION:
+        raise ValueError("Not a cart snapshot, or an unsupported format version.")
+    lines = document["lines"]
+    try:
+        product_ids = [catalog.product_id(name) for name, _ in lines]
+    except KeyError as error:
+        raise ValueError(f"Cart snapshot refers to a product that is not in the catalog: {error}") from None
+    quantities = [quantity for _, quantity in lines]
+    if not all(type(quantity) is int for quantity in quantities):
+        raise ValueError("Cart snapshot has a quantity that is not an integer.")
+    return _build_cart(cart_class, catalog, product_ids, quantities)
@@ -0,0 +1,118 @@
+"""
+Thread-safe store of live carts keyed by session id.
+
+Sessions are spread over shards, each with its own lock, so threads working
+on different sessions rarely contend. Carts idle for longer than ``ttl``
+seconds are evicted.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+from cart import ShoppingCart
+
+
+class _Shard:
+    __slots__ = ("lock", "carts")
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        # session id -> (cart, last access), oldest access first
+        self.carts = OrderedDict()
+
+
+class CartStore:
+    """
+    Docstring for CartStore
+
+    Only change carts through ``add``, ``remove`` and ``update``: they run
+    under the session's shard lock, so concurrent read-modify-writes of the
+    same cart are never lost.
+    """
+    def __init__(self, shards=64, ttl=30 * 60, cart_factory=ShoppingCart, clock=time.monotonic):
+        if shards < 1:
+            raise ValueError("A cart store needs at least one shard.")
+        self._shards = [_Shard() for _ in range(shards)]
+        self.ttl = ttl
+        self.cart_factory = cart_factory
+        self.clock = clock
+
+    def _shard(self, session_id):
+        return self._shards[hash(session_id) % len(self._shards)]
+
+    def _checkout(self, shard, session_id, now, create=True):
+        # Caller holds shard.lock. Drops expired carts from the front, then
+        # moves this session to the back as most recently used.
+        self._evict_shard(shard, now)
+        entry = shard.carts.pop(session_id, None)
+        if entry is None:
+            if not create:
+                return None
+            cart = self.cart_factory()
+        else:
+            cart = entry[0]
+        shard.carts[session_id] = (cart, now)
+        return cart
+
+    def _evict_shard(self, shard, now):
+        evicted = 0
+        carts = shard.carts
+        while carts:
+            session_id, (_, last_access) = next(iter(carts.items()))
+            if now - last_access < self.ttl:
+                break
+            del carts[session_id]
+            evicted += 1
+        return evicted
+
+    def update(self, session_id, func):
+        """Run ``func(cart)`` atomically for the session's cart and return its result."""
+        shard = self._shard(session_id)
+        with shard.lock:
+            return func(self._checkout(shard, session_id, self.clock()))
+
+    def add(self, session_id, product_name, quantity=1):
+        """Atomically add to the session's cart; returns its new item count."""
+        shard = self._shard(session_id)
+        with shard.lock:
+            cart = self._checkout(shard, session_id, self.clock())
+            cart.add_product(product_name, quantity)
+            return cart.total_number_of_items()
+
+    def remove(self, session_id, product_name, quantity=1):
+        """Atomically remove from the session's cart; returns its new item count."""
+        shard = self._shard(session_id)
+        with shard.lock:
+            cart = self._checkout(shard, session_id, self.clock())
+            cart.remove_product(product_name, quantity)
+            return cart.total_number_of_items()
+
+    def get(self, session_id):
+        """The session's cart, or None. Read it, change it with ``update``."""
+        shard = self._shard(session_id)
+        with shard.lock:
+            return self._checkout(shard, session_id, self.clock(), create=False)
+
+    def discard(self, session_id):
+        shard = self._shard(session_id)
+        with shard.lock:
+            entry = shard.carts.pop(session_id, None)
+        return entry is not None
+
+    def evict_expired(self):
+        """Drop every cart idle for ``ttl`` seconds or more; returns how many."""
+        now = self.clock()
+        evicted = 0
+        for shard in self._shards:
+            with shard.lock:
+                evicted += self._evict_shard(shard, now)
+        return evicted
+
+    def __contains__(self, session_id):
+        shard = self._shard(session_id)
+        with shard.lock:
+            entry = shard.carts.get(session_id)
+            return entry is not None and self.clock() - entry[1] < self.ttl
+
+    def __len__(self):
+        return sum(len(shard.carts) for shard in self._shards)
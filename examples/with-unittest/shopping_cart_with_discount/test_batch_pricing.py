@@ -0,0 +1,78 @@
+import random
+import unittest
+
+from cart import (BuyOneGetOneFreeStrategy, BuyXGetYFreeStrategy,
+                  CompactShoppingCart, FixedAmountDiscountStrategy,
+                  PercentageDiscountStrategy, ShoppingCart, configure_tracing)
+from catalog import Product, ProductCatalog
+
+try:
+    from batch_pricing import CartBatch
+except ImportError:  # NumPy is not installed
+    CartBatch = None
+
+
+@unittest.skipIf(CartBatch is None, "NumPy is not installed")
+class TestCartBatch(unittest.TestCase):
+    def setUp(self):
+        configure_tracing(enabled=False)
+        rng = random.Random(3)
+        self.carts = []
+        for i in range(200):
+            shopping_cart = CompactShoppingCart() if i % 2 else ShoppingCart()
+            for name in rng.sample(["apple", "banana", "guava"], rng.randrange(0, 4)):
+                shopping_cart.add_product(name, rng.randrange(1, 40))
+            self.carts.append(shopping_cart)
+        self.batch = CartBatch.from_carts(self.carts)
+
+    def tearDown(self):
+        configure_tracing(enabled=True)
+
+    def test_totals_match_scalar(self):
+        self.assertEqual(self.batch.final_prices(), [c.total_price() for c in self.carts])
+        self.assertEqual(self.batch.item_counts().tolist(), [c.total_number_of_items() for c in self.carts])
+
+    def test_strategies_match_scalar(self):
+        cases = [
+            (PercentageDiscountStrategy(), 0),
+            (PercentageDiscountStrategy(), 12.5),
+            (PercentageDiscountStrategy(), 33),
+            (BuyOneGetOneFreeStrategy(), 0),
+            (BuyXGetYFreeStrategy(x=2, y=1), 0),
+            (BuyXGetYFreeStrategy(x=4, y=2), 0),
+        ]
+        for strategy, value in cases:
+            with self.subTest(strategy=type(strategy).__name__, value=value):
+                expected = [c.final_price_after_discount(strategy, value) for c in self.carts]
+                self.assertEqual(self.batch.final_prices(strategy, value), expected)
+
+    def test_carts_keep_their_catalog_across_a_reload(self):
+        old = ProductCatalog([Product("apple", 1.0)], version=1)
+        new = ProductCatalog([Product("kiwi", 3.0), Product("apple", 2.0)], version=2)
+        carts = [ShoppingCart(old), ShoppingCart(new), CompactShoppingCart(new), ShoppingCart(old)]
+        for shopping_cart in carts:
+            shopping_cart.add_product("apple", 2)
+        carts[2].add_product("kiwi")
+        batch = CartBatch.from_carts(carts)
+        self.assertEqual(batch.final_prices(), [c.total_price() for c in carts])
+        self.assertEqual(batch.final_prices(), [2.0, 4.0, 7.0, 2.0])
+        self.assertEqual(batch.final_prices(BuyOneGetOneFreeStrategy()),
+                         [c.final_price_after_discount(BuyOneGetOneFreeStrategy()) for c in carts])
+        self.assertEqual(CartBatch.from_carts(carts[:2], products=new).final_prices(), [4.0, 4.0])
+        with self.assertRaises(ValueError):
+            CartBatch.from_carts(carts, products=old)
+
+    def test_empty_batch(self):
+        self.assertEqual(CartBatch.from_carts([]).final_prices(), [])
+
+    def test_invalid_percentage(self):
+        with self.assertRaises(ValueError):
+            self.batch.percentage(101)
+
+    def test_unsupported_strategy(self):
+        with self.assertRaises(TypeError):
+            self.batch.price(FixedAmountDiscountStrategy(), 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
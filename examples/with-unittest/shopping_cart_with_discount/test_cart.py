@@ -1,9 +1,18 @@
 import unittest
+from unittest.mock import patch
+
+from catalog import ProductCatalog
 from cart import (BuyOneGetOneFreeStrategy, BuyXGetYFreeStrategy, 
+                  CompactShoppingCart,
+                  DiscountPipeline,
+                  discount_cache_stats,
                   FixedAmountDiscountStrategy, 
                   PercentageDiscountStrategy,
+                  QuantityBreakDiscountStrategy,
+                  SpendTieredDiscountStrategy,
                   ShoppingCart, 
                   Product,  
+                  configure_tracing,
                   logger,)
 
 
@@ -42,6 +51,64 @@ class TestShoppingCart(unittest.TestCase):
         self.assertEqual(total, 0.0)
         self.assertEqual(len(self.cart.items), 0)
 
+    def test_running_totals_match_full_recompute(self):
+        for i in range(1000):
+            self.cart.add_product(("apple", "banana", "guava")[i % 3], i % 7)
+            if i % 5 == 0:
+                self.cart.remove_product("banana", 2)
+        self.assertEqual(self.cart.recompute_totals(),
+                         (self.cart._subtotal_cents, self.cart.total_number_of_items()))
+
+    def test_removing_more_than_quantity_removes_line(self):
+        self.cart.add_product("guava", 3)
+        self.cart.remove_product("guava", 5)
+        self.assertNotIn("guava", self.cart.items)
+        self.assertEqual(self.cart.total_price(), 0.0)
+        self.assertEqual(self.cart.total_number_of_items(), 0)
+
+    def test_total_price_is_exact(self):
+        self.cart = ShoppingCart(ProductCatalog([Product("cherry", 0.1)]))
+        self.cart.add_product("cherry", 3)
+        self.assertEqual(self.cart.total_price(), 0.3)
+
+class TestCompactShoppingCart(TestShoppingCart):
+    def setUp(self):
+        super().setUp()
+        self.cart = CompactShoppingCart()
+
+    def test_lines_are_stored_in_arrays(self):
+        self.cart.add_product("apple", 3)
+        self.cart.add_product("guava", 2)
+        self.assertEqual(self.cart.product_ids.typecode, "i")
+        self.assertEqual(list(self.cart.quantities), [3, 2])
+        self.assertEqual(sorted(self.cart.items), ["apple", "guava"])
+
+    def test_removing_a_line_keeps_others(self):
+        for name in ("apple", "banana", "guava"):
+            self.cart.add_product(name, 2)
+        self.cart.remove_product("apple", 2)
+        self.assertEqual(dict((name, item['quantity']) for name, item in self.cart.items.items()),
+                         {"banana": 2, "guava": 2})
+        self.cart.add_product("banana")
+        self.assertEqual(self.cart.items["banana"]['quantity'], 3)
+
+    def test_remove_missing_product(self):
+        self.cart.remove_product("apple")
+        self.assertEqual(len(self.cart.items), 0)
+
+    def test_discounts_match_dict_cart(self):
+        dict_cart = ShoppingCart()
+        for name, quantity in (("apple", 7), ("banana", 3), ("guava", 22)):
+            self.cart.add_product(name, quantity)
+            dict_cart.add_product(name, quantity)
+        cases = [(PercentageDiscountStrategy(), 15), (BuyOneGetOneFreeStrategy(), 0),
+                 (BuyXGetYFreeStrategy(x=2, y=1), 0), (FixedAmountDiscountStrategy(), 5),
+                 (DiscountPipeline().add(BuyOneGetOneFreeStrategy(), products=["guava"]), 0)]
+        for strategy, value in cases:
+            with self.subTest(strategy=type(strategy).__name__):
+                self.assertEqual(self.cart.final_price_after_discount(strategy, value),
+                                 dict_cart.final_price_after_discount(strategy, value))
+
 class TestPercentageDiscountStrategy(unittest.TestCase):
     def setUp(self):
         self.discount_strategy = PercentageDiscountStrategy()
@@ -91,6 +158,19 @@ class TestPercentageDiscountStrategy(unittest.TestCase):
         expected_price = 0.0
         self.assertEqual(discounted_price, expected_price)
         
+    def test_remove_discount_recovers_original_price(self):
+        self.cart.add_product("apple", 90)
+        self.assertEqual(self.discount_strategy.remove_discount(self.cart, 10), 100.0)
+
+    def test_remove_full_discount_raises(self):
+        self.cart.add_product("apple", 10)
+        with self.assertRaises(ValueError):
+            self.discount_strategy.remove_discount(self.cart, 100)
+
+    def test_apply_discount_rounds_to_cents(self):
+        self.cart.add_product("banana", 7)  # 3.50
+        self.assertEqual(self.discount_strategy.apply_discount(self.cart, 33), 2.34)
+        
 class TestFixedAmountDiscountStrategy(unittest.TestCase):
     def setUp(self):
         self.discount_strategy = FixedAmountDiscountStrategy()
@@ -155,6 +235,10 @@ class TestBuyOneGetOneFreeStrategy(unittest.TestCase):
         discounted_price = self.discount_strategy.apply_discount(self.cart)
         self.assertEqual(discounted_price, expected_price)
 
+    def test_bogo_through_final_price(self):
+        self.cart.add_product("apple", 3)
+        self.assertEqual(self.cart.final_price_after_discount(self.discount_strategy), 2.0)
+
     def test_bogo_with_no_items(self):
         expected_price = 0.0
         discounted_price = self.discount_strategy.apply_discount(self.cart)
@@ -181,6 +265,220 @@ class TestBuyXGetYFree(unittest.TestCase):
         discounted_price = self.discount_strategy.apply_discount(self.cart)
         self.assertEqual(discounted_price, expected_price)
 
+class TestDiscountPipeline(unittest.TestCase):
+    def setUp(self):
+        self.cart = ShoppingCart()
+        self.pipeline = DiscountPipeline()
+
+    def test_empty_pipeline_is_total_price(self):
+        self.cart.add_product("guava", 3)
+        self.assertEqual(self.cart.final_price_after_discount(self.pipeline), 7.5)
+
+    def test_single_rule_matches_strategy(self):
+        self.cart.add_product("apple", 5)
+        self.cart.add_product("banana", 3)
+        strategy = BuyXGetYFreeStrategy(x=2, y=1)
+        self.pipeline.add(strategy)
+        self.assertEqual(self.pipeline.apply_discount(self.cart), strategy.apply_discount(self.cart))
+
+    def test_best_quantity_promotion_wins(self):
+        self.cart.add_product("apple", 6)
+        self.pipeline.add(BuyXGetYFreeStrategy(x=2, y=1)).add(BuyOneGetOneFreeStrategy())
+        self.assertEqual(self.pipeline.apply_discount(self.cart), 3.0)
+
+    def test_chained_promotions(self):
+        self.cart.add_product("apple", 4)    # BOGO -> 2 x 1.00, then 10% -> 1.80
+        self.cart.add_product("guava", 20)   # 20% -> 40.00
+        self.pipeline.add(BuyOneGetOneFreeStrategy(), products=["apple"])
+        self.pipeline.add(PercentageDiscountStrategy(), 10, products=["apple"])
+        self.pipeline.add(PercentageDiscountStrategy(), 20, products=["guava"])
+        self.pipeline.add(FixedAmountDiscountStrategy(), 5)
+        self.assertEqual(self.cart.final_price_after_discount(self.pipeline), 36.8)
+
+    def test_global_percentage_compounds_with_targeted(self):
+        self.cart.add_product("banana", 10)  # 5.00 -> 10% -> 4.50 -> 50% -> 2.25
+        self.cart.add_product("apple", 1)    # 1.00 -> 50% -> 0.50
+        self.pipeline.add(PercentageDiscountStrategy(), 10, products=["banana"])
+        self.pipeline.add(PercentageDiscountStrategy(), 50)
+        self.assertEqual(self.pipeline.apply_discount(self.cart), 2.75)
+
+    def test_adding_rule_recompiles(self):
+        self.cart.add_product("apple", 2)
+        self.assertEqual(self.pipeline.apply_discount(self.cart), 2.0)
+        self.pipeline.add(BuyOneGetOneFreeStrategy())
+        self.assertEqual(self.pipeline.apply_discount(self.cart), 1.0)
+
+    def test_changing_a_strategy_after_adding_it(self):
+        self.cart.add_product("apple", 6)
+        strategy = BuyXGetYFreeStrategy(x=2, y=1)
+        self.pipeline.add(strategy)
+        self.assertEqual(self.pipeline.apply_discount(self.cart), 4.0)
+        key = self.pipeline.cache_key()
+        strategy.x = 1
+        self.assertEqual(self.pipeline.cache_key(), key)
+        self.assertEqual(self.pipeline.apply_discount(self.cart), 4.0)
+        self.pipeline.compile()
+        self.assertEqual(self.pipeline.apply_discount(self.cart), 4.0)
+
+    def test_fixed_amount_above_total_raises_like_the_strategy(self):
+        self.cart.add_product("apple", 3)
+        self.pipeline.add(FixedAmountDiscountStrategy(), 5)
+        with self.assertRaises(ValueError):
+            FixedAmountDiscountStrategy().apply_discount(self.cart, 5)
+        with self.assertRaises(ValueError):
+            self.pipeline.apply_discount(self.cart)
+
+    def test_invalid_rules(self):
+        with self.assertRaises(ValueError):
+            self.pipeline.add(PercentageDiscountStrategy(), 120)
+        with self.assertRaises(ValueError):
+            self.pipeline.add(FixedAmountDiscountStrategy(), -1)
+        with self.assertRaises(TypeError):
+            self.pipeline.add(DiscountPipeline())
+
+class TestSpendTieredDiscountStrategy(unittest.TestCase):
+    def setUp(self):
+        self.cart = ShoppingCart()
+        self.discount_strategy = SpendTieredDiscountStrategy([(500, 10), (100, 5)])
+
+    def test_below_first_tier(self):
+        self.cart.add_product("apple", 99)
+        self.assertEqual(self.cart.final_price_after_discount(self.discount_strategy), 99.0)
+
+    def test_tier_boundaries(self):
+        self.cart.add_product("apple", 100)
+        self.assertEqual(self.discount_strategy.apply_discount(self.cart), 95.0)
+        self.cart.add_product("guava", 160)  # 500.00
+        self.assertEqual(self.discount_strategy.apply_discount(self.cart), 450.0)
+
+    def test_thresholds_are_sorted(self):
+        self.assertEqual(list(self.discount_strategy.thresholds), [10000, 50000])
+        self.assertEqual(self.discount_strategy.percentages, (5, 10))
+
+    def test_invalid_tiers(self):
+        with self.assertRaises(ValueError):
+            SpendTieredDiscountStrategy([(100, 120)])
+        with self.assertRaises(ValueError):
+            SpendTieredDiscountStrategy([(100, 5), (100, 10)])
+        with self.assertRaises(ValueError):
+            SpendTieredDiscountStrategy([(-1, 5)])
+
+    def test_remove_discount(self):
+        self.cart.add_product("apple", 200)
+        self.assertEqual(self.discount_strategy.remove_discount(self.cart), 200.0)
+
+class TestQuantityBreakDiscountStrategy(unittest.TestCase):
+    def setUp(self):
+        self.cart = ShoppingCart()
+        self.discount_strategy = QuantityBreakDiscountStrategy(
+            tiers=[(10, 5), (50, 10)],
+            product_tiers={"guava": [(3, 20)]},
+        )
+
+    def test_shared_breaks(self):
+        self.cart.add_product("apple", 9)    # 9.00
+        self.cart.add_product("banana", 10)  # 5.00 - 5% = 4.75
+        self.assertEqual(self.discount_strategy.apply_discount(self.cart), 13.75)
+        self.cart.add_product("apple", 41)   # 50.00 - 10% = 45.00
+        self.assertEqual(self.discount_strategy.apply_discount(self.cart), 49.75)
+
+    def test_product_breaks_replace_shared(self):
+        self.cart.add_product("guava", 60)  # 150.00 - 20% = 120.00
+        self.assertEqual(self.cart.final_price_after_discount(self.discount_strategy), 120.0)
+
+    def test_cached_result_follows_tiers(self):
+        self.cart.add_product("guava", 4)
+        self.assertEqual(self.cart.final_price_after_discount(self.discount_strategy), 8.0)
+        other = QuantityBreakDiscountStrategy(product_tiers={"guava": [(3, 50)]})
+        self.assertEqual(self.cart.final_price_after_discount(other), 5.0)
+
+class TestDiscountMemoization(unittest.TestCase):
+    def setUp(self):
+        self.cart = ShoppingCart()
+        self.cart.add_product("apple", 10)
+        self.strategy = PercentageDiscountStrategy()
+
+    def test_version_bumps_on_change(self):
+        version = self.cart.version
+        self.cart.add_product("banana")
+        self.cart.remove_product("banana")
+        self.assertEqual(self.cart.version, version + 2)
+
+    def test_repeated_calls_hit_the_cache(self):
+        with patch.object(PercentageDiscountStrategy, "apply_discount", return_value=9.0) as apply_discount:
+            for _ in range(5):
+                self.assertEqual(self.cart.final_price_after_discount(self.strategy, 10), 9.0)
+        apply_discount.assert_called_once()
+        info = self.cart.discount_cache_info()
+        self.assertEqual((info["hits"], info["misses"]), (4, 1))
+        self.assertAlmostEqual(info["hit_rate"], 0.8)
+
+    def test_change_invalidates(self):
+        self.assertEqual(self.cart.final_price_after_discount(self.strategy, 10), 9.0)
+        self.cart.add_product("apple", 10)
+        self.assertEqual(self.cart.final_price_after_discount(self.strategy, 10), 18.0)
+
+    def test_parameters_are_part_of_the_key(self):
+        self.assertEqual(self.cart.final_price_after_discount(self.strategy, 10), 9.0)
+        self.assertEqual(self.cart.final_price_after_discount(self.strategy, 50), 5.0)
+        strategy = BuyXGetYFreeStrategy(x=1, y=1)
+        self.assertEqual(self.cart.final_price_after_discount(strategy), 5.0)
+        strategy.x = 4
+        self.assertEqual(self.cart.final_price_after_discount(strategy), 8.0)
+
+    def test_pipeline_key_follows_its_rules(self):
+        pipeline = DiscountPipeline().add(BuyOneGetOneFreeStrategy())
+        self.assertEqual(self.cart.final_price_after_discount(pipeline), 5.0)
+        pipeline.add(PercentageDiscountStrategy(), 10)
+        self.assertEqual(self.cart.final_price_after_discount(pipeline), 4.5)
+
+    def test_cache_is_bounded(self):
+        self.cart.discount_cache_size = 4
+        for percentage in range(10):
+            self.cart.final_price_after_discount(self.strategy, percentage)
+        info = self.cart.discount_cache_info()
+        self.assertEqual((info["size"], info["evictions"]), (4, 6))
+
+    def test_disabled_cache(self):
+        self.cart.discount_cache_size = 0
+        self.cart.final_price_after_discount(self.strategy, 10)
+        self.assertEqual(self.cart.discount_cache_info()["misses"], 0)
+
+    def test_process_wide_stats(self):
+        before = discount_cache_stats()
+        self.cart.final_price_after_discount(self.strategy, 10)
+        self.cart.final_price_after_discount(self.strategy, 10)
+        after = discount_cache_stats()
+        self.assertEqual(after["hits"] - before["hits"], 1)
+        self.assertEqual(after["misses"] - before["misses"], 1)
+
+class TestCartTracing(unittest.TestCase):
+    def setUp(self):
+        self.cart = ShoppingCart()
+
+    def tearDown(self):
+        configure_tracing(enabled=True, sample_every=1)
+
+    def test_tracing_off_emits_no_debug_records(self):
+        configure_tracing(enabled=False)
+        with patch.object(logger, "debug") as debug:
+            self.cart.add_product("apple", 2)
+            self.cart.remove_product("apple", 1)
+            self.cart.total_price()
+        debug.assert_not_called()
+
+    def test_tracing_on_emits_structured_events(self):
+        with self.assertLogs(logger, level="DEBUG") as captured:
+            self.cart.add_product("apple", 2)
+        self.assertEqual(captured.records[0].trace, {"event": "cart.add", "product": "apple", "quantity": 2})
+
+    def test_tracing_sampling(self):
+        configure_tracing(enabled=True, sample_every=5)
+        with self.assertLogs(logger, level="DEBUG") as captured:
+            for _ in range(20):
+                self.cart.add_product("apple")
+        self.assertEqual(len(captured.records), 4)
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
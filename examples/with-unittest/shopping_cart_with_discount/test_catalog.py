@@ -0,0 +1,97 @@
+import json
+import os
+import tempfile
+import unittest
+
+from cart import ShoppingCart
+from catalog import (Product, ProductCatalog, get_catalog, load_catalog,
+                     reload_catalog, set_catalog)
+
+
+class TestProductCatalog(unittest.TestCase):
+    def setUp(self):
+        self.catalog = ProductCatalog([
+            Product("apple", 1.0, sku="A-1"),
+            Product("banana", 0.5, sku="B-1"),
+        ])
+
+    def tearDown(self):
+        self.catalog = None
+
+    def test_lookup_by_name_and_sku(self):
+        self.assertEqual(self.catalog["apple"].price_cents, 100)
+        self.assertIs(self.catalog.by_sku("B-1"), self.catalog["banana"])
+        self.assertIn("apple", self.catalog)
+        self.assertNotIn("guava", self.catalog)
+
+    def test_product_ids(self):
+        self.assertEqual(self.catalog.product_id("banana"), 1)
+        self.assertIs(self.catalog.product(0), self.catalog["apple"])
+        self.assertEqual(self.catalog.prices_cents(), [100, 50])
+
+    def test_catalog_is_read_only(self):
+        with self.assertRaises(TypeError):
+            self.catalog["guava"] = Product("guava", 2.5)
+
+    def test_product_has_slots(self):
+        with self.assertRaises(AttributeError):
+            self.catalog["apple"].colour = "red"
+
+    def test_duplicate_sku(self):
+        with self.assertRaises(ValueError):
+            ProductCatalog([Product("apple", 1.0, sku="X"), Product("pear", 1.0, sku="X")])
+
+    def test_default_sku_is_name(self):
+        self.assertEqual(Product("kiwi", 0.25).sku, "kiwi")
+
+
+class TestCatalogLoading(unittest.TestCase):
+    def setUp(self):
+        self.previous = get_catalog()
+        self.folder = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        set_catalog(self.previous)
+        self.folder.cleanup()
+
+    def write(self, name, content):
+        path = os.path.join(self.folder.name, name)
+        with open(path, "w") as handle:
+            handle.write(content)
+        return path
+
+    def test_load_csv(self):
+        catalog = ProductCatalog.load(self.write("products.csv", "sku,name,price\nP1,pear,1.25\nP2,plum,0.4\n"))
+        self.assertEqual(catalog.by_sku("P2").price_cents, 40)
+        self.assertEqual(len(catalog), 2)
+
+    def test_load_json(self):
+        records = [{"name": "pear", "price": 1.25}, {"name": "plum", "price": 0.4, "sku": "P2"}]
+        catalog = ProductCatalog.load(self.write("products.json", json.dumps(records)))
+        self.assertEqual(catalog["pear"].sku, "pear")
+        self.assertEqual(catalog.by_sku("P2").name, "plum")
+
+    def test_unsupported_format(self):
+        with self.assertRaises(ValueError):
+            ProductCatalog.load(self.write("products.txt", ""))
+
+    def test_hot_reload_bumps_version_and_keeps_open_carts(self):
+        path = self.write("products.csv", "name,price\napple,1.0\n")
+        first = load_catalog(path)
+        cart = ShoppingCart()
+        cart.add_product("apple", 2)
+        self.write("products.csv", "name,price\napple,3.0\n")
+        second = reload_catalog()
+        self.assertEqual(second.version, first.version + 1)
+        self.assertIs(get_catalog(), second)
+        self.assertEqual(cart.total_price(), 2.0)
+        new_cart = ShoppingCart()
+        new_cart.add_product("apple", 2)
+        self.assertEqual(new_cart.total_price(), 6.0)
+
+    def test_carts_share_the_catalog(self):
+        self.assertIs(ShoppingCart().products, ShoppingCart().products)
+
+
+if __name__ == '__main__':
+    unittest.main()
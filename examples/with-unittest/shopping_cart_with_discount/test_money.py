@@ -0,0 +1,64 @@
+import unittest
+from array import array
+from decimal import Decimal
+
+from money import (Money, line_totals, np, percentage_batch,
+                   sum_line_totals, to_cents)
+
+
+class TestMoney(unittest.TestCase):
+    def test_to_cents(self):
+        self.assertEqual(to_cents(2.5), 250)
+        self.assertEqual(to_cents(0.1), 10)
+        self.assertEqual(to_cents("19.995"), 2000)
+
+    def test_arithmetic_is_exact(self):
+        total = Money(0)
+        for _ in range(10):
+            total += Money.from_amount(0.1)
+        self.assertEqual(total, Money(100))
+        self.assertEqual(Money(250) * 3, Money(750))
+        self.assertEqual(str(Money(1999)), "19.99")
+        self.assertEqual(Money(1999).amount, Decimal("19.99"))
+
+    def test_money_requires_integer_cents(self):
+        with self.assertRaises(TypeError):
+            Money(1.5)
+
+    def test_percentage_rounds_half_up(self):
+        self.assertEqual(Money(70).percentage(15), Money(11))
+        self.assertEqual(Money(1000).apply_percentage_discount(12.5), Money(875))
+
+    def test_remove_percentage_discount(self):
+        self.assertEqual(Money(9000).remove_percentage_discount(10), Money(10000))
+        self.assertEqual(Money(6667).remove_percentage_discount(33.33), Money(10000))
+
+    def test_remove_full_discount_raises(self):
+        with self.assertRaises(ValueError):
+            Money(0).remove_percentage_discount(100)
+
+
+class TestMoneyBatch(unittest.TestCase):
+    def setUp(self):
+        self.prices = [100, 50, 250, 1999]
+        self.quantities = [3, 0, 7, 2]
+
+    def test_line_totals(self):
+        self.assertEqual(line_totals(array("q", self.prices), self.quantities), [300, 0, 1750, 3998])
+
+    def test_sum_line_totals(self):
+        self.assertEqual(sum_line_totals(self.prices, self.quantities), Money(6048))
+
+    def test_percentage_batch_matches_scalar(self):
+        expected = [Money(cents).percentage(12.5).cents for cents in self.prices + [-70]]
+        self.assertEqual(percentage_batch(self.prices + [-70], 12.5), expected)
+
+    @unittest.skipIf(np is None, "NumPy is not installed")
+    def test_numpy_batch_matches_pure_python(self):
+        prices = np.array(self.prices, dtype=np.int64)
+        self.assertEqual(sum_line_totals(prices, self.quantities), sum_line_totals(self.prices, self.quantities))
+        self.assertEqual(list(percentage_batch(prices, 12.5)), percentage_batch(self.prices, 12.5))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+import json
+import pickle
+import unittest
+from array import array
+
+from cart import CompactShoppingCart, ShoppingCart
+from catalog import DEFAULT_PRODUCTS, Product, ProductCatalog, get_catalog
+from serialization import (_HEADER, FORMAT_VERSION, MAGIC, cart_from_json,
+                           cart_to_json, dumps_cart, loads_cart)
+
+
+class TestCartSerialization(unittest.TestCase):
+    def setUp(self):
+        self.cart = ShoppingCart()
+        self.cart.add_product("apple", 3)
+        self.cart.add_product("guava", 12)
+
+    def tearDown(self):
+        self.cart = None
+
+    def assertSameCart(self, loaded, original):
+        self.assertEqual(sorted((p.name, q) for p, q in loaded.lines()),
+                         sorted((p.name, q) for p, q in original.lines()))
+        self.assertEqual(loaded.total_price(), original.total_price())
+        self.assertEqual(loaded.total_number_of_items(), original.total_number_of_items())
+
+    def test_binary_round_trip(self):
+        data = dumps_cart(self.cart)
+        self.assertEqual(len(data), 17 + 2 * 8)
+        self.assertSameCart(loads_cart(data), self.cart)
+
+    def test_binary_is_smaller_than_pickle(self):
+        self.assertLess(len(dumps_cart(self.cart)), len(pickle.dumps(self.cart)))
+
+    def test_binary_between_cart_types(self):
+        compact = loads_cart(dumps_cart(self.cart), cart_class=CompactShoppingCart)
+        self.assertIsInstance(compact, CompactShoppingCart)
+        self.assertSameCart(compact, self.cart)
+        self.assertSameCart(loads_cart(bytearray(dumps_cart(compact))), self.cart)
+
+    def test_loaded_cart_keeps_working(self):
+        loaded = loads_cart(dumps_cart(self.cart), cart_class=CompactShoppingCart)
+        loaded.add_product("apple")
+        loaded.remove_product("guava", 12)
+        self.assertEqual(loaded.total_price(), 4.0)
+
+    def test_empty_cart(self):
+        self.assertSameCart(loads_cart(dumps_cart(ShoppingCart())), ShoppingCart())
+
+    def test_rejects_other_catalog(self):
+        data = dumps_cart(self.cart)
+        other = ProductCatalog([Product("apple", 1.0)], version=99)
+        with self.assertRaises(ValueError):
+            loads_cart(data, catalog=other)
+        # Same version number, loaded elsewhere with other products
+        reordered = ProductCatalog(DEFAULT_PRODUCTS[::-1], version=get_catalog().version)
+        with self.assertRaises(ValueError):
+            loads_cart(data, catalog=reordered)
+
+    def test_accepts_same_products_at_another_version(self):
+        same = ProductCatalog(DEFAULT_PRODUCTS, version=get_catalog().version + 7)
+        self.assertSameCart(loads_cart(dumps_cart(self.cart), catalog=same), self.cart)
+
+    def snapshot(self, product_ids, quantities):
+        header = _HEADER.pack(MAGIC, FORMAT_VERSION, get_catalog().fingerprint, len(product_ids))
+        return header + array("i", product_ids).tobytes() + array("i", quantities).tobytes()
+
+    def test_rejects_invalid_lines(self):
+        for product_ids, quantities in (([-1], [1]), ([3], [1]), ([0, 0], [1, 2]), ([0], [0]), ([1], [-2])):
+            for cart_class in (ShoppingCart, CompactShoppingCart):
+                with self.assertRaises(ValueError):
+                    loads_cart(self.snapshot(product_ids, quantities), cart_class=cart_class)
+
+    def test_json_rejects_invalid_lines(self):
+        for lines in ([["kiwi", 1]], [["apple", 1], ["apple", 2]], [["apple", 0]], [["apple", 1.5]]):
+            text = json.dumps({"format": "cart", "version": FORMAT_VERSION, "lines": lines})
+            with self.assertRaises(ValueError):
+                cart_from_json(text)
+
+    def test_rejects_corrupt_data(self):
+        data = dumps_cart(self.cart)
+        with self.assertRaises(ValueError):
+            loads_cart(data[:-1])
+        with self.assertRaises(ValueError):
+            loads_cart(b"JUNK" + data[4:])
+
+    def test_json_round_trip_across_catalogs(self):
+        text = cart_to_json(self.cart)
+        reordered = ProductCatalog([Product("guava", 2.5), Product("apple", 1.0)], version=2)
+        loaded = cart_from_json(text, catalog=reordered)
+        self.assertSameCart(loaded, self.cart)
+
+    def test_json_rejects_other_documents(self):
+        with self.assertRaises(ValueError):
+            cart_from_json('{"lines": []}')
+
+
+if __name__ == '__main__':
+    unittest.main()
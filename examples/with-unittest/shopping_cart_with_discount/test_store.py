@@ -0,0 +1,89 @@
+import threading
+import unittest
+
+from cart import CompactShoppingCart, configure_tracing
+from store import CartStore
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestCartStore(unittest.TestCase):
+    def setUp(self):
+        configure_tracing(enabled=False)
+        self.clock = FakeClock()
+        self.store = CartStore(shards=4, ttl=60, clock=self.clock)
+
+    def tearDown(self):
+        configure_tracing(enabled=True)
+        self.store = None
+
+    def test_add_and_remove(self):
+        self.assertEqual(self.store.add("s1", "apple", 3), 3)
+        self.assertEqual(self.store.remove("s1", "apple"), 2)
+        self.assertEqual(self.store.get("s1").total_price(), 2.0)
+
+    def test_sessions_are_separate(self):
+        self.store.add("s1", "apple")
+        self.store.add("s2", "guava", 2)
+        self.assertEqual(self.store.get("s1").total_number_of_items(), 1)
+        self.assertEqual(self.store.get("s2").total_number_of_items(), 2)
+        self.assertEqual(len(self.store), 2)
+
+    def test_get_unknown_session(self):
+        self.assertIsNone(self.store.get("missing"))
+        self.assertNotIn("missing", self.store)
+
+    def test_update_runs_atomically_and_returns_result(self):
+        self.store.add("s1", "banana", 4)
+        self.assertEqual(self.store.update("s1", lambda cart: cart.total_price()), 2.0)
+
+    def test_idle_carts_expire(self):
+        self.store.add("old", "apple")
+        self.clock.now = 30
+        self.store.add("new", "apple")
+        self.clock.now = 61
+        self.assertNotIn("old", self.store)
+        self.assertEqual(self.store.evict_expired(), 1)
+        self.assertIn("new", self.store)
+        self.assertEqual(len(self.store), 1)
+
+    def test_access_refreshes_ttl(self):
+        self.store.add("s1", "apple")
+        self.clock.now = 50
+        self.store.add("s1", "apple")
+        self.clock.now = 100
+        self.assertEqual(self.store.evict_expired(), 0)
+        self.assertEqual(self.store.get("s1").total_number_of_items(), 2)
+
+    def test_discard(self):
+        self.store.add("s1", "apple")
+        self.assertTrue(self.store.discard("s1"))
+        self.assertFalse(self.store.discard("s1"))
+
+    def test_cart_factory(self):
+        store = CartStore(cart_factory=CompactShoppingCart)
+        store.add("s1", "apple")
+        self.assertIsInstance(store.get("s1"), CompactShoppingCart)
+
+    def test_concurrent_adds_are_not_lost(self):
+        def worker():
+            for i in range(2000):
+                self.store.add(f"s{i % 3}", "apple")
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        total = sum(self.store.get(f"s{i}").total_number_of_items() for i in range(3))
+        self.assertEqual(total, 8 * 2000)
+
+
+if __name__ == '__main__':
+    unittest.main()